@@ -17,22 +17,29 @@ class Command(BaseCommand):
             default=2024,
             help="Season year to sync games for (e.g. 2024, 2025).",
         )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            default=False,
+            help="Only fetch what changed since the last run (sync-state watermarks).",
+        )
 
     def handle(self, *args, **options):
         season = options["season"]
+        incremental = options["incremental"]
 
         self.stdout.write(self.style.MIGRATE_HEADING(f"Syncing WNBA data for {season}"))
 
         self.stdout.write("Syncing teams…")
-        t = sync_teams()
+        t = sync_teams(incremental=incremental)
         self.stdout.write(self.style.SUCCESS(f"Teams synced: {t}"))
 
         self.stdout.write("Syncing players…")
-        p = sync_players()
+        p = sync_players(incremental=incremental)
         self.stdout.write(self.style.SUCCESS(f"Players synced: {p}"))
 
         self.stdout.write(f"Syncing games for {season}…")
-        g = sync_games(season=season)
+        g = sync_games(season=season, incremental=incremental)
         self.stdout.write(self.style.SUCCESS(f"Games synced: {g}"))
 
         self.stdout.write("Syncing season averages (stub)…")
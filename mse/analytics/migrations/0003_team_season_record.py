@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_sync_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teamseasonstat',
+            name='games_played',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamseasonstat',
+            name='losses',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='teamseasonstat',
+            name='margin',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='teamseasonstat',
+            name='opp_ppg',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='teamseasonstat',
+            name='wins',
+            field=models.IntegerField(default=0),
+        ),
+    ]
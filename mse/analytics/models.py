@@ -55,7 +55,12 @@ class TeamSeasonStat(models.Model):
     """
     team = models.ForeignKey(Team, on_delete=models.CASCADE)
     season = models.IntegerField()
+    games_played = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
     ppg = models.FloatField(null=True, blank=True)     # points per game
+    opp_ppg = models.FloatField(null=True, blank=True)  # points allowed per game
+    margin = models.FloatField(null=True, blank=True)   # ppg - opp_ppg
     rpg = models.FloatField(null=True, blank=True)     # rebounds
     apg = models.FloatField(null=True, blank=True)     # assists
     net_rating = models.FloatField(null=True, blank=True)
@@ -139,3 +144,22 @@ class PlayerGameStat(models.Model):
     def __str__(self) -> str:
         return f"{self.player} – {self.game_date}"
 
+
+
+class SyncState(models.Model):
+    """
+    Per-endpoint watermark for incremental syncs, keyed like "analytics:games:2024".
+    last_date: games on/after it are re-fetched; page_hashes: {page key: sha256}
+    of the last payload seen per page, so unchanged pages skip the DB entirely.
+    """
+    key = models.CharField(max_length=128, unique=True)
+    last_date = models.DateTimeField(null=True, blank=True)
+    cursor = models.CharField(max_length=64, blank=True, default="")
+    etag = models.CharField(max_length=255, blank=True, default="")
+    response_hash = models.CharField(max_length=64, blank=True, default="")
+    page_hashes = models.JSONField(default=dict, blank=True)
+    calls = models.IntegerField(default=0)  # API calls made by the last run
+    synced_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.key} @ {self.last_date or self.synced_at}"
@@ -1,13 +1,24 @@
 # analytics/services/api_client.py
-import time
-from typing import Any, Dict, Optional
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import requests
 from django.conf import settings
 
+from .rate_limit import TokenBucket, pooled_session, retry_after
+
+logger = logging.getLogger(__name__)
+
 # WNBA base URL (per openapi.yml)
 BASE_URL = "https://api.balldontlie.io/wnba/v1"
 
+# Plan quota: free 5/min, ALL-STAR 60/min, GOAT 600/min. Override per deployment.
+RATE_PER_MINUTE = int(getattr(settings, "BALLDONTLIE_RATE_PER_MINUTE", 60))
+MAX_WORKERS = int(getattr(settings, "BALLDONTLIE_MAX_WORKERS", 4))
+TIMEOUT = 30
+
 
 def _get_api_key() -> str:
     """
@@ -20,46 +31,123 @@ def _get_api_key() -> str:
     )
 
 
+# burst: at most one second's worth of quota, and no more than the worker count
+limiter = TokenBucket(rate=RATE_PER_MINUTE / 60.0, capacity=max(1, min(MAX_WORKERS, RATE_PER_MINUTE // 60)))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def session() -> requests.Session:
+    """One pooled keep-alive session per process, sized for MAX_WORKERS threads."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = pooled_session(MAX_WORKERS)
+            s.headers["Authorization"] = _get_api_key()
+            _session = s
+        return _session
+
+
+_calls = 0
+_calls_lock = threading.Lock()
+
+
+def call_count() -> int:
+    """HTTP requests made by this process so far (diff it around a sync)."""
+    return _calls
+
+
+def _request(
+    endpoint: str,
+    params: Optional[Dict[str, Any]],
+    retries: int,
+    headers: Optional[Dict[str, str]] = None,
+) -> requests.Response:
+    global _calls
+    url = f"{BASE_URL}/{endpoint.lstrip('/')}"
+    params = params or {}
+
+    for attempt in range(retries):
+        limiter.acquire()
+        response = session().get(url, params=params, headers=headers, timeout=TIMEOUT)
+        with _calls_lock:
+            _calls += 1
+        logger.debug("FETCH %s -> %s", response.url, response.status_code)
+
+        if response.status_code in (429, 503):
+            wait = retry_after(response, attempt)
+            logger.warning("Rate limited on %s; waiting %.1fs", endpoint, wait)
+            limiter.pause(wait)
+            continue
+
+        response.raise_for_status()
+        return response
+
+    raise Exception("❌ Max retries exceeded (API rate limit still blocking)")
+
+
 def get(endpoint: str, params: Optional[Dict[str, Any]] = None, retries: int = 5) -> Dict[str, Any]:
     """
-    Simple GET wrapper with retry support for the BallDontLie WNBA API.
+    Rate-limited GET for the BallDontLie WNBA API.
     Uses:
         - BASE_URL = https://api.balldontlie.io/wnba/v1
         - Authorization: <API_KEY>   (no 'Bearer')
+    429/503 responses pause the shared limiter for Retry-After, then retry.
     """
-    url = f"{BASE_URL}/{endpoint.lstrip('/')}"
-    headers = {"Authorization": _get_api_key()}
-    params = params or {}
+    return _request(endpoint, params, retries).json()
 
-    for attempt in range(retries):
-        response = requests.get(url, params=params, headers=headers, timeout=30)
 
-        print("🔍 FETCH:", response.url)
-        print("🔍 STATUS:", response.status_code)
+def get_if_changed(
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    etag: str = "",
+    retries: int = 5,
+) -> Tuple[Optional[Dict[str, Any]], str]:
+    """Conditional GET: (None, etag) on 304 Not Modified, else (payload, new ETag or "")."""
+    headers = {"If-None-Match": etag} if etag else None
+    response = _request(endpoint, params, retries, headers=headers)
+    if response.status_code == 304:
+        return None, etag
+    return response.json(), response.headers.get("ETag", "")
 
-        # Rate limiting
-        if response.status_code == 429:
-            wait = 2 ** attempt
-            print(f"⏳ Rate limit hit. Waiting {wait} seconds...")
-            time.sleep(wait)
-            continue
 
-        try:
-            response.raise_for_status()
-        except Exception as e:
-            print("❌ REQUEST FAILED:", e)
-            raise
+def fetch_many(
+    calls: Iterable[Tuple[str, Optional[Dict[str, Any]]]],
+    retries: int = 5,
+    workers: int = MAX_WORKERS,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Run independent GETs concurrently (the limiter still paces them).
+    Returns responses in call order; the first failure is raised, or with
+    return_exceptions=True left in its slot so earlier results survive.
+    """
+    calls = list(calls)
 
-        return response.json()
+    def one(call):
+        try:
+            return get(call[0], call[1], retries)
+        except Exception as exc:
+            if not return_exceptions:
+                raise
+            return exc
 
-    raise Exception("❌ Max retries exceeded (API rate limit still blocking)")
+    if len(calls) <= 1 or workers <= 1:
+        return [one(c) for c in calls]
+    with ThreadPoolExecutor(max_workers=min(workers, len(calls)), thread_name_prefix="bdl-fetch") as pool:
+        return list(pool.map(one, calls))
 
 
-def paginate_players(per_page: int = 100, max_pages: int = 50):
+def iter_player_pages(
+    per_page: int = 100,
+    max_pages: int = 50,
+    workers: int = MAX_WORKERS,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
     """
-    Stable paginator for WNBA /players endpoint.
+    Stable paginator for WNBA /players endpoint, yielding ("page:N", response).
     We avoid cursor-based pagination (too aggressive rate limiting)
-    and use simple page=1,2,3,... pagination.
+    and use page=1,2,3,... pagination, fetching `workers` pages at a time.
 
     Stops when:
       - no data returned
@@ -68,31 +156,42 @@ def paginate_players(per_page: int = 100, max_pages: int = 50):
     """
     page = 1
     while page <= max_pages:
-        params = {"per_page": per_page, "page": page}
-        try:
-            data = get("players", params=params, retries=5)
-        except Exception as exc:
-            print(f"❌ players page={page} failed: {exc}")
-            break
+        window = range(page, min(page + workers, max_pages + 1))
+        responses = fetch_many(
+            (("players", {"per_page": per_page, "page": p}) for p in window),
+            workers=workers,
+            return_exceptions=True,
+        )
 
-        items = data.get("data", [])
-        if not items:
-            break  # no more data
+        # pages before the first failure in the window still count
+        for p, data in zip(window, responses):
+            if isinstance(data, Exception):
+                logger.warning("players page %s failed: %s", p, data)
+                return
+            if not data.get("data"):
+                return  # no more data
+            yield f"page:{p}", data
+        page = window[-1] + 1
 
-        for item in items:
-            yield item
 
-        page += 1
+def paginate_players(per_page: int = 100, max_pages: int = 50, workers: int = MAX_WORKERS) -> Iterator[Dict[str, Any]]:
+    for _, data in iter_player_pages(per_page, max_pages, workers):
+        yield from data["data"]
 
 
-
-def paginate(endpoint: str, base_params: Optional[Dict[str, Any]] = None, retries: int = 5):
+def iter_pages(
+    endpoint: str,
+    base_params: Optional[Dict[str, Any]] = None,
+    retries: int = 5,
+    workers: int = MAX_WORKERS,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
     """
     Generic paginator that tries to support both 'page'-based and 'cursor'-based
-    pagination styles used by BallDontLie.
+    pagination styles used by BallDontLie. Yields ("page:N" | "cursor:C", response).
 
-    - If response.meta.next_cursor exists → use ?cursor=...
-    - Else, fall back to page/current_page style.
+    - If response.meta.next_cursor exists → use ?cursor=... (inherently sequential)
+    - If the first page reports total_pages → fetch the rest concurrently.
+    - Else, fall back to next_page/current_page style.
     """
     params: Dict[str, Any] = dict(base_params or {})
     page = 1
@@ -103,17 +202,17 @@ def paginate(endpoint: str, base_params: Optional[Dict[str, Any]] = None, retrie
             # Cursor-based paging
             params["cursor"] = cursor
             params.pop("page", None)
+            page_key = f"cursor:{cursor}"
         else:
             # Page-based paging
             params["page"] = page
+            page_key = f"page:{page}"
 
         data = get(endpoint, params=params, retries=retries)
-        items = data.get("data", []) or []
-        if not items:
+        if not data.get("data"):
             break
 
-        for item in items:
-            yield item
+        yield page_key, data
 
         meta = data.get("meta") or {}
 
@@ -128,6 +227,15 @@ def paginate(endpoint: str, base_params: Optional[Dict[str, Any]] = None, retrie
         current_page = meta.get("current_page")
         next_page = meta.get("next_page")
 
+        # Page count known up front: the remaining pages are independent
+        if total_pages and current_page == 1 and total_pages > 1:
+            rest = range(2, total_pages + 1)
+            calls = [(endpoint, {**params, "page": p}) for p in rest]
+            for p, data in zip(rest, fetch_many(calls, retries=retries, workers=workers)):
+                if data.get("data"):
+                    yield f"page:{p}", data
+            break
+
         # If explicit next_page
         if next_page and (total_pages is None or next_page <= total_pages):
             page = next_page
@@ -142,3 +250,13 @@ def paginate(endpoint: str, base_params: Optional[Dict[str, Any]] = None, retrie
 
         # No more data
         break
+
+
+def paginate(
+    endpoint: str,
+    base_params: Optional[Dict[str, Any]] = None,
+    retries: int = 5,
+    workers: int = MAX_WORKERS,
+) -> Iterator[Dict[str, Any]]:
+    for _, data in iter_pages(endpoint, base_params, retries, workers):
+        yield from data["data"]
@@ -0,0 +1,90 @@
+# analytics/services/bulk_upsert.py
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Sequence
+
+from django.db import models
+
+# SQLite caps bound parameters per statement; keep IN (...) lookups under it.
+LOOKUP_CHUNK = 500
+
+
+@dataclass
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+    def __str__(self) -> str:
+        return f"{self.total} ({self.inserted} new, {self.updated} updated, {self.unchanged} unchanged)"
+
+
+def _chunks(items: List[Any], size: int = LOOKUP_CHUNK):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def id_map(model: type[models.Model], keys: Iterable[Any], key: str = "external_id") -> Dict[Any, int]:
+    """{external key: pk} for the given keys (FK resolution after an upsert)."""
+    out: Dict[Any, int] = {}
+    for chunk in _chunks(list(set(keys))):
+        out.update(model.objects.filter(**{f"{key}__in": chunk}).values_list(key, "id"))
+    return out
+
+
+def bulk_upsert(
+    model: type[models.Model],
+    rows: Iterable[Dict[str, Any]],
+    fields: Sequence[str],
+    key: str = "external_id",
+    batch_size: int = 500,
+) -> UpsertResult:
+    """
+    Insert-or-update `rows` (dicts holding `key` plus `fields`; FKs as "team_id")
+    by diffing them against what is stored under the same keys:
+    new keys are bulk-inserted, changed rows bulk-updated, identical rows skipped.
+    Later rows win when a key repeats.
+    """
+    meta = model._meta
+    convert = {name: meta.get_field(name).to_python for name in (key, *fields)}
+
+    incoming: Dict[Any, Dict[str, Any]] = {}
+    for row in rows:
+        clean = {name: convert[name](row.get(name)) for name in convert}
+        incoming[clean[key]] = clean
+
+    stored: Dict[Any, tuple] = {}
+    for chunk in _chunks(list(incoming)):
+        for pk, k, *values in model.objects.filter(**{f"{key}__in": chunk}).values_list("id", key, *fields):
+            stored[k] = (pk, tuple(values))
+
+    result = UpsertResult()
+    fresh: List[models.Model] = []
+    changed: List[models.Model] = []
+    for k, row in incoming.items():
+        values = tuple(row[f] for f in fields)
+        if k not in stored:
+            fresh.append(model(**row))
+        elif stored[k][1] != values:
+            changed.append(model(id=stored[k][0], **row))
+        else:
+            result.unchanged += 1
+
+    if fresh:
+        # update_conflicts covers a concurrent sync inserting the same key first
+        model.objects.bulk_create(
+            fresh,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=[key],
+            update_fields=list(fields),
+        )
+    if changed:
+        model.objects.bulk_update(changed, list(fields), batch_size=batch_size)
+
+    result.inserted = len(fresh)
+    result.updated = len(changed)
+    return result
@@ -0,0 +1,99 @@
+# analytics/services/rate_limit.py
+# Shared by every BallDontLie client (analytics.services.api_client,
+# mystics_site.services): request pacing, Retry-After parsing, pooled sessions.
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` requests per second with bursts up to
+    `capacity`. pause() stops every caller until a deadline (Retry-After).
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+class AdaptiveLimiter(TokenBucket):
+    """
+    Token bucket that only sleeps when the quota requires it. A 429 halves
+    the rate (and honours Retry-After); each success creeps back towards the
+    plan's ceiling. Tracks calls and time spent waiting for sync summaries.
+    """
+
+    def __init__(self, per_minute: float):
+        self.ceiling = per_minute / 60.0
+        super().__init__(rate=self.ceiling, capacity=max(1.0, per_minute // 60))
+        self.calls = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def acquire(self) -> None:
+        t0 = time.monotonic()
+        super().acquire()
+        with self.lock:
+            self.calls += 1
+            self.waited += time.monotonic() - t0
+
+    def on_success(self) -> None:
+        with self.lock:
+            self.rate = min(self.ceiling, self.rate * 1.05)
+
+    def on_throttle(self, seconds: float) -> None:
+        with self.lock:
+            self.throttled += 1
+            self.rate = max(self.ceiling / 16, self.rate / 2)
+        self.pause(seconds)
+
+    def snapshot(self) -> Dict[str, float]:
+        return {"calls": self.calls, "throttled": self.throttled, "waited": self.waited}
+
+
+def retry_after(response: requests.Response, attempt: int) -> float:
+    """Seconds to wait: Retry-After (seconds or HTTP date) when sent, else exponential backoff."""
+    raw = response.headers.get("Retry-After", "").strip()
+    if raw:
+        if raw.isdigit():
+            return float(raw)
+        try:
+            return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    return float(2 ** attempt)
+
+
+def pooled_session(pool_size: int) -> requests.Session:
+    """A keep-alive session whose connection pool fits `pool_size` threads."""
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
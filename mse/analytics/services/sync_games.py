@@ -1,30 +1,17 @@
 # analytics/services/sync_games.py
 from datetime import datetime
-from typing import Dict
+from typing import Any, Dict
 
 from django.db import transaction
 from django.utils.dateparse import parse_datetime
 
 from analytics.models import Game, Team
-from .api_client import paginate
+from . import sync_state
+from .api_client import call_count, iter_pages
+from .bulk_upsert import UpsertResult, bulk_upsert, id_map
+from .sync_teams import upsert_teams
 
-
-def _get_or_create_team(team_data: Dict) -> Team:
-    defaults = {
-        "name": team_data.get("name") or "",
-        "full_name": team_data.get("full_name")
-        or f"{team_data.get('city', '')} {team_data.get('name', '')}".strip(),
-        "city": team_data.get("city") or "",
-        "abbreviation": team_data.get("abbreviation") or "",
-        "conference": team_data.get("conference") or "",
-        "division": team_data.get("division") or "",
-    }
-
-    team, _ = Team.objects.update_or_create(
-        external_id=str(team_data["id"]),
-        defaults=defaults,
-    )
-    return team
+GAME_FIELDS = ["date", "season", "status", "home_team_id", "visitor_team_id", "home_team_score", "visitor_team_score"]
 
 
 def _parse_date(dt_str: str) -> datetime:
@@ -35,46 +22,61 @@ def _parse_date(dt_str: str) -> datetime:
     return dt
 
 
-def sync_games(season: int = 2024) -> int:
+def game_row(g: Dict[str, Any], team_ids: Dict[str, int]) -> Dict[str, Any]:
+    # Align to your Game model fields:
+    # external_id, date, home_team, visitor_team,
+    # home_team_score, visitor_team_score, season, status
+    return {
+        "external_id": int(g["id"]),
+        "date": _parse_date(g["date"]),
+        "season": g.get("season"),
+        "status": g.get("status", ""),
+        "home_team_id": team_ids.get(str(g["home_team"]["id"])),
+        "visitor_team_id": team_ids.get(str(g["visitor_team"]["id"])),
+        "home_team_score": g.get("home_team_score", 0),
+        "visitor_team_score": g.get("visitor_team_score", 0),
+    }
+
+
+def sync_games(season: int = 2024, incremental: bool = False) -> UpsertResult:
     """
     Sync games for a given season from BallDontLie WNBA API.
 
-    Uses pagination via api_client.paginate and stores into Game model.
-    Only fields that exist on your Game model are used.
+    Uses pagination via api_client.iter_pages and stores into Game model.
+    Each team is upserted once per sync (not once per game), then games
+    are diffed and written in batches. Incremental runs ask only for games
+    on/after the stored watermark and skip pages identical to last time.
     """
-    count = 0
-
+    state = sync_state.load(f"analytics:games:{season}")
     params = {
         "per_page": 100,
         "seasons[]": season,  # BallDontLie uses `seasons[]` for filtering by year
     }
+    scope = ""
+    if incremental and state.last_date:
+        params["start_date"] = state.last_date.date().isoformat()
+        scope = f"{params['start_date']}|"
+
+    before = call_count()
+    seen: Dict[str, str] = {}
+    games = list(sync_state.changed_pages(
+        state.page_hashes if incremental else {},
+        iter_pages("games", base_params=params),
+        scope=scope,
+        seen=seen,
+    ))
 
     with transaction.atomic():
-        for g in paginate("games", base_params=params):
-            home_team_data = g["home_team"]
-            visitor_team_data = g["visitor_team"]
-
-            home_team = _get_or_create_team(home_team_data)
-            visitor_team = _get_or_create_team(visitor_team_data)
-
-            date_obj = _parse_date(g["date"])
-
-            # Align to your Game model fields:
-            # external_id, date, home_team, visitor_team,
-            # home_team_score, visitor_team_score, season, status
-            Game.objects.update_or_create(
-                external_id=int(g["id"]),
-                defaults={
-                    "date": date_obj,
-                    "season": g.get("season"),
-                    "status": g.get("status", ""),
-                    "home_team": home_team,
-                    "visitor_team": visitor_team,
-                    "home_team_score": g.get("home_team_score", 0),
-                    "visitor_team_score": g.get("visitor_team_score", 0),
-                },
-            )
-            count += 1
-
-    print(f"✅ GAMES SYNCED: {count}")
-    return count
+        teams = {}
+        for g in games:
+            teams[str(g["home_team"]["id"])] = g["home_team"]
+            teams[str(g["visitor_team"]["id"])] = g["visitor_team"]
+        upsert_teams(teams.values())
+        team_ids = id_map(Team, teams)
+
+        result = bulk_upsert(Game, (game_row(g, team_ids) for g in games), GAME_FIELDS)
+
+    calls = call_count() - before
+    sync_state.save(state, calls, last_date=sync_state.watermark(Game.objects.filter(season=season)), page_hashes=seen)
+    print(f"✅ GAMES SYNCED: {result} in {calls} API calls")
+    return result
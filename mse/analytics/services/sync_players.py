@@ -1,56 +1,60 @@
 # analytics/services/sync_players.py
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 from django.db import transaction
 
 from analytics.models import Player, Team
-from .api_client import paginate_players
-
-
-def _get_or_create_team(team_payload: Optional[dict]) -> Optional[Team]:
-    if not team_payload:
-        return None
-
-    defaults: Dict[str, str] = {
-        "name": team_payload.get("name") or "",
-        "full_name": team_payload.get("full_name")
-        or f"{team_payload.get('city', '')} {team_payload.get('name', '')}".strip(),
-        "city": team_payload.get("city") or "",
-        "abbreviation": team_payload.get("abbreviation") or "",
-        "conference": team_payload.get("conference") or "",
-        "division": team_payload.get("division") or "",
+from . import sync_state
+from .api_client import call_count, iter_player_pages
+from .bulk_upsert import UpsertResult, bulk_upsert, id_map
+from .sync_teams import upsert_teams
+
+PLAYER_FIELDS = ["team_id", "first_name", "last_name", "jersey", "position", "height", "weight", "age", "headshot_url"]
+
+
+def player_row(p: Dict[str, Any], team_id: Optional[int]) -> Dict[str, Any]:
+    return {
+        "external_id": str(p["id"]),
+        "team_id": team_id,
+        "first_name": p.get("first_name") or "",
+        "last_name": p.get("last_name") or "",
+        "jersey": p.get("jersey_number") or "",
+        "position": p.get("position_abbreviation")
+        or p.get("position")
+        or "",
+        "height": p.get("height") or "",
+        "weight": p.get("weight") or "",
+        "age": p.get("age"),
+        "headshot_url": "",
     }
 
-    team, _ = Team.objects.update_or_create(
-        external_id=str(team_payload["id"]),
-        defaults=defaults,
-    )
-    return team
 
-def sync_players() -> int:
-    count = 0
+def sync_players(incremental: bool = False) -> UpsertResult:
+    state = sync_state.load("analytics:players")
+    if incremental and sync_state.is_fresh(state, sync_state.PLAYERS_REFRESH):
+        return UpsertResult()
+
+    before = call_count()
+    seen: Dict[str, str] = {}
+    # fetch everything first so no transaction stays open across API calls;
+    # incremental runs drop pages identical to last time
+    players = list(sync_state.changed_pages(
+        state.page_hashes if incremental else {},
+        iter_player_pages(per_page=100, max_pages=50),
+        seen=seen,
+    ))
 
     with transaction.atomic():
-        for p in paginate_players(per_page=100, max_pages=50):
-            team = _get_or_create_team(p.get("team"))
-
-            Player.objects.update_or_create(
-                external_id=str(p["id"]),
-                defaults={
-                    "team": team,
-                    "first_name": p.get("first_name") or "",
-                    "last_name": p.get("last_name") or "",
-                    "jersey": p.get("jersey_number") or "",
-                    "position": p.get("position_abbreviation")
-                    or p.get("position")
-                    or "",
-                    "height": p.get("height") or "",
-                    "weight": p.get("weight") or "",
-                    "age": p.get("age"),
-                    "headshot_url": "",
-                },
-            )
-            count += 1
-
-    print(f"✅ PLAYERS SYNCED: {count}")
-    return count
+        teams = {str(p["team"]["id"]): p["team"] for p in players if p.get("team")}
+        upsert_teams(teams.values())
+        team_ids = id_map(Team, teams)
+
+        result = bulk_upsert(
+            Player,
+            (player_row(p, team_ids.get(str((p.get("team") or {}).get("id")))) for p in players),
+            PLAYER_FIELDS,
+        )
+
+    sync_state.save(state, call_count() - before, page_hashes=seen)
+    print(f"✅ PLAYERS SYNCED: {result}")
+    return result
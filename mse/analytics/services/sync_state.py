@@ -0,0 +1,77 @@
+# analytics/services/sync_state.py
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from django.db.models import Max, Min, QuerySet
+from django.utils import timezone
+
+from analytics.models import SyncState
+
+# rosters move slowly; incremental runs re-page /players at most this often
+PLAYERS_REFRESH = timedelta(hours=6)
+# unfinished games older than this (postponed, never updated) stop holding the watermark back
+OPEN_GAME_LOOKBACK = timedelta(days=3)
+
+
+def payload_hash(data: Any) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def load(key: str) -> SyncState:
+    state, _ = SyncState.objects.get_or_create(key=key)
+    return state
+
+
+def is_fresh(state: SyncState, every: timedelta) -> bool:
+    """True when the last successful sync is younger than `every`."""
+    return state.synced_at is not None and timezone.now() - state.synced_at < every
+
+
+def watermark(games: QuerySet, date_field: str = "date", status_field: str = "status") -> Optional[datetime]:
+    """
+    Where the next incremental games run starts: the earliest recent game in
+    `games` that is not Final yet (its score can still change), else the
+    latest game. Never in the future.
+    """
+    now = timezone.now()
+    open_from = (
+        games.filter(**{f"{date_field}__gte": now - OPEN_GAME_LOOKBACK})
+        .exclude(**{f"{status_field}__iexact": "final"})
+        .aggregate(d=Min(date_field))["d"]
+    )
+    mark = open_from or games.aggregate(d=Max(date_field))["d"]
+    return min(mark, now) if mark else None
+
+
+def changed_pages(
+    previous: Dict[str, str],
+    pages: Iterable[Tuple[str, Dict[str, Any]]],
+    scope: str = "",
+    seen: Optional[Dict[str, str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Rows of the pages whose payload differs from `previous` (the last run's
+    page_hashes) under `scope` + page key. Every page hash lands in `seen`
+    (save it as the new state.page_hashes once the rows are stored).
+    """
+    old = previous or {}
+    for page_key, data in pages:
+        key = f"{scope}{page_key}"
+        digest = payload_hash(data.get("data"))
+        if seen is not None:
+            seen[key] = digest
+        if old.get(key) == digest:
+            continue
+        yield from data.get("data") or []
+
+
+def save(state: SyncState, calls: Optional[int] = None, **fields: Any) -> None:
+    """Record a successful run (and, when counted, how many API calls it took)."""
+    for name, value in fields.items():
+        setattr(state, name, value)
+    if calls is not None:
+        state.calls = calls
+    state.synced_at = timezone.now()
+    state.save()
@@ -1,40 +1,53 @@
 # analytics/services/sync_teams.py
-from typing import Dict
+from typing import Any, Dict, Iterable
 
 from django.db import transaction
 
 from analytics.models import Team
-from .api_client import get
+from . import sync_state
+from .api_client import call_count, get_if_changed
+from .bulk_upsert import UpsertResult, bulk_upsert
 
+TEAM_FIELDS = ["name", "full_name", "city", "abbreviation", "conference", "division"]
 
-def sync_teams() -> int:
+
+def team_row(t: Dict[str, Any]) -> Dict[str, str]:
+    # API fields are similar to NBA: id, city, abbreviation, conference, division, full_name, name
+    return {
+        "external_id": str(t["id"]),
+        "name": t.get("name") or "",
+        "full_name": t.get("full_name")
+        or f"{t.get('city', '')} {t.get('name', '')}".strip(),
+        "city": t.get("city") or "",
+        "abbreviation": t.get("abbreviation") or "",
+        "conference": t.get("conference") or "",
+        "division": t.get("division") or "",
+    }
+
+
+def upsert_teams(teams: Iterable[Dict[str, Any]]) -> UpsertResult:
+    """Upsert team payloads (as embedded in players/games too), skipping empty ones."""
+    return bulk_upsert(Team, (team_row(t) for t in teams if t and t.get("id") is not None), TEAM_FIELDS)
+
+
+def sync_teams(incremental: bool = False) -> UpsertResult:
     """
     Sync all WNBA teams from BallDontLie WNBA API into Team model.
-    Endpoint: GET /teams
+    Endpoint: GET /teams (one call). Incremental runs send the stored ETag
+    and skip the write when the payload hash is unchanged.
     """
-    response = get("teams", params={"per_page": 100})
-    teams = response.get("data", []) or []
-    count = 0
-
-    with transaction.atomic():
-        for t in teams:
-            # API fields are similar to NBA: id, city, abbreviation, conference, division, full_name, name
-            defaults: Dict[str, str] = {
-                "name": t.get("name") or "",
-                "full_name": t.get("full_name")
-                or f"{t.get('city', '')} {t.get('name', '')}".strip(),
-                "city": t.get("city") or "",
-                "abbreviation": t.get("abbreviation") or "",
-                "conference": t.get("conference") or "",
-                "division": t.get("division") or "",
-            }
-
-            Team.objects.update_or_create(
-                external_id=str(t["id"]),
-                defaults=defaults,
-            )
-            count += 1
-
-    print(f"✅ TEAMS SYNCED: {count}")
-    return count
-
+    state = sync_state.load("analytics:teams")
+    before = call_count()
+    data, etag = get_if_changed("teams", {"per_page": 100}, etag=state.etag if incremental else "")
+    teams = (data or {}).get("data", []) or []
+    digest = sync_state.payload_hash(teams) if data is not None else state.response_hash
+
+    if incremental and digest == state.response_hash:
+        result = UpsertResult(unchanged=Team.objects.count())
+    else:
+        with transaction.atomic():
+            result = upsert_teams(teams)
+
+    sync_state.save(state, call_count() - before, etag=etag, response_hash=digest)
+    print(f"✅ TEAMS SYNCED: {result}")
+    return result
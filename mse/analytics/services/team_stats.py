@@ -0,0 +1,72 @@
+# analytics/services/team_stats.py
+from collections import defaultdict
+from typing import Dict
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Sum, When
+
+from analytics.models import Game, TeamSeasonStat
+
+STAT_FIELDS = ["games_played", "wins", "losses", "ppg", "opp_ppg", "margin"]
+
+
+def _side_totals(season: int, side: str, other: str) -> Dict[int, Dict[str, int]]:
+    """One grouped query: games, points for/against and wins for every team on one side."""
+    # only Final games: a live score would count as a W for one side mid-game
+    played = (
+        Game.objects.filter(season=season, status__iexact="final")
+        .filter(home_team_score__isnull=False, visitor_team_score__isnull=False)
+        .exclude(**{f"{side}_team": None})
+    )
+    rows = played.values(team=F(f"{side}_team")).annotate(
+        games=Count("id"),
+        pts_for=Sum(f"{side}_team_score"),
+        pts_against=Sum(f"{other}_team_score"),
+        wins=Sum(Case(
+            When(**{f"{side}_team_score__gt": F(f"{other}_team_score")}, then=1),
+            default=0,
+            output_field=IntegerField(),
+        )),
+    )
+    return {r["team"]: r for r in rows}
+
+
+def recompute_team_season_stats(season: int) -> int:
+    """
+    Set-based TeamSeasonStat refresh for every team with a Final game:
+    two grouped queries (home side, away side) and one bulk upsert, so the
+    table is never empty mid-refresh. Returns the number of teams written.
+    """
+    totals: Dict[int, Dict[str, int]] = defaultdict(lambda: {"games": 0, "pts_for": 0, "pts_against": 0, "wins": 0})
+    for side, other in (("home", "visitor"), ("visitor", "home")):
+        for team_id, r in _side_totals(season, side, other).items():
+            t = totals[team_id]
+            for k in t:
+                t[k] += r[k] or 0
+
+    rows = []
+    for team_id, t in totals.items():
+        gp = t["games"]
+        ppg = t["pts_for"] / gp
+        opp = t["pts_against"] / gp
+        rows.append(TeamSeasonStat(
+            team_id=team_id,
+            season=season,
+            games_played=gp,
+            wins=t["wins"],
+            losses=gp - t["wins"],
+            ppg=ppg,
+            opp_ppg=opp,
+            margin=ppg - opp,
+        ))
+
+    with transaction.atomic():
+        TeamSeasonStat.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["team", "season"],
+            update_fields=STAT_FIELDS + ["updated_at"],
+        )
+        # teams that no longer have a Final game this season
+        TeamSeasonStat.objects.filter(season=season).exclude(team_id__in=list(totals)).delete()
+    return len(rows)
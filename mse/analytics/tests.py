@@ -1,3 +1,180 @@
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from analytics.models import Game, Player, Team
+from analytics.services.bulk_upsert import UpsertResult, bulk_upsert
+from analytics.services.sync_games import sync_games
+from analytics.services.sync_players import sync_players
+from analytics.services.sync_teams import TEAM_FIELDS, team_row
+
+
+MYSTICS = {"id": 1, "name": "Mystics", "city": "Washington", "abbreviation": "WAS", "conference": "Eastern"}
+LIBERTY = {"id": 2, "name": "Liberty", "city": "New York", "abbreviation": "NY", "conference": "Eastern"}
+
+
+def _game(gid, home_score=80):
+    return {
+        "id": gid,
+        "date": "2024-06-01T23:00:00Z",
+        "season": 2024,
+        "status": "Final",
+        "home_team": MYSTICS,
+        "visitor_team": LIBERTY,
+        "home_team_score": home_score,
+        "visitor_team_score": 75,
+    }
+
+
+class BulkUpsertTests(TestCase):
+    def test_diffs_against_stored_rows(self):
+        first = bulk_upsert(Team, [team_row(MYSTICS), team_row(LIBERTY)], TEAM_FIELDS)
+        self.assertEqual((first.inserted, first.updated, first.unchanged), (2, 0, 0))
+
+        renamed = {**LIBERTY, "name": "NY Liberty"}
+        with self.assertNumQueries(2):  # lookup + one bulk UPDATE
+            again = bulk_upsert(Team, [team_row(MYSTICS), team_row(renamed)], TEAM_FIELDS)
+        self.assertEqual(str(again), "2 (0 new, 1 updated, 1 unchanged)")
+        self.assertEqual(Team.objects.get(external_id="2").name, "NY Liberty")
+
+    def test_games_sync_upserts_each_team_once(self):
+        with mock.patch("analytics.services.sync_games.iter_pages", return_value=[("page:1", {"data": [_game(i) for i in range(1, 41)]})]):
+            result = sync_games(2024)
+        self.assertEqual(result, UpsertResult(inserted=40))
+        self.assertEqual(Team.objects.count(), 2)
+        self.assertEqual(Game.objects.filter(home_team__external_id="1").count(), 40)
+
+        games = [_game(i) for i in range(1, 41)]
+        games[0] = _game(1, home_score=99)
+        with mock.patch("analytics.services.sync_games.iter_pages", return_value=[("page:1", {"data": games})]):
+            result = sync_games(2024)
+        self.assertEqual((result.updated, result.unchanged), (1, 39))
+        self.assertEqual(Game.objects.get(external_id=1).home_team_score, 99)
+
+    def test_players_link_to_teams(self):
+        payload = [
+            {"id": 10, "first_name": "Ariel", "last_name": "Atkins", "team": MYSTICS, "position": "G"},
+            {"id": 11, "first_name": "Free", "last_name": "Agent", "team": None},
+        ]
+        with mock.patch("analytics.services.sync_players.iter_player_pages", return_value=[("page:1", {"data": payload})]):
+            self.assertEqual(sync_players().inserted, 2)
+        self.assertEqual(Player.objects.get(external_id="10").team.abbreviation, "WAS")
+        self.assertIsNone(Player.objects.get(external_id="11").team)
+
+
+class FetchLayerTests(TestCase):
+    def _response(self, status, payload=None, headers=None):
+        resp = mock.Mock(status_code=status, headers=headers or {}, url="https://example.test")
+        resp.json.return_value = payload or {}
+        resp.raise_for_status.return_value = None
+        return resp
+
+    def test_retry_after_pauses_limiter(self):
+        from analytics.services import api_client, rate_limit
+
+        clock = [1000.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        sess = mock.Mock()
+        sess.get.side_effect = [self._response(429, headers={"Retry-After": "7"}), self._response(200, {"data": [1]})]
+        with mock.patch.object(rate_limit.time, "monotonic", lambda: clock[0]), \
+                mock.patch.object(rate_limit.time, "sleep", sleep), \
+                mock.patch.object(api_client, "limiter", rate_limit.TokenBucket(rate=1000, capacity=10)), \
+                mock.patch.object(api_client, "session", return_value=sess):
+            self.assertEqual(api_client.get("teams"), {"data": [1]})
+        self.assertEqual(sleeps, [7.0])
+
+    def test_known_page_count_fetches_rest_concurrently(self):
+        from analytics.services import api_client
+
+        def fake_get(endpoint, params=None, retries=5):
+            page = params["page"]
+            return {"data": [f"{page}a", f"{page}b"], "meta": {"total_pages": 5, "current_page": page}}
+
+        with mock.patch.object(api_client, "get", side_effect=fake_get) as get:
+            items = list(api_client.paginate("games", {"per_page": 2}, workers=3))
+        self.assertEqual(items, [f"{p}{s}" for p in range(1, 6) for s in "ab"])
+        self.assertEqual(get.call_count, 5)
+
+        pages = {1: ["x"] * 2, 2: ["y"] * 2, 3: []}
+        with mock.patch.object(api_client, "get", side_effect=lambda e, params=None, retries=5: {"data": pages.get(params["page"], [])}):
+            self.assertEqual(len(list(api_client.paginate_players(per_page=2, max_pages=10, workers=4))), 4)
+
+        def flaky(endpoint, params=None, retries=5):
+            if params["page"] == 3:
+                raise RuntimeError("rate limited")
+            return {"data": [params["page"]]}
+
+        with mock.patch.object(api_client, "get", side_effect=flaky):
+            keys = [key for key, _ in api_client.iter_player_pages(per_page=1, max_pages=10, workers=4)]
+        self.assertEqual(keys, ["page:1", "page:2"])
+
+
+class DeltaSyncTests(TestCase):
+    def test_games_resume_from_watermark_and_skip_unchanged_pages(self):
+        from django.utils import timezone
+
+        from analytics.models import SyncState
+
+        today = timezone.now().replace(microsecond=0)
+        final = {**_game(1), "date": (today - timezone.timedelta(days=10)).isoformat()}
+        live = {**_game(2), "date": (today - timezone.timedelta(hours=2)).isoformat(), "status": "2nd Qtr"}
+
+        with mock.patch("analytics.services.sync_games.iter_pages", return_value=[("page:1", {"data": [final, live]})]):
+            sync_games(2024, incremental=True)
+        state = SyncState.objects.get(key="analytics:games:2024")
+        self.assertEqual(state.last_date, today - timezone.timedelta(hours=2))
+
+        pages = [("page:1", {"data": [live]})]
+        with mock.patch("analytics.services.sync_games.iter_pages", return_value=pages) as fetch:
+            result = sync_games(2024, incremental=True)
+        self.assertEqual(fetch.call_args.kwargs["base_params"]["start_date"], state.last_date.date().isoformat())
+        self.assertEqual(result.total, 1)
+
+        with mock.patch("analytics.services.sync_games.iter_pages", return_value=pages):
+            self.assertEqual(sync_games(2024, incremental=True).total, 0)
+
+    def test_fresh_players_and_unchanged_teams_skip_work(self):
+        from analytics.services.sync_teams import sync_teams
+
+        with mock.patch("analytics.services.sync_players.iter_player_pages", return_value=[]) as fetch:
+            sync_players(incremental=True)
+            sync_players(incremental=True)
+        self.assertEqual(fetch.call_count, 1)
+
+        with mock.patch("analytics.services.sync_teams.get_if_changed", return_value=({"data": [MYSTICS]}, "v1")):
+            self.assertEqual(sync_teams(incremental=True).inserted, 1)
+            self.assertEqual(sync_teams(incremental=True).unchanged, 1)
+        with mock.patch("analytics.services.sync_teams.get_if_changed", return_value=(None, "v1")) as fetch:
+            self.assertEqual(sync_teams(incremental=True).unchanged, 1)
+        self.assertEqual(fetch.call_args.kwargs["etag"], "v1")
+
+
+class TeamSeasonStatTests(TestCase):
+    def test_grouped_recompute_upserts_in_place(self):
+        from analytics.models import TeamSeasonStat
+        from analytics.services.team_stats import recompute_team_season_stats
+
+        games = [_game(1, home_score=80), _game(2, home_score=70), {**_game(3), "home_team": LIBERTY, "visitor_team": MYSTICS}]
+        games.append({**_game(4), "status": "scheduled", "home_team_score": 0, "visitor_team_score": 0})
+        games.append({**_game(5), "status": "2nd Qtr", "home_team_score": 40, "visitor_team_score": 38})  # live
+        with mock.patch("analytics.services.sync_games.iter_pages", return_value=[("page:1", {"data": games})]):
+            sync_games(2024)
+
+        self.assertEqual(recompute_team_season_stats(2024), 2)
+        old_id = TeamSeasonStat.objects.get(team__external_id="1").id
+
+        with self.assertNumQueries(6):  # home + away aggregates, savepoint pair, upsert, stale delete
+            self.assertEqual(recompute_team_season_stats(2024), 2)
+        was = TeamSeasonStat.objects.get(team__external_id="1")
+        self.assertEqual(was.id, old_id)
+        # 80-75 W, 70-75 L at home; 75-80 L away
+        self.assertEqual((was.games_played, was.wins, was.losses), (3, 1, 2))
+        self.assertAlmostEqual(was.ppg, 75.0)
+        self.assertAlmostEqual(was.opp_ppg, 230 / 3)
+        ny = TeamSeasonStat.objects.get(team__external_id="2")
+        self.assertEqual((ny.wins, ny.losses), (2, 1))
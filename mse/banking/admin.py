@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib import admin
-from .models import BankAccount, Card, Payee, Transaction
+from .models import BankAccount, Card, DailyBalanceSnapshot, MerchantSpendRollup, Payee, Transaction
 
 
 
@@ -31,3 +31,17 @@ class CardAdmin(admin.ModelAdmin):
     list_display = ("display_name", "brand", "last4", "user", "linked_account", "status", "daily_limit")
     search_fields = ("user__username", "last4", "display_name")
     list_filter = ("status", "brand")
+
+
+@admin.register(DailyBalanceSnapshot)
+class DailyBalanceSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("day", "account", "opening_balance", "inflow", "outflow", "closing_balance", "txn_count")
+    search_fields = ("account__public_id",)
+    list_filter = ("day",)
+
+
+@admin.register(MerchantSpendRollup)
+class MerchantSpendRollupAdmin(admin.ModelAdmin):
+    list_display = ("month", "user", "merchant", "category", "total", "txn_count")
+    search_fields = ("user__username", "merchant")
+    list_filter = ("month", "category")
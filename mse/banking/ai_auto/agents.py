@@ -1,7 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, List
-import re
+
+from .intents import route_intent, scan
 
 
 @dataclass
@@ -12,30 +13,8 @@ class AgentResult:
     payload: Dict[str, Any]
 
 
-def _money(text: str) -> int | None:
-    m = re.search(r"\$?\s*([0-9]{1,3}(?:,[0-9]{3})+|[0-9]{3,6})", text or "")
-    if not m:
-        return None
-    try:
-        v = int(m.group(1).replace(",", ""))
-        if 1900 <= v <= 2100:
-            return None
-        return v
-    except Exception:
-        return None
-
-
 def route(text: str, state: Dict[str, Any]) -> str:
-    t = (text or "").lower()
-    if any(k in t for k in ["reset", "start over", "new session"]):
-        return "reset"
-    if any(k in t for k in ["monthly", "payment", "down", "apr", "term", "zip"]):
-        return "budget"
-    if any(k in t for k in ["inventory", "available", "models", "trims", "catalog"]):
-        return "inventory"
-    if any(k in t for k in ["recommend", "shortlist", "top 3", "suggest"]):
-        return "match"
-    return "intake" if "body_style" not in state or "monthly_target" not in state else "match"
+    return route_intent(scan(text), "body_style" in state and "monthly_target" in state)
 
 
 def agent_reset(_: str, __: Dict[str, Any]) -> AgentResult:
@@ -48,17 +27,17 @@ def agent_reset(_: str, __: Dict[str, Any]) -> AgentResult:
 
 
 def agent_intake(text: str, state: Dict[str, Any]) -> AgentResult:
-    t = (text or "").lower()
-    if "suv" in t: state["body_style"] = "SUV"
-    if "sedan" in t: state["body_style"] = "Sedan"
-    if "truck" in t: state["body_style"] = "Truck"
-    if "coupe" in t: state["body_style"] = "Coupe"
+    s = scan(text)
+    for style in ("SUV", "Sedan", "Truck", "Coupe"):  # last mentioned in this order wins
+        if s.has(f"body:{style}"):
+            state["body_style"] = style
 
-    if "new" in t: state["condition"] = "New"
-    elif "used" in t or "pre-owned" in t: state["condition"] = "Used"
-    elif "either" in t: state["condition"] = "Either"
+    for cond in ("New", "Used", "Either"):
+        if s.has(f"cond:{cond}"):
+            state["condition"] = cond
+            break
 
-    m = _money(text)
+    m = s.money
     if m and m < 5000:
         state["monthly_target"] = m
 
@@ -84,18 +63,16 @@ def agent_intake(text: str, state: Dict[str, Any]) -> AgentResult:
 
 
 def agent_budget(text: str, state: Dict[str, Any]) -> AgentResult:
-    t = (text or "").lower()
-    m = _money(text)
+    s = scan(text)
+    m = s.money
     if m and m >= 500:
         state["down_payment"] = m
 
-    for term in [36,48,60,72,84]:
-        if str(term) in t:
-            state["term_months"] = term
+    if s.terms:
+        state["term_months"] = max(s.terms)
 
-    z = re.search(r"\b([0-9]{5})\b", t)
-    if z:
-        state["zip_code"] = z.group(1)
+    if s.zip_code:
+        state["zip_code"] = s.zip_code
 
     monthly = state.get("monthly_target")
     term = state.get("term_months", 60)
@@ -142,14 +119,7 @@ def _badge_for_risk(risk_tier: str, est_price: int | None, max_amount: float | N
     return "Balanced"
 
 
-def agent_match(_: str, state: Dict[str, Any]) -> AgentResult:
-    body = state.get("body_style", "SUV")
-    cap = state.get("price_cap_est") or 0
-    credit = state.get("credit_snapshot") or {}
-    risk_tier = credit.get("risk_tier", "MEDIUM")
-    max_amount = credit.get("max_amount", cap) or cap
-
-    # curated picks (still used as fallback if inventory not fetched yet)
+def _curated_picks(body: str) -> List[Dict[str, Any]]:
     if body == "SUV":
         picks = [
             {"make":"Toyota","model":"RAV4","tier":"Core","why":"Reliability + resale"},
@@ -168,12 +138,27 @@ def agent_match(_: str, state: Dict[str, Any]) -> AgentResult:
             {"make":"Ford","model":"F-150","tier":"Core","why":"Versatility + availability"},
             {"make":"Audi","model":"Q5","tier":"Executive","why":"Luxury crossover (used)"},
         ]
+    return picks
+
+
+def agent_match(_: str, state: Dict[str, Any]) -> AgentResult:
+    body = state.get("body_style", "SUV")
+    cap = state.get("price_cap_est") or 0
+    credit = state.get("credit_snapshot") or {}
+    risk_tier = credit.get("risk_tier", "MEDIUM")
+    max_amount = credit.get("max_amount", cap) or cap
+
+    # local VehicleCatalog first (no network); curated picks if it has nothing yet
+    from .catalog import rank_for_buyer
+
+    picks = rank_for_buyer(body, cap or None, limit=3) or _curated_picks(body)
 
     for p in picks:
         p["target_budget_note"] = f"Target cap ≈ ${cap:,}"
         p["risk_tier"] = risk_tier
-        # cheap estimate (for badges). inventory integration overrides later.
-        est_price = cap if cap else None
+        # catalog rows carry a price band; curated picks fall back to the cap
+        band = p.get("price_band")
+        est_price = min(band["high"], cap) if band and cap else (band["high"] if band else (cap or None))
         p["est_price"] = est_price
         p["badge"] = _badge_for_risk(risk_tier, est_price, max_amount)
 
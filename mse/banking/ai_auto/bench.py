@@ -0,0 +1,132 @@
+from __future__ import annotations
+import random
+import re
+import time
+from typing import Any, Dict, List
+
+from .intents import route_intent, scan
+
+# Synthetic AI Auto conversations for the intent router benchmark
+# (management command: bench_intent_router). The legacy_* functions are the
+# pre-compiled-router keyword loops, kept as the reference for speed and parity.
+
+_OPENERS = [
+    "hi, looking for a {body}", "I want a {cond} {body} around ${monthly}/mo", "need a {body}, {cond}",
+    "{cond} {body} please", "what's available in {body}s?", "show me models and trims",
+]
+_BUDGET = [
+    "down payment ${down}, term {term} months, zip {zip}", "monthly ${monthly}, {term} month term",
+    "I can put {down} down", "apr matters, {term}mo, ZIP {zip}", "my zip is {zip}",
+]
+_CLOSERS = ["recommend", "top 3 please", "suggest something", "shortlist it", "start over", "reset", "thanks"]
+_BODIES = ["SUV", "sedan", "truck", "coupe", "crossover"]
+_CONDS = ["new", "used", "pre-owned", "either", ""]
+
+
+def synthetic_conversations(n: int, seed: int = 7) -> List[List[str]]:
+    rnd = random.Random(seed)
+    convos = []
+    for _ in range(n):
+        v = {
+            "body": rnd.choice(_BODIES),
+            "cond": rnd.choice(_CONDS),
+            "monthly": rnd.choice([350, 450, 600, 725, 1200]),
+            "down": rnd.choice([1500, 2500, "3,000", 5000, "12,500"]),
+            "term": rnd.choice([36, 48, 60, 72, 84]),
+            "zip": rnd.choice(["20001", "22201", "10027", "94110"]),
+        }
+        turns = [rnd.choice(_OPENERS)] + rnd.sample(_BUDGET, 2) + [rnd.choice(_CLOSERS)]
+        convos.append([t.format(**v) for t in turns])
+    return convos
+
+
+def legacy_route(text: str, state: Dict[str, Any]) -> str:
+    t = (text or "").lower()
+    if any(k in t for k in ["reset", "start over", "new session"]):
+        return "reset"
+    if any(k in t for k in ["monthly", "payment", "down", "apr", "term", "zip"]):
+        return "budget"
+    if any(k in t for k in ["inventory", "available", "models", "trims", "catalog"]):
+        return "inventory"
+    if any(k in t for k in ["recommend", "shortlist", "top 3", "suggest"]):
+        return "match"
+    return "intake" if "body_style" not in state or "monthly_target" not in state else "match"
+
+
+def legacy_extract(text: str) -> Dict[str, Any]:
+    """What agent_intake/agent_budget pulled out of a message before the intent engine."""
+    t = (text or "").lower()
+    out: Dict[str, Any] = {}
+    if "suv" in t: out["body_style"] = "SUV"
+    if "sedan" in t: out["body_style"] = "Sedan"
+    if "truck" in t: out["body_style"] = "Truck"
+    if "coupe" in t: out["body_style"] = "Coupe"
+    if "new" in t: out["condition"] = "New"
+    elif "used" in t or "pre-owned" in t: out["condition"] = "Used"
+    elif "either" in t: out["condition"] = "Either"
+
+    out["money"] = None
+    m = re.search(r"\$?\s*([0-9]{1,3}(?:,[0-9]{3})+|[0-9]{3,6})", text or "")
+    if m:
+        v = int(m.group(1).replace(",", ""))
+        out["money"] = None if 1900 <= v <= 2100 else v
+    for term in [36, 48, 60, 72, 84]:
+        if str(term) in t:
+            out["term_months"] = term
+    z = re.search(r"\b([0-9]{5})\b", t)
+    out["zip_code"] = z.group(1) if z else None
+    return out
+
+
+def extract(text: str) -> Dict[str, Any]:
+    """legacy_extract's shape, computed from one scan()."""
+    s = scan(text)
+    out: Dict[str, Any] = {}
+    for style in ("SUV", "Sedan", "Truck", "Coupe"):
+        if s.has(f"body:{style}"):
+            out["body_style"] = style
+    for cond in ("New", "Used", "Either"):
+        if s.has(f"cond:{cond}"):
+            out["condition"] = cond
+            break
+    out["money"] = s.money
+    if s.terms:
+        out["term_months"] = max(s.terms)
+    out["zip_code"] = s.zip_code
+    return out
+
+
+def run_benchmark(conversations: int = 5000, seed: int = 7) -> Dict[str, Any]:
+    convos = synthetic_conversations(conversations, seed)
+    messages = [m for c in convos for m in c]
+    states = [{}, {"body_style": "SUV", "monthly_target": 500}]
+
+    mismatches = sum(
+        legacy_route(m, st) != route_intent(scan(m), bool(st)) or legacy_extract(m) != extract(m)
+        for m in messages
+        for st in states
+    )
+
+    def timed(fn) -> float:
+        t0 = time.perf_counter()
+        for m in messages:
+            fn(m)
+        return (time.perf_counter() - t0) / len(messages) * 1e6
+
+    uncached = scan.__wrapped__  # time the scan itself, not the lru_cache
+
+    def legacy(m):
+        legacy_route(m, states[0])
+        legacy_extract(m)
+
+    def compiled(m):
+        # the agents read Scan fields directly; extract() only exists for the parity check
+        route_intent(uncached(m), False)
+
+    return {
+        "conversations": conversations,
+        "messages": len(messages),
+        "mismatches": mismatches,
+        "legacy_us_per_msg": round(timed(legacy), 2),
+        "compiled_us_per_msg": round(timed(compiled), 2),
+    }
@@ -0,0 +1,199 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db.models import Q
+
+from .inventory import estimate_price_band
+from .models import VehicleCatalog
+
+EXECUTIVE_MAKES = {
+    "acura", "audi", "bmw", "cadillac", "genesis", "infiniti", "jaguar", "land rover",
+    "lexus", "lincoln", "mercedes-benz", "porsche", "volvo",
+}
+
+# upstream body strings -> the body styles AI Auto asks about
+_BODY_RULES = [
+    (("sport utility", "suv", "crossover"), "SUV"),
+    (("pickup", "truck"), "Truck"),
+    (("coupe", "convertible"), "Coupe"),
+    (("sedan", "cars", "wagon", "hatchback"), "Sedan"),
+]
+
+
+def normalize_body(body: str) -> Optional[str]:
+    """AI Auto body style for an upstream body string, or None when it can't tell."""
+    b = (body or "").lower()
+    for needles, style in _BODY_RULES:
+        if any(n in b for n in needles):
+            return style
+    return None
+
+
+def _tier(make: str) -> str:
+    return "Executive" if make.strip().lower() in EXECUTIVE_MAKES else "Core"
+
+
+def _row(make: str, model: str, year: Optional[int], trim: str = "", body: str = "") -> VehicleCatalog:
+    tier = _tier(make)
+    band = estimate_price_band(year, tier)
+    return VehicleCatalog(
+        make=make[:64],
+        model=model[:64],
+        year=year,
+        trim=(trim or "")[:64],
+        body=(body or "")[:64],
+        body_style=normalize_body(body),
+        make_key=make.strip().lower()[:64],
+        model_key=model.strip().lower()[:64],
+        tier=tier,
+        price_low=band["low"],
+        price_high=band["high"],
+    )
+
+
+KEY_FIELDS = ["make_key", "model_key", "year", "trim"]
+PRICE_FIELDS = ["tier", "price_low", "price_high"]
+BODY_FIELDS = ["body", "body_style"]
+STALE_CHUNK = 200  # model-year groups per DELETE
+
+
+def _upsert(rows: List[VehicleCatalog]) -> int:
+    """
+    Insert-or-refresh rows on (make, model, year, trim) with INSERT ... ON
+    CONFLICT, so concurrent refresh/preload workers can't duplicate a row.
+    A model-level row (no trim) is redundant once trims exist for that model
+    year: it is neither inserted then nor kept. Returns rows written.
+    """
+    if not rows:
+        return 0
+
+    unique: Dict[Tuple, VehicleCatalog] = {}
+    for r in rows:
+        unique[(r.make_key, r.model_key, r.year, r.trim)] = r
+    trimmed = {k[:3] for k in unique if k[3]}
+    trimmed |= set(
+        VehicleCatalog.objects.filter(
+            make_key__in={k[0] for k in unique},
+            model_key__in={k[1] for k in unique},
+        ).exclude(trim="").values_list("make_key", "model_key", "year").distinct()
+    )
+    rows = [r for k, r in unique.items() if k[3] or k[:3] not in trimmed]
+
+    dated = [r for r in rows if r.year is not None]
+    # a model-only listing carries no body and must not wipe one learned from trims
+    for batch, fields in (
+        ([r for r in dated if r.body], BODY_FIELDS + PRICE_FIELDS),
+        ([r for r in dated if not r.body], PRICE_FIELDS),
+    ):
+        if batch:
+            VehicleCatalog.objects.bulk_create(
+                batch,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=KEY_FIELDS,
+                update_fields=fields,
+            )
+    undated = [r for r in rows if r.year is None]
+    if undated:
+        # only the partial constraint covers these; ON CONFLICT can't target it
+        VehicleCatalog.objects.bulk_create(undated, batch_size=500, ignore_conflicts=True)
+
+    touched = sorted(trimmed & {k[:3] for k in unique}, key=str)
+    for i in range(0, len(touched), STALE_CHUNK):
+        stale = Q()
+        for make_key, model_key, year in touched[i:i + STALE_CHUNK]:
+            stale |= Q(make_key=make_key, model_key=model_key, year=year, trim="")
+        VehicleCatalog.objects.filter(stale).delete()
+    return len(rows)
+
+
+def index_models(make: str, year: Optional[int], names: Iterable[str]) -> int:
+    return _upsert([_row(make, name, year) for name in names if name])
+
+
+def index_trims(trims: Iterable[Dict[str, Any]]) -> int:
+    return _upsert([
+        _row(t.get("make") or "", t.get("model") or "", t.get("year"), t.get("trim") or "", t.get("body") or "")
+        for t in trims
+        if t.get("make") and t.get("model")
+    ])
+
+
+def _prefix(field: str, q: str) -> Q:
+    # range form so a plain btree index serves it on every backend
+    q = q.strip().lower()
+    return Q(**{f"{field}__gte": q, f"{field}__lt": q + "\uffff"})
+
+
+def filter_catalog(
+    make: str = "",
+    model: str = "",
+    year: Optional[int] = None,
+    body_style: str = "",
+    price_cap: Optional[int] = None,
+):
+    """make/model are prefixes (typeahead); price_cap keeps rows whose band starts within it."""
+    qs = VehicleCatalog.objects.all()
+    if make:
+        qs = qs.filter(_prefix("make_key", make))
+    if model:
+        qs = qs.filter(_prefix("model_key", model))
+    if year:
+        qs = qs.filter(year=year)
+    if body_style:
+        qs = qs.filter(body_style=body_style)
+    if price_cap:
+        qs = qs.filter(price_low__lte=int(price_cap))
+    return qs
+
+
+def make_suggestions(prefix: str = "", limit: int = 20) -> List[str]:
+    qs = filter_catalog(make=prefix).order_by("make_key").values_list("make", flat=True).distinct()
+    return list(qs[:limit])
+
+
+def model_suggestions(make: str, prefix: str = "", year: Optional[int] = None, limit: int = 20) -> List[str]:
+    qs = (
+        filter_catalog(model=prefix, year=year)
+        .filter(make_key=make.strip().lower())
+        .order_by("model_key")
+        .values_list("model", flat=True)
+        .distinct()
+    )
+    return list(qs[:limit])
+
+
+def rank_for_buyer(body_style: str, price_cap: Optional[int], limit: int = 3) -> List[Dict[str, Any]]:
+    """
+    Best catalog matches for the buyer, one per make/model: rows whose whole
+    band fits the cap first, then newest model year, then band closest to the cap.
+    """
+    qs = filter_catalog(body_style=body_style, price_cap=price_cap or None).values(
+        "make", "model", "year", "trim", "tier", "price_low", "price_high"
+    )
+    cap = int(price_cap or 0)
+
+    def score(r):
+        fits = 1 if cap and r["price_high"] <= cap else 0
+        gap = abs(cap - r["price_high"]) if cap else 0
+        return (-fits, -(r["year"] or 0), gap, r["make"], r["model"])
+
+    picks: List[Dict[str, Any]] = []
+    seen = set()
+    for r in sorted(qs.order_by("-year", "price_high")[:2000], key=score):
+        k = (r["make"].lower(), r["model"].lower())
+        if k in seen:
+            continue
+        seen.add(k)
+        picks.append({
+            "make": r["make"],
+            "model": r["model"],
+            "year": r["year"],
+            "trim": r["trim"],
+            "tier": r["tier"],
+            "price_band": {"low": r["price_low"], "high": r["price_high"]},
+            "why": f"{r['tier']} {body_style or 'pick'} within estimated band",
+        })
+        if len(picks) >= limit:
+            break
+    return picks
@@ -0,0 +1,42 @@
+import json
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from .models import AutoBuyerSession
+
+
+def session_group(session_id) -> str:
+    return f"ai_auto_session_{session_id}"
+
+
+class AutoSessionConsumer(AsyncWebsocketConsumer):
+    """Pushes each chat turn's reply to every open tab of the session owner."""
+
+    async def connect(self):
+        self.session_id = int(self.scope["url_route"]["kwargs"]["session_id"])
+        user = self.scope.get("user")
+        if not user or not user.is_authenticated or not await self._owns_session(user):
+            await self.close()
+            return
+
+        self.group_name = session_group(self.session_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        await self.send(text_data=json.dumps({
+            "type": "connected",
+            "scope": "ai_auto_session",
+            "session_id": self.session_id,
+        }))
+
+    async def disconnect(self, close_code):
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def auto_reply(self, event):
+        await self.send(text_data=json.dumps(event.get("payload", {})))
+
+    @database_sync_to_async
+    def _owns_session(self, user) -> bool:
+        return AutoBuyerSession.objects.filter(id=self.session_id, user=user).exists()
@@ -1,13 +1,52 @@
 from __future__ import annotations
-from typing import Dict, Any
-from django.urls import reverse
-from django.test import Client
+import logging
+from typing import Dict, Any, Optional
 
-def fetch_credit_snapshot(user, payload: Dict[str, Any]) -> Dict[str, Any]:
+from django.conf import settings
 
-    c = Client()
-    c.force_login(user)
-    r = c.post(reverse("banking:ai_credit_score"), data=payload, content_type="application/json")
-    if r.status_code != 200:
+from banking.ai_credit.registry import registry
+from banking.ai_credit.scoring import payload_fingerprint, score_application
+
+from .models import AutoBuyerSession
+
+logger = logging.getLogger(__name__)
+
+# state key holding the fingerprint of the payload behind session.credit_snapshot
+SNAPSHOT_KEY = "credit_snapshot_key"
+
+
+def fetch_credit_snapshot(
+    user,
+    payload: Dict[str, Any],
+    session: Optional[AutoBuyerSession] = None,
+) -> Dict[str, Any]:
+    """
+    Score the buyer in-process (same snapshot dict and CreditApplication audit
+    row as POST /ai-credit/api/score/). With a session, an identical payload
+    under the same model version reuses the session's snapshot instead of
+    scoring and auditing it again; the new key is written into session.state
+    for the caller to save. Returns {} when scoring is unavailable.
+    """
+    if not getattr(settings, "BANKING_AI_ENABLED", False):
         return {}
-    return r.json()
+
+    try:
+        _, artifact = registry.get()
+    except RuntimeError:
+        return {}
+
+    key = payload_fingerprint(payload, artifact.version)
+    if session is not None and session.credit_snapshot and (session.state or {}).get(SNAPSHOT_KEY) == key:
+        return session.credit_snapshot
+
+    try:
+        snapshot = score_application(user, payload).as_snapshot()
+    except Exception:
+        logger.exception("Credit scoring failed for user %s", getattr(user, "pk", None))
+        return {}
+
+    if session is not None:
+        if session.state is None:
+            session.state = {}
+        session.state[SNAPSHOT_KEY] = key
+    return snapshot
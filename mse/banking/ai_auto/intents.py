@@ -0,0 +1,97 @@
+from __future__ import annotations
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+# Intent engine for the AI Auto agents. All keywords live in one table built
+# at import time and every message is scanned once: keywords by C-level
+# substring search (the old semantics exactly, overlaps included: "down" also
+# fires on "download"), numbers by a single compiled pass over digit runs.
+# route() and the agents then read the cached Scan instead of re-scanning.
+
+KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "reset": ("reset", "start over", "new session"),
+    "budget": ("monthly", "payment", "down", "apr", "term", "zip"),
+    "inventory": ("inventory", "available", "models", "trims", "catalog"),
+    "match": ("recommend", "shortlist", "top 3", "suggest"),
+    "body:SUV": ("suv",),
+    "body:Sedan": ("sedan",),
+    "body:Truck": ("truck",),
+    "body:Coupe": ("coupe",),
+    "cond:New": ("new",),
+    "cond:Used": ("used", "pre-owned"),
+    "cond:Either": ("either",),
+}
+
+TERMS = (36, 48, 60, 72, 84)
+_TERM_STRS = tuple((t, str(t)) for t in TERMS)
+
+_KEYWORD_TABLE: Tuple[Tuple[str, str], ...] = tuple(
+    (kw, tag) for tag, kws in KEYWORDS.items() for kw in kws
+)
+_DIGIT_RUN = re.compile(r"[0-9][0-9,]*")
+_MONEY_IN_RUN = re.compile(r"[0-9]{1,3}(?:,[0-9]{3})+|[0-9]{3,6}")
+
+
+class Scan(NamedTuple):
+    tags: FrozenSet[str]
+    money: Optional[int]        # first dollar-ish amount; None for years 1900-2100
+    zip_code: Optional[str]     # first standalone 5-digit number
+    terms: FrozenSet[int]       # loan terms mentioned anywhere (substring, like "36" in "36k")
+
+    def has(self, tag: str) -> bool:
+        return tag in self.tags
+
+
+@lru_cache(maxsize=2048)
+def scan(text: str) -> Scan:
+    """
+    Everything the router and agents need from one message.
+    Cached: route() and the chosen agent look at the same text.
+    """
+    t = (text or "").lower()
+    money: Optional[int] = None
+    money_seen = False
+    zip_code: Optional[str] = None
+    terms = set()
+
+    tags = {tag for kw, tag in _KEYWORD_TABLE if kw in t}
+
+    for m in _DIGIT_RUN.finditer(t):
+        run = m.group()
+        if not money_seen:
+            hit = _MONEY_IN_RUN.search(run)
+            if hit:
+                money_seen = True
+                v = int(hit.group().replace(",", ""))
+                money = None if 1900 <= v <= 2100 else v
+
+        if zip_code is None and len(run) >= 5:
+            # \b[0-9]{5}\b: a comma-separated group of 5; the run's outer edges must touch non-word chars
+            start, end = m.span()
+            groups = run.split(",")
+            last = len(groups) - 1
+            for i, group in enumerate(groups):
+                if len(group) != 5:
+                    continue
+                if i == 0 and start and (t[start - 1].isalnum() or t[start - 1] == "_"):
+                    continue
+                if i == last and end < len(t) and (t[end].isalnum() or t[end] == "_"):
+                    continue
+                zip_code = group
+                break
+
+        if len(run) >= 2:
+            for term, digits in _TERM_STRS:
+                if digits in run:
+                    terms.add(term)
+
+    return Scan(frozenset(tags), money, zip_code, frozenset(terms))
+
+
+def route_intent(s: Scan, has_profile: bool) -> str:
+    """Router priority: reset > budget > inventory > match > intake/match."""
+    for tag in ("reset", "budget", "inventory", "match"):
+        if tag in s.tags:
+            return tag
+    return "match" if has_profile else "intake"
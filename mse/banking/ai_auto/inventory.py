@@ -1,6 +1,18 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
 import requests
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import CatalogCacheEntry
+
+logger = logging.getLogger(__name__)
 
 # Public catalog APIs:
 # - NHTSA vPIC: makes/models (very stable)
@@ -9,25 +21,48 @@ import requests
 NHTSA_BASE = "https://vpic.nhtsa.dot.gov/api/vehicles"
 CARQUERY = "https://www.carqueryapi.com/api/0.3/"
 
-def nhtsa_makes() -> List[str]:
+# Catalog cache: fresh entries are served from the table, stale ones are served
+# as-is while a background refresh runs, missing ones are fetched inline.
+CATALOG_TTL = {
+    "makes": timedelta(days=7),
+    "models": timedelta(days=7),
+    "trims": timedelta(days=3),
+}
+RETRY_AFTER_FAILURE = timedelta(minutes=15)
+FETCH_TIMEOUT = 10
+# per-process copy of fresh entries, so hot keys (makes) skip the JSON decode
+LOCAL_TTL = timedelta(minutes=5)
+
+_local: Dict[str, tuple] = {}
+
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="catalog-refresh")
+_in_flight: set = set()
+_in_flight_lock = threading.Lock()
+
+
+# -----------------------
+# Upstream fetchers
+# -----------------------
+
+def fetch_nhtsa_makes() -> List[str]:
     url = f"{NHTSA_BASE}/getallmakes?format=json"
-    data = requests.get(url, timeout=20).json()
+    data = requests.get(url, timeout=FETCH_TIMEOUT).json()
     return sorted({m["Make_Name"] for m in data.get("Results", []) if m.get("Make_Name")})
 
-def nhtsa_models(make: str, year: int | None = None) -> List[str]:
+def fetch_nhtsa_models(make: str, year: int | None = None) -> List[str]:
     if year:
         url = f"{NHTSA_BASE}/GetModelsForMakeYear/make/{make}/modelyear/{year}?format=json"
     else:
         url = f"{NHTSA_BASE}/GetModelsForMake/{make}?format=json"
-    data = requests.get(url, timeout=20).json()
+    data = requests.get(url, timeout=FETCH_TIMEOUT).json()
     return sorted({m["Model_Name"] for m in data.get("Results", []) if m.get("Model_Name")})
 
-def carquery_trims(make: str, model: str, year: int | None = None) -> List[Dict[str, Any]]:
+def fetch_carquery_trims(make: str, model: str, year: int | None = None) -> List[Dict[str, Any]]:
     params = {"cmd":"getTrims", "make":make, "model":model}
     if year:
         params["year"] = str(year)
 
-    r = requests.get(CARQUERY, params=params, timeout=20)
+    r = requests.get(CARQUERY, params=params, timeout=FETCH_TIMEOUT)
     text = r.text.strip()
 
     # CarQuery sometimes returns JSONP: "?(...json...)"
@@ -38,7 +73,6 @@ def carquery_trims(make: str, model: str, year: int | None = None) -> List[Dict[
     try:
         data = r.json()
     except Exception:
-        import json
         data = json.loads(text)
 
     trims = data.get("Trims", []) or []
@@ -55,6 +89,101 @@ def carquery_trims(make: str, model: str, year: int | None = None) -> List[Dict[
         })
     return out
 
+
+# -----------------------
+# Cache layer
+# -----------------------
+
+def catalog_key(kind: str, *parts: Any) -> str:
+    return ":".join([kind] + [str(p).strip().lower() for p in parts if p not in (None, "")])[:255]
+
+def _store(key: str, kind: str, payload: Any) -> None:
+    now = timezone.now()
+    CatalogCacheEntry.objects.update_or_create(
+        key=key,
+        defaults={"kind": kind, "payload": payload, "fetched_at": now, "expires_at": now + CATALOG_TTL[kind]},
+    )
+
+def refresh(key: str, kind: str, fetch: Callable[[], Any]) -> Optional[Any]:
+    """Fetch from upstream and store. On failure keep any old entry and back off; returns None."""
+    try:
+        payload = fetch()
+    except Exception as exc:
+        logger.warning("Catalog fetch failed for %s: %s", key, exc)
+        retry_at = timezone.now() + RETRY_AFTER_FAILURE
+        if not CatalogCacheEntry.objects.filter(key=key).update(expires_at=retry_at):
+            # negative entry: while upstream is down, misses answer [] instantly instead of timing out
+            CatalogCacheEntry.objects.get_or_create(key=key, defaults={"kind": kind, "payload": [], "expires_at": retry_at})
+        return None
+    _store(key, kind, payload)
+    return payload
+
+def _refresh_in_background(key: str, kind: str, fetch: Callable[[], Any]) -> None:
+    with _in_flight_lock:
+        if key in _in_flight:
+            return
+        _in_flight.add(key)
+
+    def run():
+        close_old_connections()
+        try:
+            refresh(key, kind, fetch)
+        finally:
+            close_old_connections()
+            with _in_flight_lock:
+                _in_flight.discard(key)
+
+    _refresh_pool.submit(run)
+
+def cached_lookup(kind: str, key: str, fetch: Callable[[], Any]) -> Any:
+    now = timezone.now()
+    hit = _local.get(key)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+
+    entry = CatalogCacheEntry.objects.filter(key=key).only("payload", "expires_at").first()
+    if entry is not None:
+        if entry.expires_at <= now:
+            _refresh_in_background(key, kind, fetch)
+        else:
+            _local[key] = (min(entry.expires_at, now + LOCAL_TTL), entry.payload)
+        return entry.payload
+
+    payload = refresh(key, kind, fetch)
+    return payload if payload is not None else []
+
+
+# -----------------------
+# Public lookups (cached)
+# -----------------------
+
+def nhtsa_makes() -> List[str]:
+    return cached_lookup("makes", catalog_key("makes"), fetch_nhtsa_makes)
+
+def nhtsa_models(make: str, year: int | None = None) -> List[str]:
+    return cached_lookup("models", catalog_key("models", make, year), lambda: fetch_and_index_models(make, year))
+
+def carquery_trims(make: str, model: str, year: int | None = None) -> List[Dict[str, Any]]:
+    return cached_lookup(
+        "trims", catalog_key("trims", make, model, year), lambda: fetch_and_index_trims(make, model, year)
+    )
+
+# Every upstream fetch also feeds the local VehicleCatalog index.
+
+def fetch_and_index_models(make: str, year: int | None = None) -> List[str]:
+    from .catalog import index_models
+
+    names = fetch_nhtsa_models(make, year)
+    index_models(make, year, names)
+    return names
+
+def fetch_and_index_trims(make: str, model: str, year: int | None = None) -> List[Dict[str, Any]]:
+    from .catalog import index_trims
+
+    trims = fetch_carquery_trims(make, model, year)
+    index_trims(trims)
+    return trims
+
 def estimate_price_band(year: int | None, tier: str = "Core") -> Dict[str, int]:
     # simple deterministic band (replace later with paid pricing API)
     base = 26000 if tier == "Core" else 34000
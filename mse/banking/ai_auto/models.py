@@ -103,3 +103,59 @@ class BuyerPlanVehicle(models.Model):
 
     def __str__(self) -> str:
         return f"{self.year} {self.make} {self.model}"
+
+
+class CatalogCacheEntry(models.Model):
+    """
+    Cached vehicle-catalog lookup (NHTSA makes/models, CarQuery trims).
+    Served while fresh; served stale (and refreshed in the background) after expires_at.
+    """
+    key = models.CharField(max_length=255, unique=True)
+    kind = models.CharField(max_length=16)  # makes / models / trims
+    payload = models.JSONField(default=list, blank=True)
+    fetched_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return f"CatalogCacheEntry({self.key})"
+
+
+class VehicleCatalog(models.Model):
+    """
+    Local vehicle index built from NHTSA/CarQuery responses (see ai_auto.catalog).
+    *_key columns are lowercased copies used for indexed prefix lookups.
+    """
+    make = models.CharField(max_length=64)
+    model = models.CharField(max_length=64)
+    year = models.PositiveSmallIntegerField(null=True, blank=True)
+    trim = models.CharField(max_length=64, blank=True, default="")
+    body = models.CharField(max_length=64, blank=True, default="")  # as reported upstream
+    body_style = models.CharField(max_length=16, null=True, blank=True)  # SUV / Sedan / Truck / Coupe; NULL = unknown
+
+    make_key = models.CharField(max_length=64)
+    model_key = models.CharField(max_length=64)
+
+    tier = models.CharField(max_length=16, default="Core")  # Core / Executive
+    price_low = models.PositiveIntegerField(default=0)
+    price_high = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["make_key", "model_key", "year"]),
+            models.Index(fields=["model_key"]),
+            models.Index(fields=["body_style", "price_low"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["make_key", "model_key", "year", "trim"], name="vehicle_catalog_unique_trim"),
+            # NULLs are distinct in the constraint above
+            models.UniqueConstraint(
+                fields=["make_key", "model_key", "trim"],
+                condition=models.Q(year__isnull=True),
+                name="vehicle_catalog_unique_undated_trim",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.year or ''} {self.make} {self.model} {self.trim}".strip()
@@ -0,0 +1,6 @@
+from django.urls import re_path
+from . import consumers
+
+websocket_urlpatterns = [
+    re_path(r"ws/ai-auto/session/(?P<session_id>\d+)/$", consumers.AutoSessionConsumer.as_asgi()),
+]
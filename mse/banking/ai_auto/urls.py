@@ -16,4 +16,5 @@ urlpatterns = [
     path("inventory/makes/", views.inventory_makes, name="ai_auto_inventory_makes"),
     path("inventory/models/", views.inventory_models, name="ai_auto_inventory_models"),
     path("inventory/trims/", views.inventory_trims, name="ai_auto_inventory_trims"),
+    path("inventory/search/", views.inventory_search, name="ai_auto_inventory_search"),
 ]
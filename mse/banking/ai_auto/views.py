@@ -1,22 +1,32 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict
+import logging
+from datetime import timedelta
+from typing import Any, Dict, List
 
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse, HttpRequest, HttpResponse
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.http import FileResponse, JsonResponse, HttpRequest, HttpResponse
 from django.shortcuts import render
+from django.utils import timezone
 from django.views.decorators.http import require_POST
 
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from banking.services.documents import BUYER_PLAN_LAYOUT, Block, Gap, Text, cached_pdf, heading
 
+from .catalog import filter_catalog
+from .consumers import session_group
 from .credit_bridge import fetch_credit_snapshot
 from .inventory import nhtsa_makes, nhtsa_models, carquery_trims
 from .models import AutoBuyerSession, AutoBuyerMessage, BuyerPlan, BuyerPlanVehicle
 from .services import run_multi_agent
 
+logger = logging.getLogger(__name__)
+
 
 # -----------------------
 # Feature gate + helpers
@@ -149,73 +159,140 @@ def buyer_plan(request: HttpRequest):
 # APIs
 # -----------------------
 
+# Chat turns run async under ASGI (Procfile: gunicorn + UvicornWorker): the
+# agents and the credit bridge run in the sync thread, then the turn lands as
+# one bulk INSERT of both messages plus one session UPDATE, and the reply is
+# pushed to ws/ai-auto/session/<id>/, which ai_auto/home.html subscribes to.
+
+RECOMMEND_FORM_KEYS = [
+    "monthly_target",
+    "down_payment",
+    "body_style",
+    "condition",
+    "term_months",
+    "zip_code",
+    "annual_income",
+    "dti",
+]
+
+
+def _json_body(request: HttpRequest):
+    try:
+        return json.loads(request.body.decode("utf-8"))
+    except Exception:
+        return None
+
+
+async def _aget_or_create_session(user) -> AutoBuyerSession:
+    session = await (
+        AutoBuyerSession.objects
+        .filter(user=user, is_active=True)
+        .order_by("-updated_at")
+        .afirst()
+    )
+    if not session:
+        session = await AutoBuyerSession.objects.acreate(user=user, state={}, is_active=True)
+    return session
+
+
+@transaction.atomic
+def _persist_turn(
+    session: AutoBuyerSession,
+    user_content: str,
+    user_payload: Dict[str, Any],
+    result,
+    **session_fields: Any,
+) -> None:
+    """Both messages in one INSERT, session state (and any extra fields) in one UPDATE."""
+    now = timezone.now()
+    AutoBuyerMessage.objects.bulk_create([
+        AutoBuyerMessage(session=session, created_at=now, role="user", content=user_content, payload=user_payload),
+        # a tick later so ordering by created_at keeps the turn in order
+        AutoBuyerMessage(
+            session=session,
+            created_at=now + timedelta(microseconds=1),
+            role="assistant",
+            agent=result.agent,
+            content=result.reply,
+            payload=result.payload or {},
+        ),
+    ])
+    AutoBuyerSession.objects.filter(id=session.id).update(state=session.state, updated_at=now, **session_fields)
+    session.updated_at = now
+
+
+async def _stream_reply(session: AutoBuyerSession, result) -> None:
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        await channel_layer.group_send(
+            session_group(session.id),
+            {
+                "type": "auto.reply",
+                "payload": {
+                    "type": "reply",
+                    "agent": result.agent,
+                    "reply": result.reply,
+                    "payload": result.payload,
+                    "state": session.state,
+                },
+            },
+        )
+    except Exception:
+        # the HTTP response still carries the reply
+        logger.warning("AI Auto reply push failed for session %s", session.id, exc_info=True)
+
+
+async def _finish_turn(session, user_content, user_payload, result, **session_fields) -> JsonResponse:
+    session.state = result.state or {}
+    await sync_to_async(_persist_turn)(session, user_content, user_payload, result, **session_fields)
+    await _stream_reply(session, result)
+    return JsonResponse(
+        {"ok": True, "reply": result.reply, "payload": result.payload, "state": session.state}
+    )
+
+
 @require_POST
 @login_required
-def ai_auto_message_api(request: HttpRequest):
+async def ai_auto_message_api(request: HttpRequest):
     if not _ai_enabled():
         return JsonResponse({"ok": False, "error": "AI disabled"}, status=404)
 
-    try:
-        body = json.loads(request.body.decode("utf-8"))
-    except Exception:
+    body = _json_body(request)
+    if body is None:
         return JsonResponse({"ok": False, "error": "Invalid JSON"}, status=400)
 
     text = (body.get("text") or "").strip()
     if not text:
         return JsonResponse({"ok": False, "error": "Empty message"}, status=400)
 
-    session = _get_or_create_session(request.user)
-    AutoBuyerMessage.objects.create(session=session, role="user", content=text)
-
-    result = run_multi_agent(text=text, state=session.state or {})
-    session.state = result.state or {}
-    session.save(update_fields=["state", "updated_at"])
-
-    AutoBuyerMessage.objects.create(
-        session=session,
-        role="assistant",
-        agent=result.agent,
-        content=result.reply,
-        payload=result.payload or {},
-    )
-
-    return JsonResponse(
-        {"ok": True, "reply": result.reply, "payload": result.payload, "state": session.state}
-    )
+    session = await _aget_or_create_session(await request.auser())
+    result = await sync_to_async(run_multi_agent)(text=text, state=session.state or {})
+    return await _finish_turn(session, text, {}, result)
 
 
 @require_POST
 @login_required
-def ai_auto_recommend_api(request: HttpRequest):
+async def ai_auto_recommend_api(request: HttpRequest):
     if not _ai_enabled():
         return JsonResponse({"ok": False, "error": "AI disabled"}, status=404)
 
-    try:
-        body = json.loads(request.body.decode("utf-8"))
-    except Exception:
+    body = _json_body(request)
+    if body is None:
         return JsonResponse({"ok": False, "error": "Invalid JSON"}, status=400)
 
-    session = _get_or_create_session(request.user)
+    user = await request.auser()
+    session = await _aget_or_create_session(user)
     state = session.state or {}
 
     # Persist form fields into state (banking-grade continuity)
-    for key in [
-        "monthly_target",
-        "down_payment",
-        "body_style",
-        "condition",
-        "term_months",
-        "zip_code",
-        "annual_income",
-        "dti",
-    ]:
+    for key in RECOMMEND_FORM_KEYS:
         if key in body and body[key] not in (None, "", []):
             state[key] = body[key]
 
     _ensure_price_cap(state)
-
     session.state = state
-    session.save(update_fields=["state", "updated_at"])
 
     # Credit snapshot (AI Credit bridge)
     credit_payload = {
@@ -235,36 +312,15 @@ def ai_auto_recommend_api(request: HttpRequest):
         "pub_rec": body.get("pub_rec"),
     }
 
-    credit_snapshot = fetch_credit_snapshot(request.user, credit_payload)
+    credit_snapshot = await sync_to_async(fetch_credit_snapshot)(user, credit_payload, session=session)
+    extra: Dict[str, Any] = {}
     if credit_snapshot:
-        session.credit_snapshot = credit_snapshot
         state["credit_snapshot"] = credit_snapshot
-        session.state = state
-        session.save(update_fields=["credit_snapshot", "state", "updated_at"])
-
-    AutoBuyerMessage.objects.create(
-        session=session,
-        role="user",
-        content="[FORM SUBMIT] Generate recommendations",
-        payload=body,
-    )
+        extra["credit_snapshot"] = credit_snapshot
 
     # Run multi-agent matching
-    result = run_multi_agent(text="recommend", state=session.state or {})
-    session.state = result.state or {}
-    session.save(update_fields=["state", "updated_at"])
-
-    AutoBuyerMessage.objects.create(
-        session=session,
-        role="assistant",
-        agent=result.agent,
-        content=result.reply,
-        payload=result.payload or {},
-    )
-
-    return JsonResponse(
-        {"ok": True, "reply": result.reply, "payload": result.payload, "state": session.state}
-    )
+    result = await sync_to_async(run_multi_agent)(text="recommend", state=state)
+    return await _finish_turn(session, "[FORM SUBMIT] Generate recommendations", body, result, **extra)
 
 
 @require_POST
@@ -330,6 +386,38 @@ def add_vehicle_to_plan_api(request: HttpRequest):
 # Buyer Plan PDF export
 # -----------------------
 
+def _buyer_plan_blocks(plan: BuyerPlan, session: AutoBuyerSession) -> List[Block]:
+    blocks: List[Block] = [
+        heading("AI Auto — Buyer Plan (Executive Brief)", size=14, lead=30),
+        Text(f"Plan: {plan.title}", lead=16),
+    ]
+
+    snap = session.credit_snapshot or {}
+    if snap:
+        blocks += [
+            heading("Credit Intelligence Snapshot"),
+            Text(f"Risk Tier: {snap.get('risk_tier')}", indent=10),
+            Text(f"Decision: {snap.get('decision')}", indent=10),
+            Text(f"APR: {snap.get('apr')}", indent=10),
+            Text(f"Max Amount: {snap.get('max_amount')}", indent=10, lead=18),
+        ]
+
+    blocks.append(heading("Checklist"))
+    blocks += [Text(f"• {item}", indent=10) for item in (plan.checklist or [])]
+
+    vehicles = list(plan.vehicles.all().order_by("-created_at")[:20])
+    if vehicles:
+        blocks += [Gap(10), heading("Selected Vehicles")]
+        blocks += [
+            Text(
+                f"• {v.year or ''} {v.make} {v.model} {v.trim or ''}  |  Badge: {v.badge or ''}  |  Est: {v.price or ''}",
+                indent=10,
+            )
+            for v in vehicles
+        ]
+    return blocks
+
+
 @login_required
 def buyer_plan_export_pdf(request: HttpRequest):
     if not _ai_enabled():
@@ -340,94 +428,86 @@ def buyer_plan_export_pdf(request: HttpRequest):
     if not plan:
         return HttpResponse("No plan found.", status=404)
 
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = 'attachment; filename="buyer_plan.pdf"'
+    # unchanged plan -> same content hash -> served from storage without re-rendering
+    path = cached_pdf(f"buyer_plan/{plan.id}", _buyer_plan_blocks(plan, session), BUYER_PLAN_LAYOUT)
+    return FileResponse(
+        default_storage.open(path, "rb"),
+        as_attachment=True,
+        filename="buyer_plan.pdf",
+        content_type="application/pdf",
+    )
 
-    c = canvas.Canvas(response, pagesize=letter)
-    width, height = letter
 
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, height - 50, "AI Auto — Buyer Plan (Executive Brief)")
+# -----------------------
+# Inventory endpoints
+# -----------------------
 
-    c.setFont("Helvetica", 10)
-    y = height - 80
-    c.drawString(50, y, f"Plan: {plan.title}")
-    y -= 16
+INVENTORY_LIMIT = 400
 
-    snap = session.credit_snapshot or {}
-    if snap:
-        c.setFont("Helvetica-Bold", 11)
-        c.drawString(50, y, "Credit Intelligence Snapshot")
-        y -= 14
-        c.setFont("Helvetica", 10)
-        c.drawString(60, y, f"Risk Tier: {snap.get('risk_tier')}")
-        y -= 12
-        c.drawString(60, y, f"Decision: {snap.get('decision')}")
-        y -= 12
-        c.drawString(60, y, f"APR: {snap.get('apr')}")
-        y -= 12
-        c.drawString(60, y, f"Max Amount: {snap.get('max_amount')}")
-        y -= 18
-
-    c.setFont("Helvetica-Bold", 11)
-    c.drawString(50, y, "Checklist")
-    y -= 14
-    c.setFont("Helvetica", 10)
-    for item in (plan.checklist or []):
-        c.drawString(60, y, f"• {item}")
-        y -= 12
-        if y < 80:
-            c.showPage()
-            y = height - 50
 
-    vehicles = list(plan.vehicles.all().order_by("-created_at")[:20])
-    if vehicles:
-        y -= 10
-        c.setFont("Helvetica-Bold", 11)
-        c.drawString(50, y, "Selected Vehicles")
-        y -= 14
-        c.setFont("Helvetica", 10)
-        for v in vehicles:
-            c.drawString(
-                60,
-                y,
-                f"• {v.year or ''} {v.make} {v.model} {v.trim or ''}  |  Badge: {v.badge or ''}  |  Est: {v.price or ''}"
-            )
-            y -= 12
-            if y < 80:
-                c.showPage()
-                y = height - 50
+def _int_param(request: HttpRequest, name: str, default: int | None = None) -> int | None:
+    raw = request.GET.get(name, "")
+    return int(raw) if raw.isdigit() else default
 
-    c.showPage()
-    c.save()
-    return response
 
+def _prefix_filter(names, q: str, limit: int):
+    q = q.strip().lower()
+    if q:
+        names = [n for n in names if n.lower().startswith(q)]
+    return names[:limit]
 
-# -----------------------
-# Inventory endpoints
-# -----------------------
 
 @login_required
 def inventory_makes(request: HttpRequest):
-    return JsonResponse({"ok": True, "makes": nhtsa_makes()[:400]})
+    limit = min(_int_param(request, "limit", INVENTORY_LIMIT), INVENTORY_LIMIT)
+    return JsonResponse({"ok": True, "makes": _prefix_filter(nhtsa_makes(), request.GET.get("q", ""), limit)})
 
 
 @login_required
 def inventory_models(request: HttpRequest):
     make = request.GET.get("make", "")
-    year = request.GET.get("year")
-    year_i = int(year) if year and year.isdigit() else None
+    year_i = _int_param(request, "year")
     if not make:
         return JsonResponse({"ok": False, "error": "make required"}, status=400)
-    return JsonResponse({"ok": True, "models": nhtsa_models(make=make, year=year_i)[:400]})
+    limit = min(_int_param(request, "limit", INVENTORY_LIMIT), INVENTORY_LIMIT)
+    models = _prefix_filter(nhtsa_models(make=make, year=year_i), request.GET.get("q", ""), limit)
+    return JsonResponse({"ok": True, "models": models})
+
+
+@login_required
+def inventory_search(request: HttpRequest):
+    """
+    Typeahead over the local VehicleCatalog (no upstream calls).
+    ?make=&model= are prefixes; body_style, year, price_cap filter.
+    price_cap=session uses the buyer's price_cap_est.
+    """
+    price_cap = request.GET.get("price_cap", "")
+    if price_cap == "session":
+        session = _get_or_create_session(request.user)
+        cap = (session.state or {}).get("price_cap_est")
+    else:
+        cap = int(price_cap) if price_cap.isdigit() else None
+
+    limit = min(_int_param(request, "limit", 25), 100)
+    rows = (
+        filter_catalog(
+            make=request.GET.get("make", ""),
+            model=request.GET.get("model", ""),
+            year=_int_param(request, "year"),
+            body_style=request.GET.get("body_style", ""),
+            price_cap=cap,
+        )
+        .order_by("make_key", "model_key", "-year", "trim")
+        .values("make", "model", "year", "trim", "body_style", "tier", "price_low", "price_high")[:limit]
+    )
+    return JsonResponse({"ok": True, "results": list(rows)})
 
 
 @login_required
 def inventory_trims(request: HttpRequest):
     make = request.GET.get("make", "")
     model = request.GET.get("model", "")
-    year = request.GET.get("year")
-    year_i = int(year) if year and year.isdigit() else None
+    year_i = _int_param(request, "year")
     if not make or not model:
         return JsonResponse({"ok": False, "error": "make & model required"}, status=400)
     trims = carquery_trims(make=make, model=model, year=year_i)
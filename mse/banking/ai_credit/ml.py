@@ -1,9 +1,9 @@
 from __future__ import annotations
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import OneHotEncoder
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.impute import SimpleImputer
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 
 NUMERIC = [
     "loan_amnt",
@@ -24,10 +24,15 @@ CATEGORICAL = [
     "purpose",
 ]
 
-def build_pipeline() -> Pipeline:
-    num_pipe = Pipeline([
-        ("imputer", SimpleImputer(strategy="median")),
-    ])
+def build_pipeline(incremental: bool = False) -> Pipeline:
+    """
+    incremental=True swaps in a scaled SGD logistic model so the "model" step
+    can be trained with partial_fit chunk by chunk (see train_credit_model_chunked).
+    """
+    num_steps = [("imputer", SimpleImputer(strategy="median"))]
+    if incremental:
+        num_steps.append(("scaler", StandardScaler()))
+    num_pipe = Pipeline(num_steps)
     cat_pipe = Pipeline([
         ("imputer", SimpleImputer(strategy="most_frequent")),
         ("onehot", OneHotEncoder(handle_unknown="ignore")),
@@ -38,5 +43,8 @@ def build_pipeline() -> Pipeline:
         ("cat", cat_pipe, CATEGORICAL),
     ])
 
-    model = LogisticRegression(max_iter=2500, n_jobs=None)
+    if incremental:
+        model = SGDClassifier(loss="log_loss", alpha=1e-4, random_state=42)
+    else:
+        model = LogisticRegression(max_iter=2500, n_jobs=None)
     return Pipeline([("prep", pre), ("model", model)])
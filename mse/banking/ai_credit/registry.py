@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+import joblib
+from django.conf import settings
+
+from .models import CreditModelArtifact
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """
+    Keeps the active credit pipeline in memory.
+
+    The active artifact is re-checked at most every CREDIT_MODEL_CHECK_SECONDS
+    (one small lookup); joblib.load only runs when the active artifact changes.
+    invalidate() forces the next call to re-check, e.g. right after training.
+    """
+
+    def __init__(self, latency_window: int = 1000):
+        self._lock = threading.Lock()
+        self._pipe: Any = None
+        self._artifact: Optional[CreditModelArtifact] = None
+        self._checked_at = float("-inf")
+
+        self.load_count = 0
+        self.last_load_ms: Optional[float] = None
+        self.last_loaded_at: Optional[float] = None
+        self.score_count = 0
+        self._latencies_ms: deque = deque(maxlen=latency_window)
+
+    @property
+    def check_seconds(self) -> float:
+        return float(getattr(settings, "CREDIT_MODEL_CHECK_SECONDS", 30))
+
+    def _active_key(self) -> Optional[Tuple[int, str]]:
+        return (
+            CreditModelArtifact.objects.filter(is_active=True)
+            .order_by("-created_at")
+            .values_list("id", "artifact_path")
+            .first()
+        )
+
+    def _load(self, artifact_id: int) -> None:
+        artifact = CreditModelArtifact.objects.get(id=artifact_id)
+        t0 = time.perf_counter()
+        pipe = joblib.load(artifact.artifact_path)
+        self.last_load_ms = (time.perf_counter() - t0) * 1000.0
+        self.last_loaded_at = time.time()
+        self.load_count += 1
+        self._pipe, self._artifact = pipe, artifact
+        logger.info("Loaded credit model %s in %.1f ms", artifact.version, self.last_load_ms)
+
+    def get(self) -> Tuple[Any, CreditModelArtifact]:
+        now = time.monotonic()
+        if self._pipe is not None and now - self._checked_at < self.check_seconds:
+            return self._pipe, self._artifact
+
+        with self._lock:
+            if self._pipe is None or now - self._checked_at >= self.check_seconds:
+                key = self._active_key()
+                if key is None:
+                    self._pipe = self._artifact = None
+                    raise RuntimeError("No active credit model. Train one first.")
+                if self._artifact is None or (self._artifact.id, self._artifact.artifact_path) != key:
+                    self._load(key[0])
+                self._checked_at = now
+            return self._pipe, self._artifact
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._checked_at = float("-inf")
+
+    def warm(self) -> bool:
+        """Load the active model ahead of the first request. Never raises."""
+        try:
+            self.get()
+            return True
+        except Exception as exc:
+            logger.warning("Credit model warm-up skipped: %s", exc)
+            return False
+
+    def record_latency(self, ms: float) -> None:
+        self.score_count += 1
+        self._latencies_ms.append(ms)
+
+    def metrics(self) -> Dict[str, Any]:
+        lat = sorted(self._latencies_ms)
+
+        def pct(p: float) -> Optional[float]:
+            if not lat:
+                return None
+            return round(lat[min(len(lat) - 1, int(p * len(lat)))], 3)
+
+        return {
+            "model_version": self._artifact.version if self._artifact else None,
+            "loaded": self._pipe is not None,
+            "load_count": self.load_count,
+            "last_load_ms": round(self.last_load_ms, 3) if self.last_load_ms is not None else None,
+            "last_loaded_at": self.last_loaded_at,
+            "score_count": self.score_count,
+            "score_ms_p50": pct(0.50),
+            "score_ms_p95": pct(0.95),
+            "score_ms_max": round(lat[-1], 3) if lat else None,
+        }
+
+
+registry = ModelRegistry()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from .models import CreditApplication
+from .policy import recommend_terms
+from .services import FEATURE_WHITELIST, score
+
+
+@dataclass(frozen=True)
+class CreditDecision:
+    prob_default: float
+    model_version: str
+    terms: Dict[str, Any]
+    application_id: int
+
+    def as_snapshot(self) -> Dict[str, Any]:
+        """The JSON body /ai-credit/api/score/ returns (and AI Auto stores as credit_snapshot)."""
+        return {
+            "ok": True,
+            "prob_default": round(self.prob_default, 3),
+            "model_version": self.model_version,
+            **self.terms,
+        }
+
+
+def score_application(user, payload: Dict[str, Any]) -> CreditDecision:
+    """
+    Score one applicant, apply policy and write the CreditApplication audit row.
+    Shared by the AI Credit API and the AI Auto bridge.
+    Raises RuntimeError when no model is active.
+    """
+    scored = score(payload)
+    prob = float(scored["prob_default"])
+    terms = recommend_terms(prob, payload.get("loan_amnt", 0))
+
+    app = CreditApplication.objects.create(
+        user=user,
+        input_data=payload,
+        prob_default=prob,
+        risk_tier=terms["risk_tier"],
+        decision=terms["decision"],
+        recommended_terms=terms,
+        model_version=scored["model_version"],
+    )
+    return CreditDecision(prob, scored["model_version"], terms, app.id)
+
+
+def payload_fingerprint(payload: Dict[str, Any], model_version: str) -> str:
+    """Stable hash of what the model sees (whitelisted features + model version)."""
+    features = {k: payload.get(k) for k in FEATURE_WHITELIST}
+    raw = json.dumps([model_version, features], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
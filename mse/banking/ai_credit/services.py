@@ -1,20 +1,28 @@
 from __future__ import annotations
 
 import os
-from typing import Tuple, Dict, Any
+import time
+from typing import Tuple, Dict, Any, Iterator
 
 import joblib
+import numpy as np
 import pandas as pd
 from django.conf import settings
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import roc_auc_score, average_precision_score
 
-from .ml import build_pipeline
+from .ml import CATEGORICAL, NUMERIC, build_pipeline
 from .models import CreditModelArtifact
+from .registry import registry
 
 ARTIFACT_DIR = os.path.join(settings.BASE_DIR, "banking", "ai_credit", "artifacts")
 os.makedirs(ARTIFACT_DIR, exist_ok=True)
 
+try:
+    import resource  # POSIX only
+except ImportError:  # pragma: no cover
+    resource = None
+
 # LendingClub target mapping (typical)
 GOOD_STATUSES = {"Fully Paid", "Current"}
 BAD_STATUSES = {"Charged Off", "Default", "Late (31-120 days)", "Late (16-30 days)"}
@@ -31,7 +39,39 @@ def _prepare_target(df: pd.DataFrame) -> pd.Series:
     # you can refine later.
     return s.apply(lambda x: 0 if x in GOOD_STATUSES else 1)
 
-def train_credit_model(csv_path: str, version: str = "v1") -> CreditModelArtifact:
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1)
+
+def _save_artifact(pipe, version: str, metrics: Dict[str, Any]) -> CreditModelArtifact:
+    path = os.path.join(ARTIFACT_DIR, f"credit_model_{version}.joblib")
+    joblib.dump(pipe, path)
+
+    # deactivate older actives
+    CreditModelArtifact.objects.filter(is_active=True).update(is_active=False)
+
+    artifact = CreditModelArtifact.objects.create(
+        version=version,
+        artifact_path=path,
+        metrics=metrics,
+        feature_schema={"features": FEATURE_WHITELIST},
+        is_active=True,
+    )
+    registry.invalidate()
+    return artifact
+
+def train_credit_model(
+    csv_path: str,
+    version: str = "v1",
+    chunked: bool = False,
+    chunksize: int = 100_000,
+) -> CreditModelArtifact:
+    if chunked:
+        return train_credit_model_chunked(csv_path, version=version, chunksize=chunksize)
+
+    t0 = time.perf_counter()
     df = pd.read_csv(csv_path, low_memory=False)
 
     missing = [c for c in (FEATURE_WHITELIST + ["loan_status"]) if c not in df.columns]
@@ -54,35 +94,112 @@ def train_credit_model(csv_path: str, version: str = "v1") -> CreditModelArtifac
         "avg_precision": float(average_precision_score(y_test, p)),
         "n_train": int(len(X_train)),
         "n_test": int(len(X_test)),
+        "mode": "in_memory",
+        "wall_seconds": round(time.perf_counter() - t0, 3),
+        "peak_rss_mb": _peak_rss_mb(),
     }
+    return _save_artifact(pipe, version, metrics)
+
+# ---- out-of-core training ----
+
+TRAIN_COLUMNS = FEATURE_WHITELIST + ["loan_status"]
+PREP_SAMPLE_ROWS = 50_000   # rows used to fit imputers/scaler
+HOLDOUT_EVERY = 4           # every 4th row -> test (25%, same as the in-memory split)
+
+def _read_chunks(csv_path: str, chunksize: int) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+    """
+    Only the training columns, categoricals as `category`, numerics as float32.
+    Numerics are coerced per chunk: some LendingClub dumps ship "13.56%" rates.
+    Yields (chunk, test_mask).
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    missing = [c for c in TRAIN_COLUMNS if c not in header]
+    if missing:
+        raise ValueError(f"Dataset missing required columns: {missing}")
 
-    path = os.path.join(ARTIFACT_DIR, f"credit_model_{version}.joblib")
-    joblib.dump(pipe, path)
-
-    # deactivate older actives
-    CreditModelArtifact.objects.filter(is_active=True).update(is_active=False)
-
-    artifact = CreditModelArtifact.objects.create(
-        version=version,
-        artifact_path=path,
-        metrics=metrics,
-        feature_schema={"features": FEATURE_WHITELIST},
-        is_active=True,
-    )
-    return artifact
+    dtypes = {c: "category" for c in CATEGORICAL + ["loan_status"]}
+    row0 = 0
+    for chunk in pd.read_csv(csv_path, usecols=TRAIN_COLUMNS, dtype=dtypes, chunksize=chunksize):
+        for c in NUMERIC:
+            col = chunk[c]
+            if col.dtype == object:
+                col = col.str.rstrip("%")
+            chunk[c] = pd.to_numeric(col, errors="coerce").astype(np.float32)
+        for c in CATEGORICAL:
+            # sklearn's imputer/encoder want plain object columns; the chunk is bounded so this is cheap
+            chunk[c] = chunk[c].astype(object)
+        test_mask = (np.arange(row0, row0 + len(chunk)) % HOLDOUT_EVERY) == 0
+        row0 += len(chunk)
+        yield chunk, test_mask
+
+def train_credit_model_chunked(csv_path: str, version: str = "v1", chunksize: int = 100_000) -> CreditModelArtifact:
+    """
+    Train without holding the dataset in memory:
+      1. stream once: collect category levels + a head sample to fit the preprocessing
+      2. stream again: partial_fit the SGD logistic model on the training rows
+      3. stream again: score the holdout rows
+    Peak memory is bounded by chunksize, not file size.
+    """
+    t0 = time.perf_counter()
+    pipe = build_pipeline(incremental=True)
+    prep, model = pipe.named_steps["prep"], pipe.named_steps["model"]
+
+    levels: Dict[str, set] = {c: set() for c in CATEGORICAL}
+    sample = []
+    sampled = 0
+    for chunk, test_mask in _read_chunks(csv_path, chunksize):
+        for c in CATEGORICAL:
+            levels[c].update(chunk[c].dropna().unique().tolist())
+        if sampled < PREP_SAMPLE_ROWS:
+            part = chunk.loc[~test_mask, FEATURE_WHITELIST].head(PREP_SAMPLE_ROWS - sampled)
+            sample.append(part)
+            sampled += len(part)
+    if not sampled:
+        raise ValueError("Dataset has no training rows")
+
+    pipe.set_params(prep__cat__onehot__categories=[sorted(levels[c]) for c in CATEGORICAL])
+    prep.fit(pd.concat(sample))
+    del sample
+
+    n_train = 0
+    for chunk, test_mask in _read_chunks(csv_path, chunksize):
+        train = chunk[~test_mask]
+        if len(train):
+            model.partial_fit(prep.transform(train[FEATURE_WHITELIST]), _prepare_target(train), classes=[0, 1])
+            n_train += len(train)
+
+    probs, labels = [], []
+    for chunk, test_mask in _read_chunks(csv_path, chunksize):
+        test = chunk[test_mask]
+        if len(test):
+            probs.append(pipe.predict_proba(test[FEATURE_WHITELIST])[:, 1].astype(np.float32))
+            labels.append(_prepare_target(test).to_numpy(dtype=np.int8))
+    y_test = np.concatenate(labels) if labels else np.array([], dtype=np.int8)
+    p = np.concatenate(probs) if probs else np.array([], dtype=np.float32)
+
+    both_classes = len(np.unique(y_test)) == 2
+    metrics = {
+        "roc_auc": float(roc_auc_score(y_test, p)) if both_classes else None,
+        "avg_precision": float(average_precision_score(y_test, p)) if both_classes else None,
+        "n_train": int(n_train),
+        "n_test": int(len(y_test)),
+        "mode": "chunked",
+        "chunksize": int(chunksize),
+        "wall_seconds": round(time.perf_counter() - t0, 3),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    return _save_artifact(pipe, version, metrics)
 
 def load_active_model() -> Tuple[Any, CreditModelArtifact]:
-    artifact = CreditModelArtifact.objects.filter(is_active=True).order_by("-created_at").first()
-    if not artifact:
-        raise RuntimeError("No active credit model. Train one first.")
-    pipe = joblib.load(artifact.artifact_path)
-    return pipe, artifact
+    # served from the in-process registry; disk is only hit when the active version changes
+    return registry.get()
 
 def score(payload: Dict[str, Any]) -> Dict[str, Any]:
-    import pandas as pd
     pipe, artifact = load_active_model()
+    t0 = time.perf_counter()
     # enforce whitelist order
     row = {k: payload.get(k) for k in FEATURE_WHITELIST}
     X = pd.DataFrame([row])
     prob = float(pipe.predict_proba(X)[0][1])
+    registry.record_latency((time.perf_counter() - t0) * 1000.0)
     return {"prob_default": prob, "model_version": artifact.version, "artifact": artifact}
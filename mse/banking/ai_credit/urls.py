@@ -4,5 +4,7 @@ from . import views
 urlpatterns = [
     path("", views.ai_credit_home, name="ai_credit"),
     path("api/score/", views.score_credit, name="ai_credit_score"),
+    path("api/score/batch/", views.score_credit_batch, name="ai_credit_score_batch"),
     path("api/retrain/", views.retrain_credit_model, name="ai_credit_retrain"),
+    path("api/metrics/", views.credit_model_metrics, name="ai_credit_metrics"),
 ]
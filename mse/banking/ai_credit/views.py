@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import io
 import json
+from itertools import islice
+
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.http import JsonResponse, HttpRequest
 from django.shortcuts import render
 from django.views.decorators.http import require_POST
 from banking.ai_auto.models import AutoBuyerSession
-from .policy import recommend_terms
-from .services import score, train_credit_model
+from .scoring import score_application
+from .services import train_credit_model
 from .models import CreditApplication
+from .batch import read_payloads, score_applications
+from .registry import registry
 from django.conf import settings
 
 def _ai_enabled(request: HttpRequest) -> bool:
@@ -62,26 +67,8 @@ def score_credit(request: HttpRequest):
     except Exception:
         return JsonResponse({"ok": False, "error": "Invalid JSON"}, status=400)
 
-    scored = score(payload)
-    prob = float(scored["prob_default"])
-    terms = recommend_terms(prob, payload.get("loan_amnt", 0))
-
-    CreditApplication.objects.create(
-        user=request.user,
-        input_data=payload,
-        prob_default=prob,
-        risk_tier=terms["risk_tier"],
-        decision=terms["decision"],
-        recommended_terms=terms,
-        model_version=scored["model_version"],
-    )
-
-    return JsonResponse({
-        "ok": True,
-        "prob_default": round(prob, 3),
-        "model_version": scored["model_version"],
-        **terms,
-    })
+    decision = score_application(request.user, payload)
+    return JsonResponse(decision.as_snapshot())
 
 
 def _is_staff(user) -> bool:
@@ -93,7 +80,8 @@ def _is_staff(user) -> bool:
 def retrain_credit_model(request: HttpRequest):
     """
     Governance: retrain model (staff-only)
-    Body: {"csv_path": "...", "version": "v2"}
+    Body: {"csv_path": "...", "version": "v2", "chunked": false}
+    chunked=true trains out-of-core (bounded memory) for full-size datasets.
     """
     try:
         payload = json.loads(request.body.decode("utf-8"))
@@ -105,5 +93,48 @@ def retrain_credit_model(request: HttpRequest):
     if not csv_path:
         return JsonResponse({"ok": False, "error": "csv_path required"}, status=400)
 
-    artifact = train_credit_model(csv_path=csv_path, version=version)
+    artifact = train_credit_model(csv_path=csv_path, version=version, chunked=bool(payload.get("chunked")))
     return JsonResponse({"ok": True, "version": artifact.version, "metrics": artifact.metrics})
+
+
+@user_passes_test(_is_staff)
+def credit_model_metrics(request: HttpRequest):
+    """Governance: registry load/scoring latency (staff-only)."""
+    return JsonResponse({"ok": True, **registry.metrics()})
+
+
+MAX_BATCH_ROWS = 10000
+
+
+@require_POST
+@user_passes_test(_is_staff)
+def score_credit_batch(request: HttpRequest):
+    """
+    Governance: score many applicants in one call (staff-only).
+    Body: {"applicants": [{...}, ...]}, JSON lines (application/x-ndjson) or CSV (text/csv).
+    Add ?save=0 to score without writing CreditApplication rows.
+    """
+    if not _ai_enabled(request):
+        return JsonResponse({"ok": False, "error": "AI disabled"}, status=404)
+
+    ctype = (request.content_type or "").lower()
+    try:
+        if ctype == "text/csv" or ctype == "application/x-ndjson":
+            text = io.StringIO(request.body.decode("utf-8-sig"))
+            payloads = list(islice(read_payloads(text, "csv" if ctype == "text/csv" else "jsonl"), MAX_BATCH_ROWS + 1))
+        else:
+            payloads = json.loads(request.body.decode("utf-8")).get("applicants") or []
+            if not isinstance(payloads, list) or not all(isinstance(p, dict) for p in payloads):
+                raise ValueError("applicants must be a list of objects")
+    except (ValueError, AttributeError, UnicodeDecodeError) as exc:
+        return JsonResponse({"ok": False, "error": f"Invalid payload: {exc}"}, status=400)
+
+    if len(payloads) > MAX_BATCH_ROWS:
+        return JsonResponse({"ok": False, "error": f"At most {MAX_BATCH_ROWS} applicants per call"}, status=400)
+
+    out = score_applications(
+        ((request.user.id, p) for p in payloads),
+        save=request.GET.get("save", "1") != "0",
+        collect=True,
+    )
+    return JsonResponse({"ok": True, **out})
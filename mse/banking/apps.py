@@ -1,4 +1,15 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+
+
+def _warm_credit_model():
+    import time
+
+    from .ai_credit.registry import registry
+
+    # wait for the rest of the app registry before touching the DB
+    while not apps.ready:
+        time.sleep(0.05)
+    registry.warm()
 
 
 class BankingConfig(AppConfig):
@@ -7,3 +18,11 @@ class BankingConfig(AppConfig):
 
     def ready(self):
         from . import signals
+
+        from django.conf import settings
+
+        if getattr(settings, "BANKING_AI_ENABLED", False) and getattr(settings, "CREDIT_MODEL_PRELOAD", False):
+            import threading
+
+            # off the startup path: ready() must not block on the DB or disk
+            threading.Thread(target=_warm_credit_model, name="credit-model-warm", daemon=True).start()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from banking.models import BankAccount
+from banking.services.snapshots import rebuild_account_snapshots
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-account daily balance snapshots from posted transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--account", help="Only rebuild this account (public_id).")
+
+    def handle(self, *args, **options):
+        accounts = BankAccount.objects.order_by("id")
+        if options.get("account"):
+            accounts = accounts.filter(public_id=options["account"])
+
+        account_count = 0
+        row_count = 0
+        for account in accounts.iterator():
+            with transaction.atomic():
+                # hold the row so live postings can't interleave with the rebuild
+                account = BankAccount.objects.select_for_update().get(id=account.id)
+                row_count += rebuild_account_snapshots(account)
+            account_count += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshots rebuilt. Accounts: {account_count}, daily rows: {row_count}"
+        ))
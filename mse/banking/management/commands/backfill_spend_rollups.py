@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from banking.services.rollups import rebuild_user_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-user monthly merchant spend rollups from posted transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only rebuild this username.")
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.filter(bank_accounts__isnull=False).distinct().order_by("id")
+        if options.get("user"):
+            users = users.filter(username=options["user"])
+
+        user_count = 0
+        row_count = 0
+        for user in users.iterator():
+            with transaction.atomic():
+                row_count += rebuild_user_rollups(user)
+            user_count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rollups rebuilt. Users: {user_count}, rows: {row_count}"))
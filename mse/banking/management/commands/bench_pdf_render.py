@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from banking.services.documents import run_benchmark
+
+
+class Command(BaseCommand):
+    help = "Benchmark the shared PDF renderer on a synthetic multi-page statement (pages per second)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **opts):
+        r = run_benchmark(opts["pages"], opts["repeat"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{r['pages']} pages ({r['rows']} rows, {r['bytes']} bytes) in {r['seconds']}s: "
+            f"{r['pages_per_second']} pages/s"
+        ))
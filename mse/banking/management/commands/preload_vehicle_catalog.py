@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from banking.ai_auto import inventory
+
+
+def _years(spec: str):
+    if not spec:
+        return [None]
+    if "-" in spec:
+        lo, hi = (int(x) for x in spec.split("-", 1))
+        return list(range(lo, hi + 1))
+    return [int(x) for x in spec.split(",")]
+
+
+class Command(BaseCommand):
+    help = "Fetch the vehicle catalog (makes, models, optionally trims) into the local cache and VehicleCatalog index."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--make", action="append", default=[], help="Preload models for this make (repeatable).")
+        parser.add_argument("--all-makes", action="store_true", help="Preload models for every NHTSA make.")
+        parser.add_argument("--years", default="", help="Model years, e.g. 2018-2025 or 2022,2024 (default: any).")
+        parser.add_argument("--trims", action="store_true", help="Also preload CarQuery trims per make/model/year.")
+        parser.add_argument("--workers", type=int, default=8)
+
+    def _run(self, jobs, workers):
+        def run(job):
+            close_old_connections()
+            try:
+                return inventory.refresh(*job)
+            finally:
+                close_old_connections()
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            return list(pool.map(run, jobs))
+
+    def handle(self, *args, **opts):
+        try:
+            years = _years(opts["years"])
+        except ValueError:
+            raise CommandError("--years must look like 2018-2025 or 2022,2024")
+
+        t0 = time.perf_counter()
+        makes = inventory.refresh(inventory.catalog_key("makes"), "makes", inventory.fetch_nhtsa_makes)
+        if makes is None:
+            raise CommandError("NHTSA makes lookup failed; nothing preloaded.")
+
+        targets = makes if opts["all_makes"] else opts["make"]
+        model_jobs = [
+            (inventory.catalog_key("models", make, y), "models", (lambda m=make, yr=y: inventory.fetch_and_index_models(m, yr)))
+            for make in targets
+            for y in years
+        ]
+        model_results = self._run(model_jobs, opts["workers"])
+
+        trim_jobs = []
+        if opts["trims"]:
+            for (make, y), models in zip(((m, y) for m in targets for y in years), model_results):
+                for model in models or []:
+                    trim_jobs.append((
+                        inventory.catalog_key("trims", make, model, y),
+                        "trims",
+                        (lambda a=make, b=model, yr=y: inventory.fetch_and_index_trims(a, b, yr)),
+                    ))
+        trim_results = self._run(trim_jobs, opts["workers"])
+
+        failed = sum(r is None for r in model_results + trim_results)
+        self.stdout.write(self.style.SUCCESS(
+            f"Catalog preloaded — makes: {len(makes)}, model lists: {len(model_jobs)}, "
+            f"trim lists: {len(trim_jobs)}, failed: {failed} ({time.perf_counter() - t0:.1f}s)"
+        ))
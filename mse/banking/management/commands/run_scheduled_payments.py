@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from banking.services.scheduler import BATCH_SIZE, run_scheduled_payments
+
+
+class Command(BaseCommand):
+    help = "Execute scheduled bill payments that are due (safe to re-run for the same date)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Run date, YYYY-MM-DD (default: today).")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Payments per transaction.")
+
+    def handle(self, *args, **opts):
+        run_date = None
+        if opts.get("date"):
+            try:
+                run_date = date.fromisoformat(opts["date"])
+            except ValueError:
+                raise CommandError("--date must be YYYY-MM-DD")
+
+        stats = run_scheduled_payments(run_date, batch_size=max(1, opts["batch_size"]))
+        self.stdout.write(self.style.SUCCESS(
+            f"Scheduled payments {stats['run_date']} — paid: {stats['paid']}, failed: {stats['failed']}, "
+            f"batches: {stats['batches']} ({stats['seconds']:.1f}s, {stats['per_second']}/s)"
+        ))
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from banking.models import BankAccount
+from banking.services.statement_runs import month_bounds, run_statements
+
+
+class Command(BaseCommand):
+    help = "Render month-end statements for all active accounts (skips unchanged ones)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--month", required=True, help="Statement month, YYYY-MM.")
+        parser.add_argument("--account", help="Only this account (public_id).")
+        parser.add_argument("--workers", type=int, default=4, help="Process pool size (1 = inline).")
+        parser.add_argument("--celery", action="store_true", default=False, help="Queue on Celery instead.")
+        parser.add_argument("--force", action="store_true", default=False, help="Re-render even if unchanged.")
+
+    def handle(self, *args, **opts):
+        month = opts["month"]
+        try:
+            month_bounds(month)
+        except ValueError:
+            raise CommandError("--month must be YYYY-MM")
+
+        ids = None
+        if opts.get("account"):
+            ids = list(BankAccount.objects.filter(public_id=opts["account"]).values_list("id", flat=True))
+
+        t0 = time.perf_counter()
+        counts = run_statements(
+            month,
+            account_ids=ids,
+            workers=opts["workers"],
+            use_celery=opts["celery"],
+            force=opts["force"],
+        )
+        elapsed = time.perf_counter() - t0
+
+        summary = ", ".join(f"{k}: {v}" for k, v in sorted(counts.items())) or "nothing to do"
+        self.stdout.write(self.style.SUCCESS(f"Statements {month} — {summary} ({elapsed:.1f}s)"))
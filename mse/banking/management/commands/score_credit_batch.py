@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from banking.ai_credit.batch import CHUNK_SIZE, existing_applications, read_payloads, score_applications
+
+
+class Command(BaseCommand):
+    help = "Score applicant payloads (JSON lines / CSV) or re-score stored applications with the active model"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", help="Applicants file (.jsonl or .csv)")
+        parser.add_argument("--format", choices=["jsonl", "csv"], help="Defaults to the file extension")
+        parser.add_argument("--user", help="Username that owns the new CreditApplication rows (with --file)")
+        parser.add_argument("--rescore", action="store_true", help="Re-score stored CreditApplication inputs")
+        parser.add_argument("--from-version", help="With --rescore: only applications scored by this model version")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Score without writing rows")
+
+    def handle(self, *args, **opts):
+        if bool(opts.get("file")) == bool(opts["rescore"]):
+            raise CommandError("Pass exactly one of --file or --rescore")
+
+        save = not opts["dry_run"]
+        if opts["rescore"]:
+            out = score_applications(existing_applications(opts.get("from_version")), opts["chunk_size"], save=save)
+        else:
+            if not opts.get("user"):
+                raise CommandError("--user is required with --file")
+            user = get_user_model().objects.filter(username=opts["user"]).first()
+            if user is None:
+                raise CommandError(f"Unknown user {opts['user']}")
+
+            fmt = opts.get("format") or ("csv" if opts["file"].lower().endswith(".csv") else "jsonl")
+            with open(opts["file"], newline="", encoding="utf-8-sig") as fh:
+                try:
+                    out = score_applications(((user.id, p) for p in read_payloads(fh, fmt)), opts["chunk_size"], save=save)
+                except ValueError as exc:
+                    raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {out['scored']} with {out['model_version']} decisions={out['decisions']} "
+            f"({out['seconds']:.1f}s, {out['per_second']}/s)"
+        ))
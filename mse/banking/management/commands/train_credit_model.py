@@ -7,7 +7,14 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("--csv", required=True)
         parser.add_argument("--version", default="v1")
+        parser.add_argument("--chunked", action="store_true", help="Out-of-core training (SGD logistic, bounded memory)")
+        parser.add_argument("--chunksize", type=int, default=100_000)
 
     def handle(self, *args, **opts):
-        artifact = train_credit_model(csv_path=opts["csv"], version=opts["version"])
+        artifact = train_credit_model(
+            csv_path=opts["csv"],
+            version=opts["version"],
+            chunked=opts["chunked"],
+            chunksize=opts["chunksize"],
+        )
         self.stdout.write(self.style.SUCCESS(f"Trained {artifact.version} metrics={artifact.metrics}"))
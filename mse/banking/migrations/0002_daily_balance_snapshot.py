@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:29
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyBalanceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('opening_balance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('closing_balance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('inflow', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('outflow', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('txn_count', models.PositiveIntegerField(default=0)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_snapshots', to='banking.bankaccount')),
+            ],
+            options={
+                'ordering': ['-day'],
+                'unique_together': {('account', 'day')},
+            },
+        ),
+    ]
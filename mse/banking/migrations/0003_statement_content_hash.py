@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0002_daily_balance_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='statement',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
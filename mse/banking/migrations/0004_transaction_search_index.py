@@ -0,0 +1,117 @@
+import warnings
+
+from django.db import DatabaseError, migrations, transaction
+
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS banking_transaction_fts USING fts5(
+        memo, merchant,
+        content='banking_transaction', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS banking_transaction_fts_ai AFTER INSERT ON banking_transaction BEGIN
+        INSERT INTO banking_transaction_fts(rowid, memo, merchant) VALUES (new.id, new.memo, new.merchant);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS banking_transaction_fts_ad AFTER DELETE ON banking_transaction BEGIN
+        INSERT INTO banking_transaction_fts(banking_transaction_fts, rowid, memo, merchant)
+        VALUES ('delete', old.id, old.memo, old.merchant);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS banking_transaction_fts_au AFTER UPDATE OF memo, merchant ON banking_transaction BEGIN
+        INSERT INTO banking_transaction_fts(banking_transaction_fts, rowid, memo, merchant)
+        VALUES ('delete', old.id, old.memo, old.merchant);
+        INSERT INTO banking_transaction_fts(rowid, memo, merchant) VALUES (new.id, new.memo, new.merchant);
+    END
+    """,
+    "INSERT INTO banking_transaction_fts(banking_transaction_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS banking_transaction_fts_au",
+    "DROP TRIGGER IF EXISTS banking_transaction_fts_ad",
+    "DROP TRIGGER IF EXISTS banking_transaction_fts_ai",
+    "DROP TABLE IF EXISTS banking_transaction_fts",
+]
+
+# CREATE EXTENSION needs superuser (or a trusted-extension grant) on most
+# managed Postgres. When the role can't create pg_trgm, the GIN indexes are
+# skipped with a warning and search still works as a plain ILIKE scan; have
+# an admin run "CREATE EXTENSION pg_trgm" and re-run this migration
+# (migrate banking 0003, then migrate) to get them.
+POSTGRES_EXTENSION = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+
+# Plain-column trigram indexes: they serve "memo ILIKE '%q%'" (what
+# search_filter issues on Postgres), not Django's icontains, which compiles to
+# UPPER(memo::text) LIKE UPPER(...) and would scan the table.
+POSTGRES_FORWARD = [
+    "CREATE INDEX IF NOT EXISTS banking_txn_memo_trgm ON banking_transaction USING gin (memo gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS banking_txn_merchant_trgm ON banking_transaction USING gin (merchant gin_trgm_ops)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS banking_txn_merchant_trgm",
+    "DROP INDEX IF EXISTS banking_txn_memo_trgm",
+]
+
+
+def _sqlite_has_fts5_trigram(cursor) -> bool:
+    cursor.execute("SELECT sqlite_version()")
+    version = tuple(int(x) for x in cursor.fetchone()[0].split("."))
+    if version < (3, 34, 0):  # trigram tokenizer
+        return False
+    cursor.execute("PRAGMA compile_options")
+    return any("ENABLE_FTS5" in row[0] for row in cursor.fetchall())
+
+
+def _postgres_has_trgm(cursor, conn) -> bool:
+    cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    if cursor.fetchone():
+        return True
+    try:
+        with transaction.atomic(using=conn.alias):  # savepoint: a refusal must not abort the migration
+            cursor.execute(POSTGRES_EXTENSION)
+        return True
+    except DatabaseError as exc:
+        warnings.warn(f"pg_trgm unavailable ({exc}); transaction search will not be indexed.")
+        return False
+
+
+def forwards(apps, schema_editor):
+    conn = schema_editor.connection
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            if not _sqlite_has_fts5_trigram(cursor):
+                return  # search falls back to icontains
+            statements = SQLITE_FORWARD
+        elif conn.vendor == "postgresql":
+            if not _postgres_has_trgm(cursor, conn):
+                return
+            statements = POSTGRES_FORWARD
+        else:
+            return
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def backwards(apps, schema_editor):
+    conn = schema_editor.connection
+    statements = {"sqlite": SQLITE_REVERSE, "postgresql": POSTGRES_REVERSE}.get(conn.vendor, [])
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("banking", "0003_statement_content_hash"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
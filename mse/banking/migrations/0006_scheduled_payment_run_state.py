@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0005_merchant_spend_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledpayment',
+            name='last_run',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='scheduledpayment',
+            name='last_status',
+            field=models.CharField(blank=True, default='', max_length=140),
+        ),
+        migrations.AddIndex(
+            model_name='scheduledpayment',
+            index=models.Index(fields=['active', 'next_run'], name='banking_sch_active_bd4751_idx'),
+        ),
+    ]
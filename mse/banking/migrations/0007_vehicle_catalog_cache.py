@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:43
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0006_scheduled_payment_run_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('kind', models.CharField(max_length=16)),
+                ('payload', models.JSONField(blank=True, default=list)),
+                ('fetched_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0007_vehicle_catalog_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VehicleCatalog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('make', models.CharField(max_length=64)),
+                ('model', models.CharField(max_length=64)),
+                ('year', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('trim', models.CharField(blank=True, default='', max_length=64)),
+                ('body', models.CharField(blank=True, default='', max_length=64)),
+                ('body_style', models.CharField(blank=True, default='', max_length=16)),
+                ('make_key', models.CharField(max_length=64)),
+                ('model_key', models.CharField(max_length=64)),
+                ('tier', models.CharField(default='Core', max_length=16)),
+                ('price_low', models.PositiveIntegerField(default=0)),
+                ('price_high', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['make_key', 'model_key', 'year'], name='banking_veh_make_ke_8b38ab_idx'), models.Index(fields=['model_key'], name='banking_veh_model_k_ed5f1c_idx'), models.Index(fields=['body_style', 'price_low'], name='banking_veh_body_st_281605_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,80 @@
+from importlib import import_module
+
+from django.db import migrations
+
+# Rebuild the SQLite FTS5 index from 0004 with account_id as an UNINDEXED
+# column, so a search filters to the account inside the FTS query instead of
+# pulling every user's matching rowids into the IN list.
+
+FTS_COLUMNS = "memo, merchant, account_id"
+
+SQLITE_FORWARD = [
+    "DROP TRIGGER IF EXISTS banking_transaction_fts_au",
+    "DROP TRIGGER IF EXISTS banking_transaction_fts_ad",
+    "DROP TRIGGER IF EXISTS banking_transaction_fts_ai",
+    "DROP TABLE IF EXISTS banking_transaction_fts",
+    """
+    CREATE VIRTUAL TABLE banking_transaction_fts USING fts5(
+        memo, merchant, account_id UNINDEXED,
+        content='banking_transaction', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER banking_transaction_fts_ai AFTER INSERT ON banking_transaction BEGIN
+        INSERT INTO banking_transaction_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, new.memo, new.merchant, new.account_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER banking_transaction_fts_ad AFTER DELETE ON banking_transaction BEGIN
+        INSERT INTO banking_transaction_fts(banking_transaction_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.memo, old.merchant, old.account_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER banking_transaction_fts_au AFTER UPDATE OF memo, merchant, account_id ON banking_transaction BEGIN
+        INSERT INTO banking_transaction_fts(banking_transaction_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.memo, old.merchant, old.account_id);
+        INSERT INTO banking_transaction_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, new.memo, new.merchant, new.account_id);
+    END
+    """,
+    "INSERT INTO banking_transaction_fts(banking_transaction_fts) VALUES ('rebuild')",
+]
+
+
+def _has_fts_table(cursor) -> bool:
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'banking_transaction_fts'")
+    return cursor.fetchone() is not None
+
+
+def forwards(apps, schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor != "sqlite":
+        return
+    with conn.cursor() as cursor:
+        if not _has_fts_table(cursor):
+            return  # 0004 found no FTS5 trigram support; search uses icontains
+        for sql in SQLITE_FORWARD:
+            cursor.execute(sql)
+
+
+def backwards(apps, schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor != "sqlite":
+        return
+    previous = import_module("banking.migrations.0004_transaction_search_index")
+    with conn.cursor() as cursor:
+        if not _has_fts_table(cursor):
+            return
+        for sql in previous.SQLITE_REVERSE + previous.SQLITE_FORWARD:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("banking", "0008_vehicle_catalog"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
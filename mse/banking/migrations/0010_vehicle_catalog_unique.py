@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:24
+
+from django.db import migrations, models
+
+
+def dedupe_catalog(apps, schema_editor):
+    """Unknown body styles become NULL; keep one row per key and drop model rows superseded by trims."""
+    VehicleCatalog = apps.get_model("banking", "VehicleCatalog")
+    VehicleCatalog.objects.filter(body_style="").update(body_style=None)
+
+    seen, trimmed, duplicates = set(), set(), []
+    rows = VehicleCatalog.objects.order_by("id").values_list("id", "make_key", "model_key", "year", "trim")
+    for pk, make_key, model_key, year, trim in rows.iterator():
+        key = (make_key, model_key, year, trim)
+        if key in seen:
+            duplicates.append(pk)
+        seen.add(key)
+        if trim:
+            trimmed.add(key[:3])
+    duplicates += [pk for pk, *key, trim in rows if not trim and tuple(key) in trimmed]
+    for i in range(0, len(duplicates), 500):
+        VehicleCatalog.objects.filter(id__in=duplicates[i:i + 500]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0009_transaction_fts_account'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vehiclecatalog',
+            name='body_style',
+            field=models.CharField(blank=True, max_length=16, null=True),
+        ),
+        migrations.RunPython(dedupe_catalog, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='vehiclecatalog',
+            constraint=models.UniqueConstraint(fields=('make_key', 'model_key', 'year', 'trim'), name='vehicle_catalog_unique_trim'),
+        ),
+        migrations.AddConstraint(
+            model_name='vehiclecatalog',
+            constraint=models.UniqueConstraint(condition=models.Q(('year__isnull', True)), fields=('make_key', 'model_key', 'trim'), name='vehicle_catalog_unique_undated_trim'),
+        ),
+    ]
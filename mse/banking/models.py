@@ -151,6 +151,15 @@ class ScheduledPayment(models.Model):
     next_run = models.DateField()
     active = models.BooleanField(default=True)
 
+    # Set by the scheduler (banking.services.scheduler); one attempt per run date.
+    last_run = models.DateField(null=True, blank=True)
+    last_status = models.CharField(max_length=140, blank=True, default="")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["active", "next_run"]),
+        ]
+
     def __str__(self):
         return f"{self.payee} ({self.frequency})"
     
@@ -178,6 +187,8 @@ class Statement(models.Model):
 
     generated_at = models.DateTimeField(default=timezone.now)
     pdf_file = models.FileField(upload_to="statements/", blank=True, null=True)
+    # sha256 of what went into pdf_file; unchanged hash = cached PDF is still valid
+    content_hash = models.CharField(max_length=64, blank=True, default="")
 
     class Meta:
         unique_together = [("account", "period_start", "period_end")]
@@ -185,3 +196,50 @@ class Statement(models.Model):
 
     def __str__(self):
         return f"Statement {self.period_start} → {self.period_end} ({self.account.public_id})"
+
+
+class DailyBalanceSnapshot(models.Model):
+    """
+    One row per account per day, maintained by the posting path
+    (banking.services.snapshots) and rebuilt by `backfill_balance_snapshots`.
+    """
+    account = models.ForeignKey(
+        BankAccount,
+        on_delete=models.CASCADE,
+        related_name="daily_snapshots",
+    )
+    day = models.DateField()
+
+    opening_balance = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    closing_balance = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    inflow = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    outflow = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    txn_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = [("account", "day")]
+        ordering = ["-day"]
+
+    def __str__(self):
+        return f"{self.account.public_id} {self.day}: {self.opening_balance} → {self.closing_balance}"
+
+
+class MerchantSpendRollup(models.Model):
+    """
+    Spend per user / month / merchant, maintained by the posting path
+    (banking.services.rollups) and rebuilt by `backfill_spend_rollups`.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="merchant_spend")
+    month = models.DateField()  # first day of the month
+    merchant = models.CharField(max_length=80, blank=True, default="")
+    category = models.CharField(max_length=40, blank=True, default="")
+
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    txn_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = [("user", "month", "merchant")]
+        ordering = ["-month", "-total"]
+
+    def __str__(self):
+        return f"{self.merchant or 'Uncategorized'} {self.month:%Y-%m}: {self.total} ({self.user})"
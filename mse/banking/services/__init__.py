@@ -2,3 +2,4 @@ from .deposit import deposit
 from .withdraw import withdraw
 from .bill_pay import pay_bill
 from .transfer_between_accounts import transfer_between_accounts
+from .ledger import Posting, ServiceResult, post_batch
@@ -2,6 +2,8 @@ from django.db import transaction
 from banking.models import BankAccount, Transaction, Payee, TxnType, TxnStatus
 from decimal import Decimal
 
+from .projections import apply_posted
+
 
 @transaction.atomic
 def pay_bill(account_id: int, payee_id: int, amount: Decimal):
@@ -18,7 +20,7 @@ def pay_bill(account_id: int, payee_id: int, amount: Decimal):
     account.available_balance -= amount
     account.save()
 
-    Transaction.objects.create(
+    txn = Transaction.objects.create(
         account=account,
         payee=payee,
         txn_type=TxnType.BILLPAY,
@@ -27,4 +29,6 @@ def pay_bill(account_id: int, payee_id: int, amount: Decimal):
         memo=f"Bill payment to {payee.name}",
     )
 
+    apply_posted([txn])
+
     return account
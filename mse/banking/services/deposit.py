@@ -2,6 +2,8 @@ from django.db import transaction
 from banking.models import BankAccount, Transaction, TxnType, TxnStatus
 from decimal import Decimal
 
+from .projections import apply_posted
+
 
 @transaction.atomic
 def deposit(account_id: int, amount: Decimal, memo="Deposit"):
@@ -14,7 +16,7 @@ def deposit(account_id: int, amount: Decimal, memo="Deposit"):
     account.available_balance += amount
     account.save()
 
-    Transaction.objects.create(
+    txn = Transaction.objects.create(
         account=account,
         txn_type=TxnType.DEPOSIT,
         status=TxnStatus.POSTED,
@@ -22,4 +24,6 @@ def deposit(account_id: int, amount: Decimal, memo="Deposit"):
         memo=memo,
     )
 
+    apply_posted([txn])
+
     return account
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from banking.models import BankAccount, Payee, Transaction, TxnStatus, TxnType
+
+from .projections import apply_posted
+
+BULK_BATCH_SIZE = 500
+
+POSTING_KINDS = {TxnType.DEPOSIT, TxnType.WITHDRAWAL, TxnType.TRANSFER_OUT, TxnType.BILLPAY}
+
+
+@dataclass(frozen=True)
+class ServiceResult:
+    ok: bool
+    message: str
+
+
+@dataclass(frozen=True)
+class Posting:
+    """
+    One money movement inside a batch.
+
+    kind is a TxnType value:
+      - DEPOSIT / WITHDRAWAL: account + amount
+      - TRANSFER_OUT: account -> to_account (writes both legs)
+      - BILLPAY: account -> payee
+    """
+    kind: str
+    account: BankAccount
+    amount: Decimal
+    memo: str = ""
+    to_account: Optional[BankAccount] = None
+    payee: Optional[Payee] = None
+
+
+def _money(x) -> Decimal:
+    return Decimal(x).quantize(Decimal("0.01"))
+
+
+# Defaults and validation text of deposit / withdraw / transfer_between_accounts / pay_bill.
+AMOUNT_ERRORS = {
+    TxnType.DEPOSIT: "Deposit amount must be greater than zero",
+    TxnType.WITHDRAWAL: "Withdrawal amount must be greater than zero",
+    TxnType.TRANSFER_OUT: "Transfer amount must be greater than zero",
+    TxnType.BILLPAY: "Payment amount must be greater than zero",
+}
+INSUFFICIENT_FUNDS = "Insufficient funds"
+
+
+def _precheck(p: Posting) -> Optional[ServiceResult]:
+    """Rules that don't need balances (same messages as the single-call functions)."""
+    if p.kind not in POSTING_KINDS:
+        return ServiceResult(False, f"Unsupported posting type: {p.kind}.")
+
+    if _money(p.amount) <= 0:
+        return ServiceResult(False, AMOUNT_ERRORS[p.kind])
+
+    if p.kind == TxnType.TRANSFER_OUT:
+        if p.to_account is not None and p.to_account.id == p.account.id:
+            return ServiceResult(False, "Cannot transfer to the same account")
+        if p.to_account is None or p.to_account.user_id != p.account.user_id:
+            return ServiceResult(False, "Transfers are only allowed between your accounts (demo).")
+
+    if p.kind == TxnType.BILLPAY:
+        if p.payee is None or p.payee.user_id != p.account.user_id:
+            return ServiceResult(False, "Invalid payee.")
+
+    return None
+
+
+@transaction.atomic
+def post_batch(postings: Iterable[Posting]) -> List[ServiceResult]:
+    """
+    Post many money movements in one database transaction.
+
+    - every affected BankAccount is locked once, in primary-key order
+      (concurrent batches can't deadlock on each other)
+    - postings are applied in the order given, so an overdraft check sees
+      the credits/debits of earlier postings exactly like repeated calls to
+      deposit / withdraw / transfer_between_accounts / pay_bill would
+    - balances move with one UPDATE per account, rows go in via bulk_create
+
+    Returns one ServiceResult per posting, in input order. Failed postings
+    don't touch balances and write no Transaction rows.
+    """
+    postings = list(postings)
+    results: List[Optional[ServiceResult]] = [_precheck(p) for p in postings]
+
+    account_ids = set()
+    for p, res in zip(postings, results):
+        if res is None:
+            account_ids.add(p.account.id)
+            if p.to_account is not None:
+                account_ids.add(p.to_account.id)
+
+    locked: Dict[int, BankAccount] = {
+        a.id: a
+        for a in BankAccount.objects.select_for_update().filter(id__in=account_ids).order_by("id")
+    }
+    available = {aid: a.available_balance for aid, a in locked.items()}
+    deltas: Dict[int, Decimal] = defaultdict(Decimal)
+
+    now = timezone.now()
+    rows: List[Transaction] = []
+
+    for i, p in enumerate(postings):
+        if results[i] is not None:
+            continue
+
+        src = locked.get(p.account.id)
+        dst = locked.get(p.to_account.id) if p.to_account is not None else None
+        if src is None or (p.kind == TxnType.TRANSFER_OUT and dst is None):
+            results[i] = ServiceResult(False, "Account not found.")
+            continue
+
+        amount = _money(p.amount)
+
+        if p.kind == TxnType.DEPOSIT:
+            available[src.id] += amount
+            deltas[src.id] += amount
+            rows.append(Transaction(
+                account=src,
+                txn_type=TxnType.DEPOSIT,
+                status=TxnStatus.POSTED,
+                amount=amount,
+                memo=p.memo or "Deposit",
+                created_at=now,
+            ))
+            results[i] = ServiceResult(True, "Deposit posted.")
+            continue
+
+        if available[src.id] < amount:
+            results[i] = ServiceResult(False, INSUFFICIENT_FUNDS)
+            continue
+
+        available[src.id] -= amount
+        deltas[src.id] -= amount
+
+        if p.kind == TxnType.WITHDRAWAL:
+            rows.append(Transaction(
+                account=src,
+                txn_type=TxnType.WITHDRAWAL,
+                status=TxnStatus.POSTED,
+                amount=amount,
+                memo=p.memo or "Withdrawal",
+                created_at=now,
+            ))
+            results[i] = ServiceResult(True, "Withdrawal posted.")
+
+        elif p.kind == TxnType.TRANSFER_OUT:
+            available[dst.id] += amount
+            deltas[dst.id] += amount
+            rows.append(Transaction(
+                account=src,
+                txn_type=TxnType.TRANSFER_OUT,
+                status=TxnStatus.POSTED,
+                amount=amount,
+                related_account=dst,
+                memo=p.memo or f"Transfer to {dst.public_id}",
+                created_at=now,
+            ))
+            rows.append(Transaction(
+                account=dst,
+                txn_type=TxnType.TRANSFER_IN,
+                status=TxnStatus.POSTED,
+                amount=amount,
+                related_account=src,
+                memo=p.memo or f"Transfer from {src.public_id}",
+                created_at=now,
+            ))
+            results[i] = ServiceResult(True, "Transfer completed.")
+
+        else:  # BILLPAY
+            rows.append(Transaction(
+                account=src,
+                txn_type=TxnType.BILLPAY,
+                status=TxnStatus.POSTED,
+                amount=amount,
+                payee=p.payee,
+                memo=p.memo or f"Bill payment to {p.payee.name}",
+                created_at=now,
+            ))
+            results[i] = ServiceResult(True, "Bill payment sent.")
+
+    if rows:
+        Transaction.objects.bulk_create(rows, batch_size=BULK_BATCH_SIZE)
+
+    for aid, delta in deltas.items():
+        if not delta:
+            continue
+        BankAccount.objects.filter(id=aid).update(
+            balance=F("balance") + delta,
+            available_balance=F("available_balance") + delta,
+        )
+        acct = locked[aid]
+        acct.balance = _money(acct.balance + delta)
+        acct.available_balance = _money(acct.available_balance + delta)
+
+    apply_posted(rows)
+
+    # Keep caller-held instances current, like refresh_from_db(lock=True) does.
+    for p in postings:
+        for acct in (p.account, p.to_account):
+            if acct is not None and acct.id in deltas:
+                acct.balance = locked[acct.id].balance
+                acct.available_balance = locked[acct.id].available_balance
+
+    return results
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from banking.models import Transaction
+
+from .rollups import record_spend
+from .snapshots import record_transactions
+
+
+def apply_posted(txns: Iterable[Transaction]) -> None:
+    """
+    Update every read model fed by the posting path. Call inside the posting
+    transaction, after balances are saved.
+    """
+    txns = list(txns)
+    record_transactions(txns)
+    record_spend(txns)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from banking.models import MerchantSpendRollup, Transaction, TxnStatus, TxnType
+
+# Money leaving the customer. Deposits and transfers between own accounts are not spend.
+SPEND_TYPES = [TxnType.CARD, TxnType.BILLPAY, TxnType.WITHDRAWAL]
+
+ZERO = Decimal("0.00")
+
+
+def month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def spend_key(txn: Transaction) -> Tuple[str, str]:
+    """(merchant, category) a spend transaction is filed under."""
+    payee = txn.payee if txn.payee_id else None
+    merchant = txn.merchant or (payee.name if payee else "")
+    if payee and payee.category:
+        category = payee.category
+    elif txn.txn_type == TxnType.WITHDRAWAL:
+        category = "Cash"
+    else:
+        category = TxnType(txn.txn_type).label
+    return merchant[:80], category[:40]
+
+
+def _bump(user_id: int, month: date, merchant: str, category: str, total: Decimal, count: int) -> None:
+    rows = MerchantSpendRollup.objects.filter(user_id=user_id, month=month, merchant=merchant)
+    if rows.update(total=F("total") + total, txn_count=F("txn_count") + count):
+        return
+    try:
+        with transaction.atomic():
+            MerchantSpendRollup.objects.create(
+                user_id=user_id, month=month, merchant=merchant, category=category, total=total, txn_count=count,
+            )
+    except IntegrityError:
+        # another posting created the row first
+        rows.update(total=F("total") + total, txn_count=F("txn_count") + count)
+
+
+def record_spend(txns: Iterable[Transaction]) -> None:
+    """Fold freshly posted transactions into the merchant rollups."""
+    buckets: Dict[Tuple[int, date, str], List] = defaultdict(lambda: ["", ZERO, 0])
+    for t in txns:
+        if t.status != TxnStatus.POSTED or t.txn_type not in SPEND_TYPES:
+            continue
+        merchant, category = spend_key(t)
+        b = buckets[(t.account.user_id, month_start(timezone.localdate(t.created_at)), merchant)]
+        b[0] = category
+        b[1] += t.amount
+        b[2] += 1
+
+    for (user_id, month, merchant), (category, total, count) in buckets.items():
+        _bump(user_id, month, merchant, category, total, count)
+
+
+def rebuild_user_rollups(user) -> int:
+    """Recompute every rollup row of one user from posted transactions. Returns rows written."""
+    buckets: Dict[Tuple[date, str], List] = defaultdict(lambda: ["", ZERO, 0])
+    txns = (
+        Transaction.objects.filter(account__user=user, status=TxnStatus.POSTED, txn_type__in=SPEND_TYPES)
+        .select_related("account", "payee")
+    )
+    for t in txns.iterator(chunk_size=2000):
+        merchant, category = spend_key(t)
+        b = buckets[(month_start(timezone.localdate(t.created_at)), merchant)]
+        b[0] = category
+        b[1] += t.amount
+        b[2] += 1
+
+    rows = [
+        MerchantSpendRollup(user=user, month=month, merchant=merchant, category=c, total=total, txn_count=n)
+        for (month, merchant), (c, total, n) in buckets.items()
+    ]
+    MerchantSpendRollup.objects.filter(user=user).delete()
+    MerchantSpendRollup.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def top_merchants(user, since: date, limit: int = 10):
+    return (
+        MerchantSpendRollup.objects.filter(user=user, month__gte=month_start(since))
+        .values("merchant")
+        .annotate(total=Sum("total"), txn_count=Sum("txn_count"))
+        .order_by("-total")[:limit]
+    )
+
+
+def category_breakdown(user, since: date):
+    return (
+        MerchantSpendRollup.objects.filter(user=user, month__gte=month_start(since))
+        .values("category")
+        .annotate(total=Sum("total"))
+        .order_by("-total")
+    )
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import calendar
+import time
+from datetime import date
+from typing import Dict, List, Optional
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from banking.models import ScheduledPayment, TxnType
+
+from .ledger import Posting, post_batch
+
+BATCH_SIZE = 1000
+
+
+def add_month(d: date) -> date:
+    """Same day next month, clamped to the month's last day (Jan 31 -> Feb 28)."""
+    year, month = (d.year + 1, 1) if d.month == 12 else (d.year, d.month + 1)
+    return d.replace(year=year, month=month, day=min(d.day, calendar.monthrange(year, month)[1]))
+
+
+def due_queryset(run_date: date):
+    """
+    Active payments due on or before run_date that this run date hasn't
+    attempted yet. Served by the (active, next_run) index.
+    """
+    return (
+        ScheduledPayment.objects.filter(active=True, next_run__lte=run_date)
+        .filter(Q(last_run__isnull=True) | Q(last_run__lt=run_date))
+    )
+
+
+def _run_batch(run_date: date, after_id: int, batch_size: int) -> Optional[Dict[str, int]]:
+    """
+    Pay one id-ordered slice of due items. Posting, next_run advance and the
+    last_run marker commit together, so a crashed run can simply be re-run.
+    """
+    with transaction.atomic():
+        items: List[ScheduledPayment] = list(
+            due_queryset(run_date)
+            .filter(id__gt=after_id)
+            .select_related("account", "payee")
+            .select_for_update(skip_locked=True, of=("self",))
+            .order_by("id")[:batch_size]
+        )
+        if not items:
+            return None
+
+        results = post_batch(
+            Posting(
+                kind=TxnType.BILLPAY,
+                account=sp.account,
+                amount=sp.amount,
+                payee=sp.payee,
+                memo=f"Scheduled • {sp.payee.name}",
+            )
+            for sp in items
+        )
+
+        paid = failed = 0
+        for sp, res in zip(items, results):
+            sp.last_run = run_date
+            sp.last_status = res.message[:140]
+            if not res.ok:
+                # next_run stays put; the next run date retries it
+                failed += 1
+                continue
+            paid += 1
+            if sp.frequency == "MONTHLY":
+                # one payment per run, even if several periods were missed
+                while sp.next_run <= run_date:
+                    sp.next_run = add_month(sp.next_run)
+            else:
+                sp.active = False
+
+        ScheduledPayment.objects.bulk_update(
+            items, ["last_run", "last_status", "next_run", "active"], batch_size=BATCH_SIZE
+        )
+
+    return {"last_id": items[-1].id, "paid": paid, "failed": failed}
+
+
+def run_scheduled_payments(run_date: Optional[date] = None, batch_size: int = BATCH_SIZE) -> Dict[str, float]:
+    """
+    Execute every scheduled payment due on run_date (default: today).
+    Idempotent per run date: items already attempted for run_date are skipped.
+    Returns counts plus throughput.
+    """
+    run_date = run_date or timezone.localdate()
+    started = time.perf_counter()
+
+    paid = failed = batches = 0
+    after_id = 0
+    while True:
+        out = _run_batch(run_date, after_id, batch_size)
+        if out is None:
+            break
+        after_id = out["last_id"]
+        paid += out["paid"]
+        failed += out["failed"]
+        batches += 1
+
+    seconds = time.perf_counter() - started
+    processed = paid + failed
+    return {
+        "run_date": run_date.isoformat(),
+        "processed": processed,
+        "paid": paid,
+        "failed": failed,
+        "batches": batches,
+        "seconds": round(seconds, 3),
+        "per_second": round(processed / seconds, 1) if seconds else float(processed),
+    }
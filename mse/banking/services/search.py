@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.db import connection
+from django.db.models import F, Lookup, Q
+from django.db.models.expressions import RawSQL
+
+from banking.models import BankAccount, Transaction
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# SQLite FTS5 table created by migration 0004 (trigram tokenizer = substring search)
+FTS_TABLE = "banking_transaction_fts"
+TRIGRAM_MIN = 3
+
+_fts_ready: Optional[bool] = None
+
+
+class ILike(Lookup):
+    """
+    column ILIKE pattern. The pg_trgm GIN indexes from migration 0004 are on the
+    plain columns, so they serve ILIKE but not icontains, which Postgres gets
+    from Django as UPPER(col::text) LIKE UPPER(...).
+    """
+    lookup_name = "ilike"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} ILIKE {rhs}", [*lhs_params, *rhs_params]
+
+
+def _like_pattern(q: str) -> str:
+    return "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def encode_cursor(txn: Transaction) -> str:
+    raw = f"{txn.created_at.isoformat()}|{txn.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        ts, pk = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(pk)
+    except (ValueError, UnicodeError):
+        return None
+
+
+def _sqlite_fts_ready() -> bool:
+    global _fts_ready
+    if _fts_ready is None:
+        _fts_ready = FTS_TABLE in connection.introspection.table_names()
+    return _fts_ready
+
+
+def search_filter(qs, q: str, account_id: Optional[int] = None):
+    """
+    memo/merchant substring search.
+      - SQLite: FTS5 trigram index (queries of 3+ chars), narrowed to
+        `account_id` inside the FTS query when given (migration 0009)
+      - Postgres: ILIKE (not icontains), served by the pg_trgm GIN indexes
+        from migration 0004
+      - anything else / short queries: a single OR'd icontains
+    """
+    q = (q or "").strip()
+    if not q:
+        return qs
+
+    if connection.vendor == "sqlite" and len(q) >= TRIGRAM_MIN and _sqlite_fts_ready():
+        phrase = '"' + q.replace('"', '""') + '"'
+        sql, params = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [phrase]
+        if account_id is not None:
+            sql, params = f"{sql} AND account_id = %s", [phrase, account_id]
+        return qs.filter(id__in=RawSQL(sql, params))
+
+    if connection.vendor == "postgresql":
+        pattern = _like_pattern(q)
+        return qs.filter(Q(ILike(F("memo"), pattern)) | Q(ILike(F("merchant"), pattern)))
+
+    return qs.filter(Q(memo__icontains=q) | Q(merchant__icontains=q))
+
+
+def page_transactions(
+    account: BankAccount,
+    txn_type: str = "",
+    q: str = "",
+    cursor: str = "",
+    limit: int = PAGE_SIZE,
+) -> Tuple[List[Transaction], Optional[str]]:
+    """
+    One page of an account's transactions, newest first, keyset-paginated on
+    (created_at, id) so every page is an index range scan on
+    (account, created_at) no matter how deep the user scrolls.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+    qs = Transaction.objects.filter(account=account).select_related("payee", "related_account")
+    if txn_type:
+        qs = qs.filter(txn_type=txn_type)
+    qs = search_filter(qs, q, account.id)
+
+    after = decode_cursor(cursor) if cursor else None
+    if after:
+        ts, pk = after
+        qs = qs.filter(Q(created_at__lt=ts) | Q(created_at=ts, id__lt=pk))
+
+    rows = list(qs.order_by("-created_at", "-id")[: limit + 1])
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
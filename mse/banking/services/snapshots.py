@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+
+from django.db.models import Case, Count, DecimalField, F, Sum, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from banking.models import BankAccount, DailyBalanceSnapshot, Transaction, TxnStatus, TxnType
+
+INFLOW_TYPES = [TxnType.DEPOSIT, TxnType.TRANSFER_IN]
+OUTFLOW_TYPES = [TxnType.WITHDRAWAL, TxnType.TRANSFER_OUT, TxnType.BILLPAY, TxnType.CARD]
+
+ZERO = Decimal("0.00")
+
+
+def record_transactions(txns: Iterable[Transaction]) -> None:
+    """
+    Fold freshly posted transactions into the daily snapshots.
+
+    Call after the account balances have been saved, while the account rows
+    are still locked: txn.account.balance is taken as the current closing
+    balance. Backdated rows also shift every later snapshot of the account.
+    """
+    buckets: Dict[Tuple[int, date], List[Decimal]] = defaultdict(lambda: [ZERO, ZERO, 0])
+    running: Dict[int, Decimal] = {}
+
+    for t in txns:
+        if t.status != TxnStatus.POSTED:
+            continue
+        b = buckets[(t.account_id, timezone.localdate(t.created_at))]
+        if t.txn_type in INFLOW_TYPES:
+            b[0] += t.amount
+        else:
+            b[1] += t.amount
+        b[2] += 1
+        running[t.account_id] = t.account.balance
+
+    # Replay the buckets one by one on top of the pre-batch balance, so every
+    # step leaves the snapshots consistent with the balance so far.
+    for (account_id, _), (inflow, outflow, _) in buckets.items():
+        running[account_id] -= inflow - outflow
+
+    for (account_id, day), (inflow, outflow, count) in sorted(buckets.items(), key=lambda kv: kv[0][1]):
+        net = inflow - outflow
+        running[account_id] += net
+        snaps = DailyBalanceSnapshot.objects.filter(account_id=account_id)
+
+        snaps.filter(day__gt=day).update(
+            opening_balance=F("opening_balance") + net,
+            closing_balance=F("closing_balance") + net,
+        )
+
+        updated = snaps.filter(day=day).update(
+            inflow=F("inflow") + inflow,
+            outflow=F("outflow") + outflow,
+            txn_count=F("txn_count") + count,
+            closing_balance=F("closing_balance") + net,
+        )
+        if updated:
+            continue
+
+        later = snaps.filter(day__gt=day).aggregate(
+            net=Sum(F("inflow") - F("outflow"), output_field=DecimalField())
+        )["net"] or ZERO
+        closing = running[account_id] - later
+        DailyBalanceSnapshot.objects.create(
+            account_id=account_id,
+            day=day,
+            opening_balance=closing - net,
+            closing_balance=closing,
+            inflow=inflow,
+            outflow=outflow,
+            txn_count=count,
+        )
+
+
+def rebuild_account_snapshots(account: BankAccount) -> int:
+    """
+    Recompute every snapshot of one account from its posted transactions,
+    walking backwards from the current balance. Returns rows written.
+    """
+    money = DecimalField(max_digits=14, decimal_places=2)
+    days = list(
+        Transaction.objects.filter(account=account, status=TxnStatus.POSTED)
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(
+            inflow=Sum(Case(When(txn_type__in=INFLOW_TYPES, then="amount"), default=Value(ZERO), output_field=money)),
+            outflow=Sum(Case(When(txn_type__in=OUTFLOW_TYPES, then="amount"), default=Value(ZERO), output_field=money)),
+            n=Count("id"),
+        )
+        .order_by("-day")
+    )
+
+    rows = []
+    closing = account.balance
+    for d in days:
+        opening = closing - d["inflow"] + d["outflow"]
+        rows.append(DailyBalanceSnapshot(
+            account=account,
+            day=d["day"],
+            opening_balance=opening,
+            closing_balance=closing,
+            inflow=d["inflow"],
+            outflow=d["outflow"],
+            txn_count=d["n"],
+        ))
+        closing = opening
+
+    DailyBalanceSnapshot.objects.filter(account=account).delete()
+    DailyBalanceSnapshot.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def period_balances(account: BankAccount, start: date, end: date) -> Tuple[Decimal, Decimal]:
+    """Opening/closing balance for [start, end] using at most three indexed reads."""
+    snaps = DailyBalanceSnapshot.objects.filter(account=account)
+
+    inside = snaps.filter(day__gte=start, day__lte=end)
+    first = inside.order_by("day").first()
+    if first:
+        last = inside.order_by("-day").first()
+        return first.opening_balance, last.closing_balance
+
+    before = snaps.filter(day__lt=start).order_by("-day").first()
+    if before:
+        return before.closing_balance, before.closing_balance
+
+    after = snaps.filter(day__gt=end).order_by("day").first()
+    if after:
+        return after.opening_balance, after.opening_balance
+
+    return account.balance, account.balance
+
+
+def outflow_since(user, start: date) -> Decimal:
+    """Total spend (withdrawals, bill pay, card, transfers out) across a user's accounts."""
+    return (
+        DailyBalanceSnapshot.objects.filter(account__user=user, day__gte=start)
+        .aggregate(s=Sum("outflow"))["s"]
+        or ZERO
+    )
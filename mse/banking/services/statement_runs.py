@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import calendar
+import hashlib
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time, timedelta
+from itertools import repeat
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import connections
+from django.utils import timezone
+
+from banking.models import BankAccount, Statement, Transaction
+
+from .documents import STATEMENT_LAYOUT
+from .snapshots import period_balances
+from .statements import generate_statement
+
+RENDERED = "rendered"
+SKIPPED = "skipped"
+
+
+def month_bounds(month: str) -> Tuple[date, date]:
+    """'2025-11' -> (2025-11-01, 2025-11-30)"""
+    start = date.fromisoformat(month + "-01")
+    end = start.replace(day=calendar.monthrange(start.year, start.month)[1])
+    return start, end
+
+
+def statement_hash(account: BankAccount, start: date, end: date) -> str:
+    """
+    Fingerprint of everything the PDF shows: account header, period balances
+    the period's transactions and the layout version. Same hash = the cached PDF is still right.
+    """
+    opening, closing = period_balances(account, start, end)
+    h = hashlib.sha256(STATEMENT_LAYOUT.cache_tag.encode("utf-8"))
+    h.update(f"{account.public_id}|{account.nickname}|{account.account_type}|{opening}|{closing}".encode("utf-8"))
+
+    lo = timezone.make_aware(datetime.combine(start, time.min))
+    hi = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+    rows = (
+        Transaction.objects.filter(account=account, created_at__gte=lo, created_at__lt=hi)
+        .order_by("created_at", "id")
+        .values_list("id", "created_at", "txn_type", "amount", "memo")
+    )
+    for row in rows.iterator(chunk_size=2000):
+        h.update(repr(row).encode("utf-8"))
+    return h.hexdigest()
+
+
+def render_statement(account_id: int, month: str, force: bool = False) -> str:
+    """
+    Render (or keep) one account's statement for `month` (YYYY-MM).
+    Returns RENDERED or SKIPPED.
+    """
+    account = BankAccount.objects.get(id=account_id)
+    start, end = month_bounds(month)
+    digest = statement_hash(account, start, end)
+
+    stmt = Statement.objects.filter(account=account, period_start=start, period_end=end).first()
+    if stmt and stmt.pdf_file and stmt.content_hash == digest and not force:
+        return SKIPPED
+
+    pdf = generate_statement(account, start)
+    opening, closing = period_balances(account, start, end)
+
+    if stmt is None:
+        stmt = Statement(account=account, period_start=start, period_end=end)
+    elif stmt.pdf_file:
+        stmt.pdf_file.delete(save=False)
+
+    stmt.opening_balance = opening
+    stmt.closing_balance = closing
+    stmt.content_hash = digest
+    stmt.generated_at = timezone.now()
+    try:
+        stmt.pdf_file.save(f"{account.public_id}_{month}.pdf", pdf, save=False)
+    finally:
+        pdf.close()
+    stmt.save()
+    return RENDERED
+
+
+def _init_worker():
+    # Each pool process gets its own Django + DB connection.
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mse.settings")
+    import django
+
+    django.setup()
+
+
+def run_statements(
+    month: str,
+    account_ids: Optional[Iterable[int]] = None,
+    workers: int = 4,
+    use_celery: bool = False,
+    force: bool = False,
+) -> Dict[str, int]:
+    """
+    Month-end statement run. Fans out one render per account over a process
+    pool (workers > 1), Celery (use_celery) or inline (workers <= 1).
+    Returns counts by outcome.
+    """
+    if account_ids is None:
+        account_ids = BankAccount.objects.filter(is_active=True).order_by("id").values_list("id", flat=True)
+    ids = list(account_ids)
+
+    if use_celery:
+        from celery import group
+        from banking.tasks import render_statement_task
+
+        group(render_statement_task.s(i, month, force) for i in ids).apply_async()
+        return {"queued": len(ids)}
+
+    counts: Counter = Counter()
+    if workers <= 1 or len(ids) <= 1:
+        for i in ids:
+            counts[render_statement(i, month, force)] += 1
+        return dict(counts)
+
+    # forked children must not share the parent's DB socket
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for status in pool.map(render_statement, ids, repeat(month), repeat(force), chunksize=8):
+            counts[status] += 1
+    return dict(counts)
@@ -1,60 +1,54 @@
-from io import BytesIO
-from django.core.files.base import ContentFile
-from reportlab.lib.pagesizes import LETTER
-from reportlab.pdfgen import canvas
+import calendar
+from typing import Iterator
+
+from .documents import STATEMENT_LAYOUT, Block, Row, RunningHeader, Text, render_to_file
+from .snapshots import period_balances
+
+TABLE_HEADER = Row(
+    ((40, "Date", "left"), (120, "Description", "left"), (420, "Amount", "left")),
+    font="Helvetica-Bold",
+    lead=20,
+)
+
+
+def statement_blocks(account, month_date) -> Iterator[Block]:
+    """Statement content, streamed: transactions are read in chunks, never all at once."""
+    yield Text("Bank Statement", font="Helvetica-Bold", size=16, lead=25)
+    yield Text(f"Account: {account.nickname or account.get_account_type_display()}", size=11, lead=15)
+    yield Text(f"Account ID: {account.public_id}", size=11, lead=15)
+    yield Text(f"Statement Month: {month_date.strftime('%B %Y')}", size=11, lead=15)
+
+    period_start = month_date.replace(day=1)
+    period_end = month_date.replace(day=calendar.monthrange(month_date.year, month_date.month)[1])
+    opening, closing = period_balances(account, period_start, period_end)
+    yield Row(((40, f"Opening Balance: ${opening}", "left"), (240, f"Closing Balance: ${closing}", "left")), size=11, lead=30)
+
+    yield TABLE_HEADER
+    yield RunningHeader(TABLE_HEADER)
+
+    rows = (
+        account.transactions.filter(
+            created_at__year=month_date.year,
+            created_at__month=month_date.month,
+        )
+        .order_by("created_at", "id")
+        .values_list("created_at", "memo", "txn_type", "amount")
+    )
+    empty = True
+    for created_at, memo, txn_type, amount in rows.iterator(chunk_size=2000):
+        empty = False
+        yield Row((
+            (40, created_at.strftime("%Y-%m-%d"), "left"),
+            (120, memo or txn_type, "left"),
+            (500, f"${amount}", "right"),
+        ))
+    if empty:
+        yield Text("No transactions for this period.")
 
 
 def generate_statement(account, month_date):
     """
     Generate a PDF bank statement for a given account + month.
-    Returns a Django ContentFile.
+    Returns a Django File (spooled to disk for long statements); the caller closes it.
     """
-
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=LETTER)
-
-    # Header
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(40, 750, "Bank Statement")
-
-    c.setFont("Helvetica", 11)
-    c.drawString(40, 725, f"Account: {account.nickname or account.get_account_type_display()}")
-    c.drawString(40, 710, f"Account ID: {account.public_id}")
-    c.drawString(40, 695, f"Statement Month: {month_date.strftime('%B %Y')}")
-
-    # Table header
-    y = 660
-    c.setFont("Helvetica-Bold", 10)
-    c.drawString(40, y, "Date")
-    c.drawString(120, y, "Description")
-    c.drawString(420, y, "Amount")
-
-    c.setFont("Helvetica", 10)
-    y -= 20
-
-    transactions = account.transactions.filter(
-        created_at__year=month_date.year,
-        created_at__month=month_date.month,
-    ).order_by("created_at")
-
-    if not transactions.exists():
-        c.drawString(40, y, "No transactions for this period.")
-    else:
-        for txn in transactions:
-            if y < 60:
-                c.showPage()
-                y = 750
-                c.setFont("Helvetica", 10)
-
-            c.drawString(40, y, txn.created_at.strftime("%Y-%m-%d"))
-            c.drawString(120, y, txn.memo or txn.txn_type)
-            c.drawRightString(500, y, f"${txn.amount}")
-            y -= 16
-
-    c.showPage()
-    c.save()
-
-    pdf = buffer.getvalue()
-    buffer.close()
-
-    return ContentFile(pdf)
+    return render_to_file(statement_blocks(account, month_date), STATEMENT_LAYOUT)
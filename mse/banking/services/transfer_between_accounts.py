@@ -2,6 +2,8 @@ from django.db import transaction
 from banking.models import BankAccount, Transaction, TxnType, TxnStatus
 from decimal import Decimal
 
+from .projections import apply_posted
+
 
 @transaction.atomic
 def transfer_between_accounts(
@@ -30,7 +32,7 @@ def transfer_between_accounts(
     from_account.save()
     to_account.save()
 
-    Transaction.objects.create(
+    out_txn = Transaction.objects.create(
         account=from_account,
         related_account=to_account,
         txn_type=TxnType.TRANSFER_OUT,
@@ -39,7 +41,7 @@ def transfer_between_accounts(
         memo=f"Transfer to {to_account.public_id}",
     )
 
-    Transaction.objects.create(
+    in_txn = Transaction.objects.create(
         account=to_account,
         related_account=from_account,
         txn_type=TxnType.TRANSFER_IN,
@@ -48,4 +50,6 @@ def transfer_between_accounts(
         memo=f"Transfer from {from_account.public_id}",
     )
 
+    apply_posted([out_txn, in_txn])
+
     return from_account, to_account
@@ -2,6 +2,8 @@ from django.db import transaction
 from banking.models import BankAccount, Transaction, TxnType, TxnStatus
 from decimal import Decimal
 
+from .projections import apply_posted
+
 
 @transaction.atomic
 def withdraw(account_id: int, amount: Decimal, memo="Withdrawal"):
@@ -17,7 +19,7 @@ def withdraw(account_id: int, amount: Decimal, memo="Withdrawal"):
     account.available_balance -= amount
     account.save()
 
-    Transaction.objects.create(
+    txn = Transaction.objects.create(
         account=account,
         txn_type=TxnType.WITHDRAWAL,
         status=TxnStatus.POSTED,
@@ -25,4 +27,6 @@ def withdraw(account_id: int, amount: Decimal, memo="Withdrawal"):
         memo=memo,
     )
 
+    apply_posted([txn])
+
     return account
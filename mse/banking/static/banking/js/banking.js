@@ -163,8 +163,70 @@
     });
   };
 
+  // Account transactions: keyset-paginated infinite scroll
+  const initTxnFeed = () => {
+    const more = document.querySelector("[data-txn-feed]");
+    const list = document.querySelector(".bk-txnlist");
+    if (!more || !list) return;
+
+    let loading = false;
+    const money = (v) => "$" + Number(v).toLocaleString("en-US", { minimumFractionDigits: 2, maximumFractionDigits: 2 });
+
+    const row = (t) => {
+      const el = document.createElement("div");
+      el.className = "bk-txn";
+      const ic = document.createElement("div");
+      ic.className = "bk-txn-ic";
+      ic.dataset.txn = t.txn_type;
+      const mid = document.createElement("div");
+      mid.className = "bk-txn-mid";
+      const title = document.createElement("div");
+      title.className = "bk-txn-title";
+      title.textContent = t.title;
+      const sub = document.createElement("div");
+      sub.className = "bk-txn-sub";
+      sub.textContent = new Date(t.created_at).toLocaleString("en-US") + (t.related_account ? " • Related " + t.related_account : "");
+      mid.append(title, sub);
+      const amt = document.createElement("div");
+      amt.className = "bk-txn-amt";
+      const span = document.createElement("span");
+      span.className = ["DEPOSIT", "TRANSFER_IN"].includes(t.txn_type) ? "is-pos" : "is-neg";
+      span.textContent = money(t.amount);
+      amt.appendChild(span);
+      el.append(ic, mid, amt);
+      return el;
+    };
+
+    const load = async () => {
+      if (loading || !more.dataset.cursor) return;
+      loading = true;
+      const params = new URLSearchParams({ cursor: more.dataset.cursor, t: more.dataset.t || "", q: more.dataset.q || "" });
+      try {
+        const r = await fetch(more.dataset.txnFeed + "?" + params.toString(), { headers: { Accept: "application/json" } });
+        const data = await r.json();
+        (data.results || []).forEach((t) => list.appendChild(row(t)));
+        if (data.next_cursor) {
+          more.dataset.cursor = data.next_cursor;
+        } else {
+          more.remove();
+        }
+      } finally {
+        loading = false;
+      }
+    };
+
+    if ("IntersectionObserver" in window) {
+      new IntersectionObserver((entries) => {
+        if (entries.some((en) => en.isIntersecting)) load();
+      }, { rootMargin: "400px" }).observe(more);
+    }
+    const link = more.querySelector("a");
+    if (link) link.addEventListener("click", (e) => { e.preventDefault(); load(); });
+  };
+
   document.addEventListener("DOMContentLoaded", () => {
     reveal();
+    initTxnFeed();
     initToasts();
     initModal();
     countUp();
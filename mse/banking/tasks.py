@@ -0,0 +1,39 @@
+# banking/tasks.py
+import logging
+from datetime import date
+
+from celery import shared_task
+from django.utils import timezone
+
+from banking.services.scheduler import run_scheduled_payments
+from banking.services.statement_runs import render_statement, run_statements
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def render_statement_task(account_id: int, month: str, force: bool = False) -> str:
+    """Render a single account statement (YYYY-MM); skipped when the cached PDF is current."""
+    return render_statement(account_id, month, force)
+
+
+@shared_task
+def run_month_end_statements(month: str = "") -> dict:
+    """
+    Fan out last month's statements as one Celery task per account.
+    """
+    if not month:
+        first = timezone.localdate().replace(day=1)
+        month = (first - timezone.timedelta(days=1)).strftime("%Y-%m")
+
+    logger.info("Queueing statements for %s", month)
+    return run_statements(month, use_celery=True)
+
+
+@shared_task
+def run_scheduled_payments_task(run_date: str = "") -> dict:
+    """Beat job: pay everything due today. Re-running for the same date is a no-op."""
+    day = date.fromisoformat(run_date) if run_date else None
+    stats = run_scheduled_payments(day)
+    logger.info("Scheduled payments %s", stats)
+    return stats
@@ -1,3 +1,790 @@
-from django.test import TestCase
+import csv
+import gzip
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.shortcuts import resolve_url
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import (
+    AccountType,
+    BankAccount,
+    DailyBalanceSnapshot,
+    MerchantSpendRollup,
+    Payee,
+    ScheduledPayment,
+    Statement,
+    Transaction,
+    TxnType,
+)
+from .ai_credit.models import CreditModelArtifact
+from .ai_credit.registry import ModelRegistry, registry as credit_registry
+from .services import Posting, deposit, documents, pay_bill, post_batch, transfer_between_accounts, withdraw
+from .services.rollups import rebuild_user_rollups
+from .services.scheduler import add_month, run_scheduled_payments
+from .services.search import page_transactions, search_filter
+from .services.snapshots import period_balances
+from .services.statement_runs import RENDERED, SKIPPED, render_statement, run_statements
+
+
+User = get_user_model()
+
+
+class PostBatchTests(TestCase):
+    def setUp(self):
+        # signals give every new user a Checking (1250.00) + Savings (5200.00)
+        self.u = User.objects.create_user(username="u1", password="pass12345")
+        self.checking = BankAccount.objects.get(user=self.u, account_type=AccountType.CHECKING)
+        self.savings = BankAccount.objects.get(user=self.u, account_type=AccountType.SAVINGS)
+        self.payee = Payee.objects.create(user=self.u, name="Electric")
+
+    def test_mixed_batch_applies_in_order(self):
+        results = post_batch([
+            Posting(TxnType.DEPOSIT, self.checking, Decimal("100.00")),
+            Posting(TxnType.WITHDRAWAL, self.checking, Decimal("50.00")),
+            Posting(TxnType.TRANSFER_OUT, self.savings, Decimal("200.00"), to_account=self.checking),
+            Posting(TxnType.BILLPAY, self.checking, Decimal("75.25"), payee=self.payee),
+        ])
+
+        self.assertEqual([r.ok for r in results], [True, True, True, True])
+        self.checking.refresh_from_db()
+        self.savings.refresh_from_db()
+        self.assertEqual(self.checking.balance, Decimal("1424.75"))
+        self.assertEqual(self.checking.available_balance, Decimal("1424.75"))
+        self.assertEqual(self.savings.balance, Decimal("5000.00"))
+        self.assertEqual(Transaction.objects.filter(account__user=self.u).count(), 5)
+
+    def test_overdraft_sees_earlier_postings(self):
+        results = post_batch([
+            Posting(TxnType.WITHDRAWAL, self.checking, Decimal("1000.00")),
+            Posting(TxnType.WITHDRAWAL, self.checking, Decimal("1000.00")),
+        ])
+
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[1].message, "Insufficient funds")
+        self.checking.refresh_from_db()
+        self.assertEqual(self.checking.balance, Decimal("250.00"))
+        self.assertEqual(Transaction.objects.filter(account=self.checking).count(), 1)
+
+    def test_rejects_foreign_payee_and_same_account_transfer(self):
+        other = User.objects.create_user(username="u2", password="pass12345")
+        foreign = Payee.objects.create(user=other, name="Rent")
+
+        results = post_batch([
+            Posting(TxnType.BILLPAY, self.checking, Decimal("10.00"), payee=foreign),
+            Posting(TxnType.TRANSFER_OUT, self.checking, Decimal("10.00"), to_account=self.checking),
+        ])
+
+        self.assertEqual(results[0].message, "Invalid payee.")
+        self.assertEqual(results[1].message, "Cannot transfer to the same account")
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_matches_single_call_functions(self):
+        other = User.objects.create_user(username="u2", password="pass12345")
+        o_checking = BankAccount.objects.get(user=other, account_type=AccountType.CHECKING)
+        o_savings = BankAccount.objects.get(user=other, account_type=AccountType.SAVINGS)
+        o_payee = Payee.objects.create(user=other, name="Electric")
+
+        deposit(self.checking.id, Decimal("100.00"))
+        withdraw(self.checking.id, Decimal("50.00"))
+        transfer_between_accounts(self.savings.id, self.checking.id, Decimal("200.00"))
+        pay_bill(self.checking.id, self.payee.id, Decimal("75.25"))
+        post_batch([
+            Posting(TxnType.DEPOSIT, o_checking, Decimal("100.00")),
+            Posting(TxnType.WITHDRAWAL, o_checking, Decimal("50.00")),
+            Posting(TxnType.TRANSFER_OUT, o_savings, Decimal("200.00"), to_account=o_checking),
+            Posting(TxnType.BILLPAY, o_checking, Decimal("75.25"), payee=o_payee),
+        ])
+
+        def rows(user, accounts):
+            names = {a.id: role for role, a in accounts.items()}
+            out = []
+            for t in Transaction.objects.filter(account__user=user).order_by("id"):
+                memo = t.memo
+                for role, a in accounts.items():
+                    memo = memo.replace(a.public_id, role)
+                out.append((names[t.account_id], t.txn_type, t.status, t.amount, memo,
+                            names.get(t.related_account_id), t.payee.name if t.payee else None))
+            return out
+
+        single = rows(self.u, {"checking": self.checking, "savings": self.savings})
+        batch = rows(other, {"checking": o_checking, "savings": o_savings})
+        self.assertEqual(sorted(single), sorted(batch))
+        self.assertEqual(len(single), 5)
+
+        for mine, theirs in ((self.checking, o_checking), (self.savings, o_savings)):
+            mine.refresh_from_db()
+            theirs.refresh_from_db()
+            self.assertEqual((mine.balance, mine.available_balance), (theirs.balance, theirs.available_balance))
+
+    def test_updates_caller_instances(self):
+        post_batch([Posting(TxnType.DEPOSIT, self.checking, Decimal("0.50"))])
+        self.assertEqual(self.checking.balance, Decimal("1250.50"))
+
+
+class DailyBalanceSnapshotTests(TestCase):
+    def setUp(self):
+        self.u = User.objects.create_user(username="u1", password="pass12345")
+        self.checking = BankAccount.objects.get(user=self.u, account_type=AccountType.CHECKING)
+
+    def test_postings_roll_into_todays_snapshot(self):
+        deposit(self.checking.id, Decimal("100.00"))
+        withdraw(self.checking.id, Decimal("30.00"))
+        post_batch([Posting(TxnType.WITHDRAWAL, self.checking, Decimal("20.00"))])
+
+        snap = DailyBalanceSnapshot.objects.get(account=self.checking)
+        self.assertEqual(snap.day, timezone.localdate())
+        self.assertEqual(snap.opening_balance, Decimal("1250.00"))
+        self.assertEqual(snap.closing_balance, Decimal("1300.00"))
+        self.assertEqual(snap.inflow, Decimal("100.00"))
+        self.assertEqual(snap.outflow, Decimal("50.00"))
+        self.assertEqual(snap.txn_count, 3)
+
+    def test_backfill_rebuilds_history(self):
+        deposit(self.checking.id, Decimal("100.00"))
+        withdraw(self.checking.id, Decimal("30.00"))
+        Transaction.objects.filter(account=self.checking, txn_type=TxnType.DEPOSIT).update(
+            created_at=timezone.now() - timedelta(days=3)
+        )
+
+        call_command("backfill_balance_snapshots", stdout=StringIO())
+
+        snaps = list(DailyBalanceSnapshot.objects.filter(account=self.checking).order_by("day"))
+        self.assertEqual(len(snaps), 2)
+        self.assertEqual(snaps[0].opening_balance, Decimal("1250.00"))
+        self.assertEqual(snaps[0].closing_balance, Decimal("1350.00"))
+        self.assertEqual(snaps[1].opening_balance, Decimal("1350.00"))
+        self.assertEqual(snaps[1].closing_balance, Decimal("1320.00"))
+
+        today = timezone.localdate()
+        opening, closing = period_balances(self.checking, today - timedelta(days=10), today)
+        self.assertEqual((opening, closing), (Decimal("1250.00"), Decimal("1320.00")))
+
+
+class TransactionExportTests(TestCase):
+    def setUp(self):
+        self.u = User.objects.create_user(username="u1", password="pass12345")
+        self.checking = BankAccount.objects.get(user=self.u, account_type=AccountType.CHECKING)
+        post_batch([
+            Posting(TxnType.DEPOSIT, self.checking, Decimal("1.00"), memo=f"Payroll, week {i}")
+            for i in range(600)
+        ])
+        self.client.login(username="u1", password="pass12345")
+        self.url = reverse("banking:export_csv", args=[self.checking.public_id])
+
+    def _rows(self, resp):
+        body = b"".join(resp.streaming_content)
+        if resp["Content-Type"] == "application/gzip":
+            body = gzip.decompress(body)
+        return list(csv.reader(StringIO(body.decode("utf-8"))))
+
+    def test_streams_all_rows_and_quotes_commas(self):
+        resp = self.client.get(self.url)
+        rows = self._rows(resp)
+        self.assertEqual(rows[0][:4], ["date", "type", "status", "amount"])
+        self.assertEqual(len(rows), 601)
+        self.assertTrue(rows[1][4].startswith("Payroll, week"))
+
+    def test_gzip_and_date_range(self):
+        old = timezone.localdate() - timedelta(days=40)
+        resp = self.client.get(self.url, {"gzip": "1", "end": old.isoformat()})
+        self.assertTrue(resp["Content-Disposition"].endswith('.csv.gz"'))
+        self.assertEqual(len(self._rows(resp)), 1)
+
+    def test_bad_date_is_rejected(self):
+        resp = self.client.get(self.url, {"start": "yesterday"})
+        self.assertEqual(resp.status_code, 400)
+
+
+class StatementRunTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.u = User.objects.create_user(username="u1", password="pass12345")
+        self.checking = BankAccount.objects.get(user=self.u, account_type=AccountType.CHECKING)
+        deposit(self.checking.id, Decimal("100.00"))
+        self.month = timezone.localdate().strftime("%Y-%m")
+
+    def test_unchanged_account_is_skipped(self):
+        self.assertEqual(render_statement(self.checking.id, self.month), RENDERED)
+        self.assertEqual(render_statement(self.checking.id, self.month), SKIPPED)
+
+        withdraw(self.checking.id, Decimal("5.00"))
+        self.assertEqual(render_statement(self.checking.id, self.month), RENDERED)
+
+        stmt = Statement.objects.get(account=self.checking)
+        self.assertEqual(stmt.opening_balance, Decimal("1250.00"))
+        self.assertEqual(stmt.closing_balance, Decimal("1345.00"))
+        self.assertEqual(len(stmt.content_hash), 64)
+
+    def test_inline_run_counts_outcomes(self):
+        ids = list(BankAccount.objects.filter(user=self.u).values_list("id", flat=True))
+        self.assertEqual(run_statements(self.month, account_ids=ids, workers=1), {RENDERED: 2})
+        self.assertEqual(run_statements(self.month, account_ids=ids, workers=1), {SKIPPED: 2})
+
+    def test_view_serves_cached_pdf(self):
+        self.client.login(username="u1", password="pass12345")
+        resp = self.client.post(reverse("banking:statements"), {"account": self.checking.id, "month": self.month})
+        self.assertEqual(resp.status_code, 302)
+
+        stmt = Statement.objects.get(account=self.checking)
+        resp = self.client.get(reverse("banking:statement_download", args=[stmt.id]))
+        self.assertEqual(resp["Content-Type"], "application/pdf")
+        self.assertTrue(b"".join(resp.streaming_content).startswith(b"%PDF"))
+
+
+class TransactionSearchTests(TestCase):
+    def setUp(self):
+        self.u = User.objects.create_user(username="u1", password="pass12345")
+        self.checking = BankAccount.objects.get(user=self.u, account_type=AccountType.CHECKING)
+        now = timezone.now()
+        Transaction.objects.bulk_create([
+            Transaction(
+                account=self.checking,
+                txn_type=TxnType.CARD,
+                amount=Decimal("2.00"),
+                merchant="Blue Bottle Coffee" if i % 3 == 0 else "Metro",
+                memo=f"card #{i}",
+                created_at=now - timedelta(minutes=i // 2),  # ties on created_at
+            )
+            for i in range(25)
+        ])
+
+    def test_keyset_pages_cover_everything_once(self):
+        seen, cursor = [], ""
+        while True:
+            rows, cursor = page_transactions(self.checking, cursor=cursor, limit=7)
+            seen.extend(r.id for r in rows)
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+
+    def test_search_matches_merchant_substring(self):
+        rows, cursor = page_transactions(self.checking, q="bottle", limit=50)
+        self.assertEqual(len(rows), 9)
+        self.assertIsNone(cursor)
+        self.assertTrue(all(r.merchant == "Blue Bottle Coffee" for r in rows))
+
+    def test_search_is_scoped_to_the_account(self):
+        other = User.objects.create_user(username="u2", password="pass12345")
+        theirs = BankAccount.objects.get(user=other, account_type=AccountType.CHECKING)
+        Transaction.objects.create(account=theirs, txn_type=TxnType.CARD, amount=Decimal("3.00"),
+                                   merchant="Blue Bottle Coffee")
+
+        scoped = search_filter(Transaction.objects.all(), "bottle", self.checking.id)
+        self.assertEqual(scoped.count(), 9)
+        self.assertFalse(scoped.filter(account=theirs).exists())
+        self.assertEqual(search_filter(Transaction.objects.all(), "bottle").count(), 10)
+
+    @skipUnless(connection.vendor == "postgresql", "pg_trgm indexes are Postgres-only")
+    def test_postgres_search_uses_trigram_indexes(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = 'banking_txn_memo_trgm'")
+            if not cursor.fetchone():
+                self.skipTest("pg_trgm unavailable; migration 0004 skipped the indexes")
+            cursor.execute("SET LOCAL enable_seqscan = off")  # tiny table: make the planner show its options
+            sql, params = search_filter(Transaction.objects.all(), "bottle").query.sql_with_params()
+            cursor.execute(f"EXPLAIN {sql}", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        self.assertIn("banking_txn_memo_trgm", plan)
+        self.assertIn("banking_txn_merchant_trgm", plan)
+
+    def test_json_feed(self):
+        self.client.login(username="u1", password="pass12345")
+        url = reverse("banking:account_transactions_api", args=[self.checking.public_id])
+        first = self.client.get(url, {"limit": "20"}).json()
+        second = self.client.get(url, {"limit": "20", "cursor": first["next_cursor"]}).json()
+        self.assertEqual(len(first["results"]), 20)
+        self.assertEqual(len(second["results"]), 5)
+        self.assertIsNone(second["next_cursor"])
+
+
+class MerchantSpendRollupTests(TestCase):
+    def setUp(self):
+        self.u = User.objects.create_user(username="u1", password="pass12345")
+        self.checking = BankAccount.objects.get(user=self.u, account_type=AccountType.CHECKING)
+        self.savings = BankAccount.objects.get(user=self.u, account_type=AccountType.SAVINGS)
+        self.payee = Payee.objects.create(user=self.u, name="Pepco", category="Utilities")
+
+    def test_posting_path_feeds_rollups(self):
+        post_batch([
+            Posting(TxnType.BILLPAY, self.checking, Decimal("80.00"), payee=self.payee),
+            Posting(TxnType.BILLPAY, self.savings, Decimal("20.00"), payee=self.payee),
+            Posting(TxnType.WITHDRAWAL, self.checking, Decimal("40.00")),
+            Posting(TxnType.DEPOSIT, self.checking, Decimal("500.00")),
+            Posting(TxnType.TRANSFER_OUT, self.savings, Decimal("100.00"), to_account=self.checking),
+        ])
+
+        rows = {r.merchant: r for r in MerchantSpendRollup.objects.filter(user=self.u)}
+        self.assertEqual(set(rows), {"Pepco", ""})
+        self.assertEqual(rows["Pepco"].total, Decimal("100.00"))
+        self.assertEqual(rows["Pepco"].txn_count, 2)
+        self.assertEqual(rows["Pepco"].category, "Utilities")
+        self.assertEqual(rows[""].category, "Cash")
+
+        pepco_before = rows["Pepco"].total
+        rebuild_user_rollups(self.u)
+        self.assertEqual(MerchantSpendRollup.objects.get(user=self.u, merchant="Pepco").total, pepco_before)
+
+    def test_spending_page_windows(self):
+        Transaction.objects.create(
+            account=self.checking, txn_type=TxnType.CARD, amount=Decimal("9.00"), merchant="Old Cafe",
+            created_at=timezone.now() - timedelta(days=400),
+        )
+        rebuild_user_rollups(self.u)
+        post_batch([Posting(TxnType.BILLPAY, self.checking, Decimal("80.00"), payee=self.payee)])
+
+        self.client.login(username="u1", password="pass12345")
+        resp = self.client.get(reverse("banking:spending"), {"months": "3"})
+        self.assertContains(resp, "Pepco")
+        self.assertNotContains(resp, "Old Cafe")
+        self.assertContains(resp, "Utilities")
+
+
+class ScheduledPaymentRunTests(TestCase):
+    def setUp(self):
+        self.u = User.objects.create_user(username="u1", password="pass12345")
+        self.checking = BankAccount.objects.get(user=self.u, account_type=AccountType.CHECKING)
+        self.payee = Payee.objects.create(user=self.u, name="Landlord")
+        self.run_date = date(2025, 3, 1)
+
+    def _schedule(self, amount, frequency="MONTHLY", next_run=None):
+        return ScheduledPayment.objects.create(
+            user=self.u, account=self.checking, payee=self.payee, amount=Decimal(amount),
+            frequency=frequency, next_run=next_run or self.run_date,
+        )
+
+    def test_add_month_clamps(self):
+        self.assertEqual(add_month(date(2025, 1, 31)), date(2025, 2, 28))
+        self.assertEqual(add_month(date(2025, 12, 15)), date(2026, 1, 15))
+
+    def test_run_pays_advances_and_is_idempotent(self):
+        monthly = self._schedule("100.00")
+        once = self._schedule("50.00", frequency="ONCE", next_run=date(2025, 2, 20))
+        too_big = self._schedule("5000.00")
+        later = self._schedule("10.00", next_run=date(2025, 3, 2))
+
+        stats = run_scheduled_payments(self.run_date, batch_size=2)
+        self.assertEqual((stats["paid"], stats["failed"], stats["batches"]), (2, 1, 2))
+
+        self.checking.refresh_from_db()
+        self.assertEqual(self.checking.balance, Decimal("1100.00"))
+        self.assertEqual(Transaction.objects.filter(account=self.checking, txn_type=TxnType.BILLPAY).count(), 2)
+
+        monthly.refresh_from_db()
+        once.refresh_from_db()
+        too_big.refresh_from_db()
+        later.refresh_from_db()
+        self.assertEqual(monthly.next_run, date(2025, 4, 1))
+        self.assertFalse(once.active)
+        self.assertEqual(too_big.next_run, self.run_date)
+        self.assertEqual(too_big.last_status, "Insufficient funds")
+        self.assertIsNone(later.last_run)
+
+        again = run_scheduled_payments(self.run_date)
+        self.assertEqual(again["processed"], 0)
+        self.checking.refresh_from_db()
+        self.assertEqual(self.checking.balance, Decimal("1100.00"))
+
+    def test_command_reports_throughput(self):
+        self._schedule("25.00")
+        out = StringIO()
+        call_command("run_scheduled_payments", "--date", "2025-03-01", stdout=out)
+        self.assertIn("paid: 1", out.getvalue())
+
+
+def _train_tiny_credit_model(path):
+    import joblib
+    import pandas as pd
+
+    from .ai_credit.ml import build_pipeline
+    from .ai_credit.services import FEATURE_WHITELIST
+
+    rows = []
+    for i in range(40):
+        rows.append({
+            "loan_amnt": 5000 + i * 500, "term": "36 months", "int_rate": 8 + (i % 10), "annual_inc": 40000 + i * 1000,
+            "dti": 10 + (i % 20), "emp_length": "5 years", "home_ownership": "RENT", "purpose": "car",
+            "open_acc": 5, "revol_bal": 1000 * (i % 7), "total_acc": 12, "delinq_2yrs": i % 2, "pub_rec": 0,
+        })
+    X = pd.DataFrame(rows)[FEATURE_WHITELIST]
+    pipe = build_pipeline().fit(X, [i % 2 for i in range(40)])
+    joblib.dump(pipe, path)
+
+
+class CreditModelRegistryTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        _train_tiny_credit_model(f"{self.tmp}/v1.joblib")
+        self.v1 = CreditModelArtifact.objects.create(version="v1", artifact_path=f"{self.tmp}/v1.joblib")
+
+    @override_settings(CREDIT_MODEL_CHECK_SECONDS=0)
+    def test_loads_once_and_reloads_on_version_change(self):
+        reg = ModelRegistry()
+        self.assertTrue(reg.warm())
+        pipe, artifact = reg.get()
+        self.assertIs(reg.get()[0], pipe)
+        self.assertEqual((artifact.version, reg.load_count), ("v1", 1))
+
+        shutil.copy(f"{self.tmp}/v1.joblib", f"{self.tmp}/v2.joblib")
+        CreditModelArtifact.objects.update(is_active=False)
+        CreditModelArtifact.objects.create(version="v2", artifact_path=f"{self.tmp}/v2.joblib")
+        self.assertEqual(reg.get()[1].version, "v2")
+        self.assertEqual(reg.load_count, 2)
+        self.assertIsNotNone(reg.metrics()["last_load_ms"])
+
+    def test_score_records_latency(self):
+        from .ai_credit import services
+
+        reg = ModelRegistry()
+        services.registry, original = reg, services.registry
+        self.addCleanup(setattr, services, "registry", original)
+
+        out = services.score({"loan_amnt": 12000, "term": "36 months", "annual_inc": 60000})
+        services.score({"loan_amnt": 8000})
+        self.assertEqual(out["model_version"], "v1")
+        metrics = reg.metrics()
+        self.assertEqual((metrics["score_count"], metrics["load_count"]), (2, 1))
+        self.assertIsNotNone(metrics["score_ms_p95"])
+
+
+class CreditBatchScoringTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        _train_tiny_credit_model(f"{self.tmp}/v1.joblib")
+        CreditModelArtifact.objects.create(version="v1", artifact_path=f"{self.tmp}/v1.joblib")
+        credit_registry.invalidate()
+        self.staff = User.objects.create_user(username="ops", password="pass12345", is_staff=True)
+
+    def test_csv_batch_endpoint_bulk_creates(self):
+        from .ai_credit.models import CreditApplication
+
+        body = "loan_amnt,term,annual_inc,dti\n12000,36 months,60000,12\n9000,,not-a-number,\n"
+        self.client.login(username="ops", password="pass12345")
+        resp = self.client.post(reverse("banking:ai_credit_score_batch"), data=body, content_type="text/csv")
+
+        data = resp.json()
+        self.assertTrue(data["ok"])
+        self.assertEqual(data["scored"], 2)
+        self.assertEqual(len(data["results"]), 2)
+        self.assertEqual(CreditApplication.objects.filter(user=self.staff, model_version="v1").count(), 2)
+
+    def test_malformed_json_batch_is_a_400(self):
+        self.client.login(username="ops", password="pass12345")
+        url = reverse("banking:ai_credit_score_batch")
+        for body in ({"applicants": 5}, {"applicants": {"loan_amnt": 1}}, {"applicants": [1, 2]}, [1]):
+            resp = self.client.post(url, data=body, content_type="application/json")
+            self.assertEqual(resp.status_code, 400, body)
+            self.assertFalse(resp.json()["ok"])
+
+    def test_rescore_command(self):
+        from .ai_credit.batch import score_applications
+        from .ai_credit.models import CreditApplication
+
+        score_applications([(self.staff.id, {"loan_amnt": 5000 + i}) for i in range(5)], chunk_size=2)
+        out = StringIO()
+        call_command("score_credit_batch", "--rescore", "--chunk-size", "3", stdout=out)
+        self.assertIn("Scored 5", out.getvalue())
+        self.assertEqual(CreditApplication.objects.count(), 10)
+
+
+class ChunkedCreditTrainingTests(TestCase):
+    def setUp(self):
+        from .ai_credit import services
+
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        services.ARTIFACT_DIR, original = self.tmp, services.ARTIFACT_DIR
+        self.addCleanup(setattr, services, "ARTIFACT_DIR", original)
+        credit_registry.invalidate()
+
+        self.csv_path = f"{self.tmp}/loans.csv"
+        with open(self.csv_path, "w", newline="") as fh:
+            w = csv.writer(fh)
+            w.writerow(["id", "desc", "loan_amnt", "term", "int_rate", "annual_inc", "dti", "emp_length",
+                        "home_ownership", "purpose", "open_acc", "revol_bal", "total_acc", "delinq_2yrs",
+                        "pub_rec", "loan_status"])
+            for i in range(120):
+                bad = i % 3 == 0
+                w.writerow([i, "ignored text", 5000 + 100 * i, "60 months" if bad else "36 months",
+                            f"{20 if bad else 7}.5%", 30000 if bad else 90000, 35 if bad else 8, "2 years",
+                            "RENT" if bad else "MORTGAGE", "debt_consolidation", 4, 2000, 10, 2 if bad else 0,
+                            0, "Charged Off" if bad else "Fully Paid"])
+
+    def test_chunked_training_matches_pipeline_interface(self):
+        from .ai_credit.services import score, train_credit_model
+
+        artifact = train_credit_model(self.csv_path, version="oc1", chunked=True, chunksize=17)
+        m = artifact.metrics
+        self.assertEqual(m["mode"], "chunked")
+        self.assertEqual((m["n_train"], m["n_test"]), (90, 30))
+        self.assertIn("wall_seconds", m)
+        self.assertIn("peak_rss_mb", m)
+        self.assertGreater(m["roc_auc"], 0.9)
+
+        out = score({"loan_amnt": 8000, "term": "36 months", "int_rate": 7.5, "annual_inc": 90000, "dti": 8})
+        self.assertEqual(out["model_version"], "oc1")
+        self.assertLess(out["prob_default"], 0.5)
+
+
+class CreditBridgeTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        _train_tiny_credit_model(f"{self.tmp}/v1.joblib")
+        CreditModelArtifact.objects.create(version="v1", artifact_path=f"{self.tmp}/v1.joblib")
+        credit_registry.invalidate()
+        self.u = User.objects.create_user(username="u1", password="pass12345")
+
+    def test_snapshot_matches_api_and_dedupes_per_session(self):
+        from .ai_auto.credit_bridge import fetch_credit_snapshot
+        from .ai_auto.models import AutoBuyerSession
+        from .ai_credit.models import CreditApplication
+
+        payload = {"loan_amnt": 18000, "annual_inc": 70000, "dti": 14, "term": "60 months", "purpose": "car"}
+        self.client.login(username="u1", password="pass12345")
+        api = self.client.post(reverse("banking:ai_credit_score"), data=payload, content_type="application/json").json()
+
+        session = AutoBuyerSession.objects.create(user=self.u, state={})
+        snap = fetch_credit_snapshot(self.u, payload, session=session)
+        self.assertEqual(snap, api)
+        self.assertEqual(CreditApplication.objects.filter(user=self.u).count(), 2)
+
+        session.credit_snapshot = snap
+        self.assertEqual(fetch_credit_snapshot(self.u, dict(payload), session=session), snap)
+        self.assertEqual(CreditApplication.objects.filter(user=self.u).count(), 2)
+
+        fetch_credit_snapshot(self.u, {**payload, "dti": 30}, session=session)
+        self.assertEqual(CreditApplication.objects.filter(user=self.u).count(), 3)
+
+
+class VehicleCatalogCacheTests(TestCase):
+    def setUp(self):
+        from .ai_auto import inventory
+
+        self.inventory = inventory
+        inventory._local.clear()
+        self.addCleanup(inventory._local.clear)
+
+    def test_fresh_stale_and_offline(self):
+        from .ai_auto.models import CatalogCacheEntry
+
+        inv = self.inventory
+        with mock.patch.object(inv, "fetch_nhtsa_makes", return_value=["Ford", "Honda"]) as fetch:
+            self.assertEqual(inv.nhtsa_makes(), ["Ford", "Honda"])
+            self.assertEqual(inv.nhtsa_makes(), ["Ford", "Honda"])
+        self.assertEqual(fetch.call_count, 1)
+
+        inv._local.clear()
+        CatalogCacheEntry.objects.update(expires_at=timezone.now() - timedelta(minutes=1))
+        with mock.patch.object(inv, "_refresh_in_background") as bg:
+            self.assertEqual(inv.nhtsa_makes(), ["Ford", "Honda"])
+        bg.assert_called_once()
+
+        with mock.patch.object(inv, "fetch_nhtsa_models", side_effect=ConnectionError("down")) as fetch:
+            self.assertEqual(inv.nhtsa_models("Ford", 2022), [])
+            self.assertEqual(inv.nhtsa_models("Ford", 2022), [])
+        self.assertEqual(fetch.call_count, 1)
+        self.assertTrue(CatalogCacheEntry.objects.filter(key="models:ford:2022").exists())
+
+
+class VehicleCatalogIndexTests(TestCase):
+    def setUp(self):
+        from .ai_auto.catalog import index_models, index_trims
+
+        index_trims([
+            {"make": "Toyota", "model": "RAV4", "year": 2022, "trim": "XLE", "body": "Sport Utility Vehicles"},
+            {"make": "Toyota", "model": "RAV4", "year": 2018, "trim": "LE", "body": "Sport Utility Vehicles"},
+            {"make": "Lexus", "model": "RX", "year": 2023, "trim": "350", "body": "Sport Utility Vehicles"},
+            {"make": "Toyota", "model": "Camry", "year": 2021, "trim": "SE", "body": "Midsize Cars"},
+        ])
+        index_models("Toyota", 2022, ["RAV4", "Tacoma"])
+        self.u = User.objects.create_user(username="u1", password="pass12345")
+
+    def test_prefix_search_and_filters(self):
+        from .ai_auto.catalog import filter_catalog, make_suggestions, model_suggestions
+        from .ai_auto.models import VehicleCatalog
+
+        self.assertEqual(VehicleCatalog.objects.count(), 5)
+        self.assertEqual(make_suggestions("to"), ["Toyota"])
+        self.assertEqual(model_suggestions("toyota", "ra"), ["RAV4"])
+        self.assertEqual(VehicleCatalog.objects.get(model="RAV4", year=2022, trim="XLE").body_style, "SUV")
+        self.assertEqual(filter_catalog(body_style="SUV", price_cap=20000).count(), 1)
+
+        self.client.login(username="u1", password="pass12345")
+        resp = self.client.get(reverse("banking:ai_auto_inventory_search"), {"model": "c", "body_style": "Sedan"})
+        self.assertEqual([r["model"] for r in resp.json()["results"]], ["Camry"])
+
+    def test_upsert_is_idempotent_and_trims_replace_model_rows(self):
+        from .ai_auto.catalog import index_models, index_trims
+        from .ai_auto.models import VehicleCatalog
+
+        index_models("Honda", 2022, ["Civic", "Civic"])
+        index_models("Honda", None, ["Civic"])
+        index_models("Honda", None, ["Civic"])
+        self.assertEqual(VehicleCatalog.objects.filter(make_key="honda").count(), 2)
+        self.assertIsNone(VehicleCatalog.objects.get(make_key="honda", year=2022).body_style)
+
+        index_trims([{"make": "Honda", "model": "Civic", "year": 2022, "trim": "EX", "body": "Compact Cars"}] * 2)
+        index_trims([{"make": "Honda", "model": "Civic", "year": 2022, "trim": "EX", "body": "Compact Cars"}])
+        index_models("Honda", 2022, ["Civic"])
+        self.assertEqual(
+            list(VehicleCatalog.objects.filter(make_key="honda", year=2022).values_list("trim", "body_style")),
+            [("EX", "Sedan")],
+        )
+
+    def test_agent_match_ranks_catalog_rows(self):
+        from .ai_auto.agents import agent_match
+
+        result = agent_match("recommend", {"body_style": "SUV", "price_cap_est": 40000})
+        picks = result.payload["recommendations"]
+        self.assertEqual([(p["make"], p["model"]) for p in picks], [("Toyota", "RAV4"), ("Lexus", "RX")])
+        self.assertEqual(picks[0]["year"], 2022)
+
+
+class IntentRouterTests(TestCase):
+    def test_matches_legacy_keyword_loops(self):
+        from .ai_auto.bench import extract, legacy_extract, legacy_route, synthetic_conversations
+        from .ai_auto.intents import route_intent, scan
+
+        edge_cases = ["download the brochure", "new session please", "zip:12345,", "a12345 b", "$2,019 down", "top 36"]
+        messages = [m for c in synthetic_conversations(300) for m in c] + edge_cases
+        for m in messages:
+            self.assertEqual(extract(m), legacy_extract(m), m)
+            for profile in ({}, {"body_style": "SUV", "monthly_target": 500}):
+                self.assertEqual(route_intent(scan(m), bool(profile)), legacy_route(m, profile), m)
+
+    def test_budget_agent_reads_scan(self):
+        from .ai_auto.agents import agent_budget, route
+
+        state = {"monthly_target": 500}
+        self.assertEqual(route("down $3,000, 60 or 72 months, zip 20001", state), "budget")
+        result = agent_budget("down $3,000, 60 or 72 months, zip 20001", state)
+        self.assertEqual(
+            (result.state["down_payment"], result.state["term_months"], result.state["zip_code"]),
+            (3000, 72, "20001"),
+        )
+
+
+@override_settings(
+    BANKING_AI_ENABLED=True,
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class AsyncChatTurnTests(TestCase):
+    def setUp(self):
+        self.u = User.objects.create_user(username="u1", password="pass12345")
+        self.client.login(username="u1", password="pass12345")
+
+    def test_turn_is_one_insert_one_update_and_streams(self):
+        from asgiref.sync import async_to_sync
+        from channels.layers import get_channel_layer
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from .ai_auto.consumers import session_group
+        from .ai_auto.models import AutoBuyerMessage, AutoBuyerSession
+
+        session = AutoBuyerSession.objects.create(user=self.u, state={})
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(session_group(session.id), channel)
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post(
+                reverse("banking:ai_auto_message_api"),
+                data={"text": "I want a used SUV around $450 a month"},
+                content_type="application/json",
+            )
+        data = resp.json()
+        self.assertTrue(data["ok"])
+        sql = [q["sql"].split()[0].upper() for q in ctx.captured_queries]
+        self.assertEqual((sql.count("INSERT"), sql.count("UPDATE")), (1, 1))
+
+        self.assertEqual(
+            list(session.messages.values_list("role", flat=True)), ["user", "assistant"]
+        )
+        session.refresh_from_db()
+        self.assertEqual(session.state, data["state"])
+
+        event = async_to_sync(layer.receive)(channel)
+        self.assertEqual(event["type"], "auto.reply")
+        self.assertEqual(event["payload"]["reply"], data["reply"])
+        self.assertEqual(AutoBuyerMessage.objects.filter(session=session, role="assistant").get().content, data["reply"])
+
+    def test_recommend_persists_form_state(self):
+        from .ai_auto.models import AutoBuyerSession
+
+        resp = self.client.post(
+            reverse("banking:ai_auto_recommend_api"),
+            data={"monthly_target": 500, "down_payment": 3000, "body_style": "SUV", "term_months": 60},
+            content_type="application/json",
+        )
+        self.assertTrue(resp.json()["ok"])
+        session = AutoBuyerSession.objects.get(user=self.u)
+        self.assertEqual(session.state["price_cap_est"], 25500)
+        self.assertEqual(session.messages.count(), 2)
+        self.assertEqual(self.client.get(reverse("banking:ai_auto_recommend_api")).status_code, 405)
+
+    def test_login_required_and_page_subscribes_to_replies(self):
+        page = self.client.get(reverse("banking:ai_auto"))
+        self.assertContains(page, "/ws/ai-auto/session/")
+
+        self.client.logout()
+        resp = self.client.post(reverse("banking:ai_auto_message_api"), data={"text": "hi"},
+                                content_type="application/json")
+        self.assertEqual(resp.status_code, 302)
+        self.assertTrue(resp["Location"].startswith(resolve_url(settings.LOGIN_URL)))
+
+
+@override_settings(BANKING_AI_ENABLED=True)
+class DocumentRenderTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.u = User.objects.create_user(username="u1", password="pass12345")
+        self.client.login(username="u1", password="pass12345")
+
+    def test_buyer_plan_pdf_renders_once_per_content(self):
+        from .ai_auto.models import AutoBuyerSession, BuyerPlan, BuyerPlanVehicle
+
+        session = AutoBuyerSession.objects.create(user=self.u, state={})
+        plan = BuyerPlan.objects.create(user=self.u, session=session, title="Plan", checklist=["one", "two"])
+        url = reverse("banking:ai_auto_buyer_plan_pdf")
+
+        with mock.patch("banking.services.documents.render", wraps=documents.render) as render:
+            first = b"".join(self.client.get(url).streaming_content)
+            second = b"".join(self.client.get(url).streaming_content)
+            self.assertEqual(render.call_count, 1)
+            self.assertEqual(first, second)
+            self.assertTrue(first.startswith(b"%PDF"))
+
+            BuyerPlanVehicle.objects.create(plan=plan, make="Honda", model="CR-V", year=2022, price=31000)
+            self.client.get(url)
+            self.assertEqual(render.call_count, 2)
+        self.assertEqual(len(os.listdir(f"{self.media}/documents/buyer_plan")), 1)
+
+    def test_long_document_breaks_pages_and_benchmarks(self):
+        r = documents.run_benchmark(pages=3, repeat=1)
+        self.assertEqual(r["pages"], 3)
+        self.assertGreater(r["pages_per_second"], 0)
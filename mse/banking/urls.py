@@ -10,12 +10,14 @@ urlpatterns = [
     path("accounts/", views.accounts, name="accounts"),
     path("accounts/<str:public_id>/", views.account_detail, name="account_detail"),
     path("accounts/<str:public_id>/export.csv", views.export_transactions_csv, name="export_csv"),
+    path("accounts/<str:public_id>/transactions.json", views.account_transactions_api, name="account_transactions_api"),
     path("transfer/", views.transfer, name="transfer"),
     path("billpay/", views.billpay, name="billpay"),
     path("cards/", views.cards, name="cards"),
     path("settings/", views.quick_cash, name="quick_cash"),
     path("scheduled/", views.scheduled_payments, name="scheduled"),
     path("statements/", views.statements, name="statements"),
+    path("statements/<int:statement_id>/download/", views.statement_download, name="statement_download"),
     path("cards/activity/", views.card_activity, name="card_activity"),
     path("spending/", views.spending, name="spending"),
     path("ai-auto/", include("banking.ai_auto.urls")),
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from decimal import Decimal
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.db.models import Sum
-from django.http import Http404, HttpResponse
+from django.http import FileResponse, Http404, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from .forms import BillPayForm, DepositForm, PayeeForm, TransferForm, WithdrawalForm
@@ -14,7 +15,12 @@ from .models import ScheduledPayment
 from .forms import ScheduledPaymentForm
 from datetime import date
 from .models import Statement
-from .services.statements import generate_statement
+from .services.statement_runs import RENDERED, month_bounds, render_statement
+from .tasks import render_statement_task
+from .services.snapshots import outflow_since
+from .services.exports import export_queryset, gzip_stream, iter_arrow, iter_csv
+from .services.rollups import category_breakdown, top_merchants
+from .services.search import page_transactions
 from .services import deposit, withdraw, pay_bill
 
 
@@ -39,17 +45,8 @@ def dashboard(request):
         .order_by("-created_at")[:12]
     )
 
-    # Simple spend aggregation (last 30 days)
-    start = timezone.now() - timezone.timedelta(days=30)
-    spend = (
-        Transaction.objects.filter(
-            account__user=request.user,
-            created_at__gte=start,
-            txn_type__in=["WITHDRAWAL", "BILLPAY", "CARD", "TRANSFER_OUT"],
-        )
-        .aggregate(s=Sum("amount"))["s"]
-        or Decimal("0.00")
-    )
+    # Spend over the last 30 days, read from the daily snapshots
+    spend = outflow_since(request.user, timezone.localdate() - timezone.timedelta(days=30))
 
     ctx = {
         "accounts": accounts,
@@ -69,18 +66,52 @@ def accounts(request):
 @login_required
 def account_detail(request, public_id: str):
     account = _user_account_or_404(request.user, public_id)
-    qs = Transaction.objects.filter(account=account).select_related("payee", "related_account")
 
-    # Filters
     t = request.GET.get("t", "").strip()
     q = request.GET.get("q", "").strip()
-    if t:
-        qs = qs.filter(txn_type=t)
-    if q:
-        qs = qs.filter(memo__icontains=q) | qs.filter(merchant__icontains=q)
+    txns, next_cursor = page_transactions(account, txn_type=t, q=q, cursor=request.GET.get("cursor", ""), limit=80)
 
-    txns = qs[:80]
-    return render(request, "banking/account_detail.html", {"account": account, "txns": txns})
+    return render(
+        request,
+        "banking/account_detail.html",
+        {"account": account, "txns": txns, "next_cursor": next_cursor},
+    )
+
+
+@login_required
+def account_transactions_api(request, public_id: str):
+    """
+    Infinite-scroll feed for account_detail.
+    Query params: t, q, cursor (from the previous page), limit (max 200).
+    """
+    account = _user_account_or_404(request.user, public_id)
+
+    limit_raw = request.GET.get("limit", "")
+    limit = int(limit_raw) if limit_raw.isdigit() else 50
+
+    txns, next_cursor = page_transactions(
+        account,
+        txn_type=request.GET.get("t", "").strip(),
+        q=request.GET.get("q", "").strip(),
+        cursor=request.GET.get("cursor", ""),
+        limit=limit,
+    )
+
+    results = [
+        {
+            "id": x.id,
+            "created_at": x.created_at.isoformat(),
+            "txn_type": x.txn_type,
+            "status": x.status,
+            "amount": str(x.amount),
+            "title": (x.payee.name if x.payee else "") or x.memo or x.txn_type,
+            "memo": x.memo,
+            "merchant": x.merchant,
+            "related_account": x.related_account.public_id if x.related_account else "",
+        }
+        for x in txns
+    ]
+    return JsonResponse({"ok": True, "results": results, "next_cursor": next_cursor})
 
 
 @login_required
@@ -199,28 +230,47 @@ def cards(request):
 
 @login_required
 def export_transactions_csv(request, public_id: str):
+    """
+    Streamed transaction export.
+    Query params:
+      - start / end: YYYY-MM-DD (inclusive), default = full history
+      - limit: optional row cap
+      - format: csv (default) | parquet | arrow
+      - gzip: 1 to gzip the stream
+    """
     account = _user_account_or_404(request.user, public_id)
-    txns = Transaction.objects.filter(account=account).select_related("payee", "related_account").order_by("-created_at")[:500]
-
-    lines = ["date,type,status,amount,memo,merchant,payee,related_account"]
-    for t in txns:
-        lines.append(
-            ",".join(
-                [
-                    t.created_at.strftime("%Y-%m-%d %H:%M"),
-                    t.txn_type,
-                    t.status,
-                    f"{t.amount}",
-                    (t.memo or "").replace(",", " "),
-                    (t.merchant or "").replace(",", " "),
-                    (t.payee.name if t.payee else "").replace(",", " "),
-                    (t.related_account.public_id if t.related_account else ""),
-                ]
-            )
-        )
-    data = "\n".join(lines)
-    resp = HttpResponse(data, content_type="text/csv")
-    resp["Content-Disposition"] = f'attachment; filename="{account.public_id}_transactions.csv"'
+
+    try:
+        start = date.fromisoformat(request.GET["start"]) if request.GET.get("start") else None
+        end = date.fromisoformat(request.GET["end"]) if request.GET.get("end") else None
+    except ValueError:
+        return HttpResponseBadRequest("start/end must be YYYY-MM-DD.")
+
+    limit_raw = request.GET.get("limit", "")
+    limit = int(limit_raw) if limit_raw.isdigit() and int(limit_raw) > 0 else None
+
+    fmt = (request.GET.get("format") or "csv").lower()
+    if fmt not in {"csv", "parquet", "arrow"}:
+        return HttpResponseBadRequest("format must be csv, parquet or arrow.")
+
+    qs = export_queryset(account, start=start, end=end, limit=limit)
+
+    if fmt == "csv":
+        stream, content_type, ext = iter_csv(qs), "text/csv", "csv"
+    else:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return HttpResponseBadRequest("Parquet/Arrow export requires pyarrow.")
+        stream = iter_arrow(qs, fmt=fmt)
+        content_type = "application/vnd.apache.parquet" if fmt == "parquet" else "application/vnd.apache.arrow.stream"
+        ext = fmt
+
+    if request.GET.get("gzip") == "1":
+        stream, content_type, ext = gzip_stream(stream), "application/gzip", f"{ext}.gz"
+
+    resp = StreamingHttpResponse(stream, content_type=content_type)
+    resp["Content-Disposition"] = f'attachment; filename="{account.public_id}_transactions.{ext}"'
     return resp
 
 
@@ -283,25 +333,26 @@ def scheduled_payments(request):
 @login_required
 def statements(request):
     accounts = BankAccount.objects.filter(user=request.user)
-    statements = Statement.objects.filter(account__user=request.user)
+    statements = Statement.objects.filter(account__user=request.user).select_related("account")
 
     if request.method == "POST":
         account_id = request.POST.get("account")
-        month = request.POST.get("month")
+        month = request.POST.get("month", "")
 
         account = get_object_or_404(BankAccount, id=account_id, user=request.user)
-        month_date = date.fromisoformat(month + "-01")
-
-        pdf = generate_statement(account, month_date)
-
-        stmt, _ = Statement.objects.get_or_create(
-            account=account,
-            month=month_date,
-        )
-        stmt.pdf.save(f"{account.public_id}_{month}.pdf", pdf)
-        stmt.save()
-
-        messages.success(request, "Statement generated.")
+        try:
+            month_bounds(month)
+        except ValueError:
+            messages.error(request, "Choose a valid month.")
+            return redirect("banking:statements")
+
+        if getattr(settings, "BANKING_STATEMENTS_ASYNC", False):
+            render_statement_task.delay(account.id, month)
+            messages.success(request, "Statement queued. It will appear below shortly.")
+        elif render_statement(account.id, month) == RENDERED:
+            messages.success(request, "Statement generated.")
+        else:
+            messages.success(request, "Statement is already up to date.")
         return redirect("banking:statements")
 
     return render(
@@ -310,6 +361,15 @@ def statements(request):
         {"accounts": accounts, "statements": statements},
     )
 
+
+@login_required
+def statement_download(request, statement_id: int):
+    stmt = get_object_or_404(Statement, id=statement_id, account__user=request.user)
+    if not stmt.pdf_file:
+        raise Http404("Statement has not been rendered yet.")
+    filename = f"{stmt.account.public_id}_{stmt.period_start:%Y-%m}.pdf"
+    return FileResponse(stmt.pdf_file.open("rb"), as_attachment=True, filename=filename, content_type="application/pdf")
+
 @login_required
 def card_activity(request):
     txns = Transaction.objects.filter(
@@ -324,15 +384,26 @@ def card_activity(request):
     )
 @login_required
 def spending(request):
-    data = (
-        Transaction.objects.filter(account__user=request.user)
-        .values("merchant")
-        .annotate(total=Sum("amount"))
-        .order_by("-total")
-    )
+    """
+    Top merchants + category split for a window, read from MerchantSpendRollup.
+    Query params: months (1-24, default 3), top (default 10).
+    """
+    months_raw = request.GET.get("months", "3")
+    months = max(1, min(int(months_raw), 24)) if months_raw.isdigit() else 3
+    top_raw = request.GET.get("top", "10")
+    top = max(1, min(int(top_raw), 50)) if top_raw.isdigit() else 10
+
+    since = timezone.localdate().replace(day=1)
+    for _ in range(months - 1):
+        since = (since - timezone.timedelta(days=1)).replace(day=1)
 
     return render(
         request,
         "banking/spending.html",
-        {"data": data},
+        {
+            "data": top_merchants(request.user, since, limit=top),
+            "categories": category_breakdown(request.user, since),
+            "months": months,
+            "since": since,
+        },
     )
@@ -3,16 +3,20 @@ from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 
-import pipeline.routing
-
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mse.settings")
 
 django_asgi_app = get_asgi_application()
 
+# consumers import models, so routing loads after the app registry is ready
+import banking.ai_auto.routing  # noqa: E402
+import pipeline.routing  # noqa: E402
+
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
     "websocket": AuthMiddlewareStack(
-        URLRouter(pipeline.routing.websocket_urlpatterns)
+        URLRouter(
+            pipeline.routing.websocket_urlpatterns
+            + banking.ai_auto.routing.websocket_urlpatterns
+        )
     ),
 })
-
@@ -59,6 +59,46 @@ if REDIS_URL:
 else:
     CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
 
+# Cache shared by every worker (mystics_site API responses are versioned per season
+# and invalidated by mystics_sync). Redis when REDIS_URL is set (needs the `redis`
+# package), else a file cache on local disk; CACHE_DIR overrides its location.
+# "versions" holds only those per-season version counters (a handful of keys, no
+# expiry), kept apart so response-cache culling can never evict them.
+CACHE_DIR = os.getenv("CACHE_DIR", str(BASE_DIR / ".django_cache"))
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "mse",
+        },
+        "versions": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "mse-versions",
+            "TIMEOUT": None,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_DIR,
+            "KEY_PREFIX": "mse",
+            "OPTIONS": {"MAX_ENTRIES": 5000},
+        },
+        "versions": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.path.join(CACHE_DIR, "versions"),
+            "KEY_PREFIX": "mse",
+            "TIMEOUT": None,
+            "OPTIONS": {"MAX_ENTRIES": 1_000_000},
+        },
+    }
+
+# Tests run against in-memory caches only (see mse/test_runner.py).
+TEST_RUNNER = "mse.test_runner.LocMemCacheRunner"
+
 # Database
 DATABASES = {
     "default": {
@@ -121,10 +161,17 @@ USE_TZ = True
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+
+# Uploaded / generated files (statement PDFs)
+MEDIA_URL = "/media/"
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", str(BASE_DIR / "media"))
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Secrets / External APIs (ENV ONLY)
 BALLDONTLIE_API_KEY = os.getenv("BALLDONTLIE_API_KEY", "")
+# requests/minute of the BallDontLie plan (free 5, ALL-STAR 60, GOAT 600) and fetch concurrency
+BALLDONTLIE_RATE_PER_MINUTE = int(os.getenv("BALLDONTLIE_RATE_PER_MINUTE", "60"))
+BALLDONTLIE_MAX_WORKERS = int(os.getenv("BALLDONTLIE_MAX_WORKERS", "4"))
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
 # Email (ENV ONLY)
@@ -155,6 +202,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "analytics.tasks.refresh_mystics_data",
         "schedule": 15 * 60,
     },
+    "run_scheduled_payments_hourly": {
+        "task": "banking.tasks.run_scheduled_payments_task",
+        "schedule": 60 * 60,
+    },
 }
 
 # Pipeline defaults (dbt)
@@ -168,3 +219,8 @@ PREFECT_HTTP_TIMEOUT = os.getenv("PREFECT_HTTP_TIMEOUT", "10")
 
 
 BANKING_AI_ENABLED = True
+# Credit model registry: how often to re-check the active artifact, and whether to load it at startup
+CREDIT_MODEL_CHECK_SECONDS = int(os.getenv("CREDIT_MODEL_CHECK_SECONDS", "30"))
+CREDIT_MODEL_PRELOAD = os.getenv("CREDIT_MODEL_PRELOAD", "False") == "True"
+# Render statements on Celery instead of inside the request
+BANKING_STATEMENTS_ASYNC = os.getenv("BANKING_STATEMENTS_ASYNC", "False") == "True"
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Sum
+
+from mystics_site.models import PlayerStat, TeamStat
+
+COUNTING = ["fgm", "fga", "fg3m", "fg3a", "ftm", "fta", "oreb", "dreb", "reb", "ast", "stl", "blk"]
+TEAM_STAT_FIELDS = COUNTING + ["fg_pct", "fg3_pct", "ft_pct", "turnovers", "fouls"]
+GAME_CHUNK = 500
+
+
+def _pct(made: Optional[int], att: Optional[int]) -> Optional[float]:
+    return round(made / att, 3) if made is not None and att else None
+
+
+def rebuild_team_stats(game_ids: Iterable[int]) -> int:
+    """
+    Upsert TeamStat for `game_ids` (Game pks) from the stored PlayerStat
+    lines: one grouped SUM per chunk of games, one bulk write. Returns rows written.
+    """
+    game_ids = sorted(set(game_ids))
+    rows: List[TeamStat] = []
+    for i in range(0, len(game_ids), GAME_CHUNK):
+        totals = (
+            PlayerStat.objects.filter(game_id__in=game_ids[i:i + GAME_CHUNK])
+            .values("game_id", "team_id")
+            .annotate(**{f: Sum(f) for f in COUNTING}, turnovers=Sum("turnover"), fouls=Sum("pf"))
+        )
+        for t in totals:
+            rows.append(TeamStat(
+                **t,
+                fg_pct=_pct(t["fgm"], t["fga"]),
+                fg3_pct=_pct(t["fg3m"], t["fg3a"]),
+                ft_pct=_pct(t["ftm"], t["fta"]),
+            ))
+
+    with transaction.atomic():
+        TeamStat.objects.bulk_create(
+            rows,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["game", "team"],
+            update_fields=TEAM_STAT_FIELDS,
+        )
+    return len(rows)
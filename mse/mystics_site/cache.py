@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from functools import wraps
+from typing import Callable, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.http import HttpRequest, HttpResponse
+
+# Response cache for the mystics_site APIs. Keys carry a per-season version
+# stored in the shared cache; mystics_sync bumps it, so every worker stops
+# serving the old season at once instead of waiting out the timeout.
+# Endpoints not tied to one season use the "all" scope, bumped by every sync.
+# Versions live in their own cache alias ("versions"), out of reach of the
+# response cache's culling; a version that is lost anyway restarts from the
+# clock, never from a number whose responses may still be cached. Versions
+# never expire; bump() rewrites them rather than relying on incr.
+
+VERSION_KEY = "mystics_site:version:{}"
+VERSION_CACHE = "versions"
+ALL = "all"
+
+
+def _versions():
+    return caches[VERSION_CACHE] if VERSION_CACHE in settings.CACHES else cache
+
+
+def _fresh_version() -> int:
+    return time.time_ns() // 1000
+
+
+def version(scope) -> int:
+    store = _versions()
+    key = VERSION_KEY.format(scope)
+    v = store.get(key)
+    if v is None:
+        store.add(key, _fresh_version(), None)
+        v = store.get(key) or _fresh_version()
+    return int(v)
+
+
+def bump(seasons: Iterable[int] = ()) -> None:
+    """Invalidate cached responses for `seasons` and for every all-season endpoint."""
+    store = _versions()
+    for scope in [*seasons, ALL]:
+        key = VERSION_KEY.format(scope)
+        # A plain set with no expiry: the backends' incr is not atomic
+        # everywhere and FileBasedCache's re-arms the default timeout. The
+        # clock keeps concurrent bumps from landing on the same version.
+        store.set(key, max(int(store.get(key) or 0) + 1, _fresh_version()), None)
+
+
+def season_cached(timeout: int = 60 * 10, season_of: Optional[Callable[[HttpRequest], int]] = None):
+    """
+    cache_page replacement: caches 200 GET responses under a key versioned by
+    the request's season (season_of(request)) or the "all" scope.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request: HttpRequest, *args, **kwargs):
+            if request.method != "GET":
+                return view(request, *args, **kwargs)
+
+            scope = season_of(request) if season_of else ALL
+            path = hashlib.md5(request.get_full_path().encode("utf-8")).hexdigest()
+            key = f"mystics_site:{view.__name__}:{scope}:v{version(scope)}:{path}"
+
+            hit = cache.get(key)
+            if hit is not None:
+                return HttpResponse(hit[1], content_type=hit[0])
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                cache.set(key, (response["Content-Type"], response.content), timeout)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+
+from mystics_site.models import Game, TeamGameLine
+
+LINE_FIELDS = ["opponent", "season", "date_utc", "is_home", "points_for", "points_against"]
+
+
+def lines_for_games(games: Iterable[dict]) -> List[TeamGameLine]:
+    """Both sides of each game (dicts from Game.values())."""
+    out: List[TeamGameLine] = []
+    for g in games:
+        for team, opp, pf, pa, home in (
+            (g["home_team_id"], g["visitor_team_id"], g["home_score"], g["away_score"], True),
+            (g["visitor_team_id"], g["home_team_id"], g["away_score"], g["home_score"], False),
+        ):
+            out.append(TeamGameLine(
+                team_id=team,
+                game_id=g["id"],
+                opponent_id=opp,
+                season=g["season"],
+                date_utc=g["date_utc"],
+                is_home=home,
+                points_for=pf,
+                points_against=pa,
+            ))
+    return out
+
+
+def rebuild_game_lines(season: int) -> int:
+    """
+    Upsert the season's TeamGameLine rows from Game (one read, one bulk write)
+    and drop lines whose game no longer has that team. Returns lines written.
+    """
+    games = Game.objects.filter(season=season).values(
+        "id", "season", "date_utc", "home_team_id", "visitor_team_id", "home_score", "away_score"
+    )
+    lines = lines_for_games(games)
+
+    with transaction.atomic():
+        TeamGameLine.objects.bulk_create(
+            lines,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["team", "game"],
+            update_fields=LINE_FIELDS,
+        )
+        keep = {(ln.team_id, ln.game_id) for ln in lines}
+        stale = [
+            pk for pk, team, game in
+            TeamGameLine.objects.filter(season=season).values_list("id", "team_id", "game_id")
+            if (team, game) not in keep
+        ]
+        TeamGameLine.objects.filter(id__in=stale).delete()
+    return len(lines)
+
+
+def team_series(season: int, team_ids: Optional[Iterable[int]] = None) -> Dict[int, List[tuple]]:
+    """
+    {team_id: [(date_utc, points_for, points_against), ...]} in date order:
+    every team's season (or just `team_ids`) from one indexed read.
+    """
+    qs = TeamGameLine.objects.filter(season=season, date_utc__isnull=False)
+    if team_ids is not None:
+        qs = qs.filter(team_id__in=list(team_ids))
+    out: Dict[int, List[tuple]] = {}
+    for team_id, date_utc, pf, pa in qs.order_by("team_id", "date_utc").values_list(
+        "team_id", "date_utc", "points_for", "points_against"
+    ):
+        out.setdefault(team_id, []).append((date_utc, pf, pa))
+    return out
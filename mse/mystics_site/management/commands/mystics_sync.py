@@ -3,14 +3,143 @@ from __future__ import annotations
 import time
 
 from django.core.management.base import BaseCommand
+from django.db.models import Q
 from django.utils.dateparse import parse_datetime
 
+from analytics.services import sync_state
+from analytics.services.bulk_upsert import UpsertResult, bulk_upsert
+from mystics_site.box_scores import rebuild_team_stats
+from mystics_site.cache import bump as bump_cache
+from mystics_site.game_lines import rebuild_game_lines
 from mystics_site.models import Team, Player, Game, PlayerStat
-from mystics_site.services import get_json, paged, APIError
+from mystics_site.season_lines import refresh_season_lines
+from mystics_site.services import MAX_WORKERS, APIError, chunked_pages, get_json, limiter, pages
+
+TEAM_FIELDS = ["conference", "city", "name", "full_name", "abbreviation"]
+PLAYER_FIELDS = [
+    "team_id", "first_name", "last_name", "position", "position_abbreviation",
+    "height", "weight", "jersey_number", "college", "age", "headshot_url",
+]
+GAME_FIELDS = [
+    "date_utc", "season", "postseason", "status", "period", "time",
+    "home_team_id", "visitor_team_id", "home_score", "away_score",
+]
+STAT_FIELDS = [
+    "min", "fgm", "fga", "fg3m", "fg3a", "ftm", "fta", "oreb", "dreb", "reb",
+    "ast", "stl", "blk", "turnover", "pf", "pts", "plus_minus",
+]
+
+
+def team_row(t: dict) -> dict:
+    return {"api_id": t["id"], **{f: t.get(f) or "" for f in TEAM_FIELDS}}
+
+
+def player_row(p: dict, team_ids: dict) -> dict:
+    return {
+        "api_id": p["id"],
+        "team_id": team_ids.get((p.get("team") or {}).get("id")),
+        **{f: p.get(f) or "" for f in PLAYER_FIELDS if f not in ("team_id", "age")},
+        "age": p.get("age"),
+    }
+
+
+def game_row(g: dict, team_ids: dict, season: int):
+    ht = team_ids.get((g.get("home_team") or {}).get("id"))
+    vt = team_ids.get((g.get("visitor_team") or {}).get("id"))
+    if not ht or not vt:
+        return None
+
+    home_score = g.get("home_score") if g.get("home_score") is not None else g.get("home_team_score")
+    away_score = (
+        g.get("away_score")
+        if g.get("away_score") is not None
+        else g.get("visitor_score")
+        if g.get("visitor_score") is not None
+        else g.get("visitor_team_score")
+    )
+    return {
+        "api_id": g["id"],
+        "date_utc": parse_datetime(g.get("date") or ""),
+        "season": g.get("season") or season,
+        "postseason": bool(g.get("postseason")),
+        "status": g.get("status") or "",
+        "period": g.get("period"),
+        "time": g.get("time") or "",
+        "home_team_id": ht,
+        "visitor_team_id": vt,
+        "home_score": home_score,
+        "away_score": away_score,
+    }
+
+
+def stat_row(s: dict, game_ids: dict, team_ids: dict, player_ids: dict):
+    game = game_ids.get((s.get("game") or {}).get("id"))
+    team = team_ids.get((s.get("team") or {}).get("id"))
+    player = player_ids.get((s.get("player") or {}).get("id"))
+    if not game or not team or not player:
+        return None
+    values = {f: s.get(f) for f in STAT_FIELDS}
+    values["min"] = s.get("min") or ""
+    if values["turnover"] is None:
+        values["turnover"] = s.get("turnovers")
+    return PlayerStat(game_id=game, team_id=team, player_id=player, **values)
+
+
+def upsert_stats(stats) -> int:
+    """One INSERT … ON CONFLICT (game, player, team) DO UPDATE for a page of box-score lines."""
+    unique = {(s.game_id, s.player_id, s.team_id): s for s in stats}
+    if unique:
+        PlayerStat.objects.bulk_create(
+            list(unique.values()),
+            update_conflicts=True,
+            unique_fields=["game", "player", "team"],
+            update_fields=STAT_FIELDS,
+        )
+    return len(unique)
+
+
+class Step:
+    """Pages, rows, API calls, limiter waits and wall time for one sync step."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pages = 0
+        self.rows = 0
+        self.result = UpsertResult()
+        self._start = time.perf_counter()
+        self._limiter = limiter.snapshot()
+        self.seconds = 0.0
+        self.calls = 0
+        self.waited = 0.0
+
+    def add(self, rows: int, result: UpsertResult | None = None) -> None:
+        self.pages += 1
+        self.rows += rows
+        if result is not None:
+            self.result.inserted += result.inserted
+            self.result.updated += result.updated
+            self.result.unchanged += result.unchanged
+
+    def finish(self) -> "Step":
+        now = limiter.snapshot()
+        self.seconds = time.perf_counter() - self._start
+        self.calls = now["calls"] - self._limiter["calls"]
+        self.waited = now["waited"] - self._limiter["waited"]
+        return self
+
+    @property
+    def rate(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<8} {self.rows:>6} rows  {self.pages:>4} pages  {self.calls:>4} calls  "
+            f"{self.seconds:>7.1f}s  ({self.waited:.1f}s waiting)  {self.rate:>7.1f} rows/s"
+        )
 
 
 class Command(BaseCommand):
-    help = "Sync WNBA teams, players, games, and SAFE Mystics-only stats (BALLDONTLIE)."
+    help = "Sync WNBA teams, players, games, and Mystics (or league-wide) player stats (BALLDONTLIE)."
 
     def add_arguments(self, parser):
         parser.add_argument("--season", type=int, default=2025)
@@ -19,14 +148,45 @@ class Command(BaseCommand):
         parser.add_argument("--no-players", action="store_true", default=False)
         parser.add_argument("--no-games", action="store_true", default=False)
         parser.add_argument("--no-stats", action="store_true", default=False)
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            default=False,
+            help="Skip unchanged teams, players synced in the last 6h, games before the watermark, "
+            "and finished games that already have stats.",
+        )
+        parser.add_argument(
+            "--stats-scope",
+            choices=["games", "team", "league"],
+            default="games",
+            help="games: both box scores of Mystics games (game_ids[]); team: Mystics lines only "
+            "(team_ids[]); league: every game of the season.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=MAX_WORKERS,
+            help="Concurrent game_ids[] chunks for --stats-scope league.",
+        )
+
+    def progress(self, step: Step, rows: int, result: UpsertResult | None = None) -> None:
+        step.add(rows, result)
+        if self.verbosity >= 2:
+            self.stdout.write(f"  {step.name} page {step.pages}: {rows} rows ({step.rows} so far)")
 
     def handle(self, *args, **opts):
         season = opts["season"]
+        self.verbosity = opts.get("verbosity", 1)
 
         do_teams = not opts["no_teams"]
         do_players = not opts["no_players"]
         do_games = not opts["no_games"]
         do_stats = not opts["no_stats"]
+        incremental = opts["incremental"]
+
+        started = time.perf_counter()
+        before = limiter.snapshot()
+        steps = []
 
         try:
             # --------------------
@@ -34,164 +194,129 @@ class Command(BaseCommand):
             # --------------------
             if do_teams:
                 self.stdout.write("Syncing teams…")
+                step = Step("teams")
+                state = sync_state.load("mystics:teams")
                 payload = get_json("/teams")
-                for t in payload.get("data", []):
-                    Team.objects.update_or_create(
-                        api_id=t["id"],
-                        defaults={
-                            "conference": t.get("conference") or "",
-                            "city": t.get("city") or "",
-                            "name": t.get("name") or "",
-                            "full_name": t.get("full_name") or "",
-                            "abbreviation": t.get("abbreviation") or "",
-                        },
-                    )
-                self.stdout.write(self.style.SUCCESS("Teams synced."))
+                digest = sync_state.payload_hash(payload.get("data", []))
+                if incremental and digest == state.response_hash:
+                    payload = {}
+                rows = [team_row(t) for t in payload.get("data", [])]
+                self.progress(step, len(rows), bulk_upsert(Team, rows, TEAM_FIELDS, key="api_id"))
+                sync_state.save(state, calls=1, response_hash=digest)
+                steps.append(step.finish())
+                self.stdout.write(self.style.SUCCESS(f"Teams synced: {step.result}."))
 
             # --------------------
             # PLAYERS
             # --------------------
-            if do_players:
+            players_state = sync_state.load("mystics:players")
+            if do_players and incremental and sync_state.is_fresh(players_state, sync_state.PLAYERS_REFRESH):
+                self.stdout.write("Players synced recently; skipping.")
+            elif do_players:
                 self.stdout.write("Syncing active players…")
-                team_map = {t.api_id: t for t in Team.objects.all()}
-
-                for p in paged("/players", params={"active": "true"}, per_page=25):
-                    team = None
-                    tid = (p.get("team") or {}).get("id")
-                    if tid:
-                        team = team_map.get(tid) or Team.objects.filter(api_id=tid).first()
-                        if team:
-                            team_map[tid] = team
-
-                    Player.objects.update_or_create(
-                        api_id=p["id"],
-                        defaults={
-                            "team": team,
-                            "first_name": p.get("first_name") or "",
-                            "last_name": p.get("last_name") or "",
-                            "position": p.get("position") or "",
-                            "position_abbreviation": p.get("position_abbreviation") or "",
-                            "height": p.get("height") or "",
-                            "weight": p.get("weight") or "",
-                            "jersey_number": p.get("jersey_number") or "",
-                            "college": p.get("college") or "",
-                            "age": p.get("age"),
-                            "headshot_url": p.get("headshot_url") or "",
-                        },
-                    )
-
-                    time.sleep(0.25)
-
-                self.stdout.write(self.style.SUCCESS("Players synced."))
+                step = Step("players")
+                team_ids = dict(Team.objects.values_list("api_id", "id"))
+
+                for page in pages("/players", params={"active": "true"}):
+                    rows = [player_row(p, team_ids) for p in page]
+                    self.progress(step, len(rows), bulk_upsert(Player, rows, PLAYER_FIELDS, key="api_id"))
+
+                sync_state.save(players_state, calls=step.finish().calls)
+                steps.append(step)
+                self.stdout.write(self.style.SUCCESS(f"Players synced: {step.result}."))
 
             # --------------------
             # GAMES
             # --------------------
             if do_games:
                 self.stdout.write(f"Syncing games for season {season}…")
-                team_map = {t.api_id: t for t in Team.objects.all()}
-
-                for g in paged("/games", params={"seasons[]": season}, per_page=25):
-                    ht_id = (g.get("home_team") or {}).get("id")
-                    vt_id = (g.get("visitor_team") or {}).get("id")
-                    if not ht_id or not vt_id:
-                        continue
-
-                    ht = team_map.get(ht_id)
-                    vt = team_map.get(vt_id)
-                    if not ht or not vt:
-                        continue
-
-                    home_score = (
-                        g.get("home_score")
-                        if g.get("home_score") is not None
-                        else g.get("home_team_score")
-                    )
-                    away_score = (
-                        g.get("away_score")
-                        if g.get("away_score") is not None
-                        else g.get("visitor_score")
-                        if g.get("visitor_score") is not None
-                        else g.get("visitor_team_score")
-                    )
-
-                    Game.objects.update_or_create(
-                        api_id=g["id"],
-                        defaults={
-                            "date_utc": parse_datetime(g.get("date") or ""),
-                            "season": g.get("season") or season,
-                            "postseason": bool(g.get("postseason")),
-                            "status": g.get("status") or "",
-                            "period": g.get("period"),
-                            "time": g.get("time") or "",
-                            "home_team": ht,
-                            "visitor_team": vt,
-                            "home_score": home_score,
-                            "away_score": away_score,
-                        },
-                    )
-
-                    time.sleep(0.25)
-
-                self.stdout.write(self.style.SUCCESS("Games synced."))
+                step = Step("games")
+                team_ids = dict(Team.objects.values_list("api_id", "id"))
+
+                games_state = sync_state.load(f"mystics:games:{season}")
+                params = {"seasons[]": season}
+                if incremental and games_state.last_date:
+                    params["start_date"] = games_state.last_date.date().isoformat()
+                    self.stdout.write(f"  from watermark {params['start_date']}")
+
+                for page in pages("/games", params=params):
+                    rows = [r for r in (game_row(g, team_ids, season) for g in page) if r]
+                    self.progress(step, len(rows), bulk_upsert(Game, rows, GAME_FIELDS, key="api_id"))
+
+                sync_state.save(games_state, calls=step.finish().calls, last_date=sync_state.watermark(Game.objects.filter(season=season), "date_utc"))
+                steps.append(step)
+                lines = rebuild_game_lines(season)
+                self.stdout.write(self.style.SUCCESS(f"Games synced: {step.result} ({lines} team game lines)."))
 
             # --------------------
-            # SAFE MYSTICS-ONLY PLAYER STATS
+            # PLAYER STATS (filtered server-side)
             # --------------------
             if do_stats:
-                self.stdout.write(f"Syncing Mystics-only player stats for {season}…")
+                scope = opts["stats_scope"]
+                self.stdout.write(f"Syncing {scope} player stats for {season}…")
 
                 mystics = Team.objects.filter(full_name="Washington Mystics").first() or Team.objects.filter(
                     full_name__icontains="Mystics"
                 ).first()
 
-                if not mystics:
+                if not mystics and scope != "league":
                     self.stdout.write(self.style.ERROR("Mystics team not found."))
                     return
 
-                games = (
-                    Game.objects.filter(season=season, home_team=mystics)
-                    | Game.objects.filter(season=season, visitor_team=mystics)
-                )
-
-                game_map = {g.api_id: g for g in games}
-                team_map = {t.api_id: t for t in Team.objects.all()}
-                player_map = {p.api_id: p for p in Player.objects.all()}
-
-                for s in paged("/player_stats", params={"seasons[]": season}, per_page=25):
-                    g_id = (s.get("game") or {}).get("id")
-                    if g_id not in game_map:
-                        continue
-
-                    t_id = (s.get("team") or {}).get("id")
-                    p_id = (s.get("player") or {}).get("id")
-
-                    game = game_map.get(g_id)
-                    team = team_map.get(t_id)
-                    player = player_map.get(p_id)
-
-                    if not game or not team or not player:
-                        continue
-
-                    PlayerStat.objects.update_or_create(
-                        game=game,
-                        team=team,
-                        player=player,
-                        defaults={
-                            "min": s.get("min") or "",
-                            "pts": s.get("pts"),
-                            "reb": s.get("reb"),
-                            "ast": s.get("ast"),
-                            "stl": s.get("stl"),
-                            "blk": s.get("blk"),
-                            "turnover": s.get("turnover") if s.get("turnover") is not None else s.get("turnovers"),
-                        },
-                    )
-
-                    time.sleep(0.35)
-
-                self.stdout.write(self.style.SUCCESS("Mystics stats synced."))
+                step = Step("stats")
+                games = Game.objects.filter(season=season, home_score__isnull=False)
+                if scope != "league":
+                    games = games.filter(Q(home_team=mystics) | Q(visitor_team=mystics))
+                if incremental:
+                    games = games.exclude(Q(status__iexact="final") & Q(player_stats__isnull=False))
+
+                game_ids = dict(games.distinct().values_list("api_id", "id"))
+                team_ids = dict(Team.objects.values_list("api_id", "id"))
+                player_ids = dict(Player.objects.values_list("api_id", "id"))
+
+                if not game_ids:
+                    stat_pages = iter(())
+                elif scope == "team":
+                    stat_pages = chunked_pages("/player_stats", "team_ids[]", [mystics.api_id], {"seasons[]": season})
+                else:
+                    workers = opts["workers"] if scope == "league" else 1
+                    stat_pages = chunked_pages("/player_stats", "game_ids[]", game_ids, workers=workers)
+
+                touched = set()
+                for page in stat_pages:
+                    rows = [r for r in (stat_row(s, game_ids, team_ids, player_ids) for s in page) if r]
+                    touched.update(r.player_id for r in rows)
+                    self.progress(step, upsert_stats(rows))
+
+                box_scores = rebuild_team_stats(game_ids.values())
+                # incremental runs only re-roll the players whose box scores came in
+                season_lines = refresh_season_lines(season, touched if incremental else None)
+                steps.append(step.finish())
+                self.stdout.write(self.style.SUCCESS(
+                    f"Player stats synced: {step.rows} lines, {box_scores} team box scores, "
+                    f"{season_lines} player season lines."
+                ))
 
         except APIError as e:
             self.stderr.write(self.style.ERROR(str(e)))
             raise
+        finally:
+            # whatever was written is now visible to every worker's API cache
+            bump_cache([season])
+            self.summary(steps, started, before)
+
+    def summary(self, steps, started: float, before: dict) -> None:
+        if not steps:
+            return
+        after = limiter.snapshot()
+        seconds = time.perf_counter() - started
+        rows = sum(s.rows for s in steps)
+        self.stdout.write("Summary:")
+        for step in steps:
+            self.stdout.write(f"  {step}")
+        self.stdout.write(
+            f"  total    {rows:>6} rows  {after['calls'] - before['calls']:>4} calls in {seconds:.1f}s "
+            f"({after['waited'] - before['waited']:.1f}s rate-limit wait, "
+            f"{after['throttled'] - before['throttled']} throttled)  "
+            f"{rows / seconds if seconds else 0:.1f} rows/s"
+        )
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_lines(apps, schema_editor):
+    Game = apps.get_model("mystics_site", "Game")
+    TeamGameLine = apps.get_model("mystics_site", "TeamGameLine")
+    lines = []
+    for g in Game.objects.values("id", "season", "date_utc", "home_team_id", "visitor_team_id", "home_score", "away_score").iterator():
+        for team, opp, pf, pa, home in (
+            (g["home_team_id"], g["visitor_team_id"], g["home_score"], g["away_score"], True),
+            (g["visitor_team_id"], g["home_team_id"], g["away_score"], g["home_score"], False),
+        ):
+            lines.append(TeamGameLine(
+                team_id=team, game_id=g["id"], opponent_id=opp, season=g["season"], date_utc=g["date_utc"],
+                is_home=home, points_for=pf, points_against=pa,
+            ))
+    TeamGameLine.objects.bulk_create(lines, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mystics_site', '0002_alter_game_options_alter_player_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamGameLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.IntegerField()),
+                ('date_utc', models.DateTimeField(blank=True, null=True)),
+                ('is_home', models.BooleanField(default=False)),
+                ('points_for', models.IntegerField(blank=True, null=True)),
+                ('points_against', models.IntegerField(blank=True, null=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_lines', to='mystics_site.game')),
+                ('opponent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='mystics_site.team')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_lines', to='mystics_site.team')),
+            ],
+            options={
+                'ordering': ['date_utc'],
+                'indexes': [models.Index(fields=['team', 'season', 'date_utc'], name='mystics_sit_team_id_50984e_idx'), models.Index(fields=['season', 'date_utc'], name='mystics_sit_season_8b7d1b_idx')],
+                'unique_together': {('team', 'game')},
+            },
+        ),
+        migrations.RunPython(backfill_lines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_season_lines(apps, schema_editor):
+    from mystics_site.season_lines import TOTALS, rollup
+
+    PlayerStat = apps.get_model("mystics_site", "PlayerStat")
+    PlayerSeasonLine = apps.get_model("mystics_site", "PlayerSeasonLine")
+    grouped = {}
+    for s in PlayerStat.objects.values("player_id", "team_id", "game__season", "min", *TOTALS).iterator():
+        grouped.setdefault((s["player_id"], s["team_id"], s["game__season"]), []).append(s)
+    PlayerSeasonLine.objects.bulk_create(
+        [
+            PlayerSeasonLine(player_id=player, team_id=team, season=season, **rollup(stats))
+            for (player, team, season), stats in grouped.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mystics_site', '0003_team_game_line'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerSeasonLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.IntegerField()),
+                ('games', models.IntegerField(default=0)),
+                ('minutes', models.FloatField(default=0)),
+                ('pts', models.IntegerField(default=0)),
+                ('reb', models.IntegerField(default=0)),
+                ('ast', models.IntegerField(default=0)),
+                ('stl', models.IntegerField(default=0)),
+                ('blk', models.IntegerField(default=0)),
+                ('turnover', models.IntegerField(default=0)),
+                ('fgm', models.IntegerField(default=0)),
+                ('fga', models.IntegerField(default=0)),
+                ('fg3m', models.IntegerField(default=0)),
+                ('fg3a', models.IntegerField(default=0)),
+                ('ftm', models.IntegerField(default=0)),
+                ('fta', models.IntegerField(default=0)),
+                ('mpg', models.FloatField(default=0)),
+                ('ppg', models.FloatField(default=0)),
+                ('rpg', models.FloatField(default=0)),
+                ('apg', models.FloatField(default=0)),
+                ('spg', models.FloatField(default=0)),
+                ('bpg', models.FloatField(default=0)),
+                ('pts_per36', models.FloatField(blank=True, null=True)),
+                ('reb_per36', models.FloatField(blank=True, null=True)),
+                ('ast_per36', models.FloatField(blank=True, null=True)),
+                ('fg_pct', models.FloatField(blank=True, null=True)),
+                ('fg3_pct', models.FloatField(blank=True, null=True)),
+                ('ft_pct', models.FloatField(blank=True, null=True)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_lines', to='mystics_site.player')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_season_lines', to='mystics_site.team')),
+            ],
+            options={
+                'ordering': ['-ppg'],
+                'indexes': [models.Index(fields=['season', '-ppg', 'games'], name='mystics_sit_season_67a70b_idx'), models.Index(fields=['team', 'season', '-ppg'], name='mystics_sit_team_id_b399d5_idx')],
+                'unique_together': {('player', 'team', 'season')},
+            },
+        ),
+        migrations.RunPython(backfill_season_lines, migrations.RunPython.noop),
+    ]
@@ -147,3 +147,87 @@ class TeamStat(models.Model):
             models.Index(fields=["team"]),
             models.Index(fields=["game"]),
         ]
+
+
+class TeamGameLine(models.Model):
+    """
+    One row per team per game (two per Game), kept by mystics_sync so the
+    chart APIs read a team's season as one indexed range instead of
+    re-deriving points from home/away scores.
+    """
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="game_lines")
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="team_lines")
+    opponent = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="+")
+    season = models.IntegerField()
+    date_utc = models.DateTimeField(null=True, blank=True)
+    is_home = models.BooleanField(default=False)
+    points_for = models.IntegerField(null=True, blank=True)
+    points_against = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        unique_together = [("team", "game")]
+        ordering = ["date_utc"]
+        indexes = [
+            models.Index(fields=["team", "season", "date_utc"]),
+            models.Index(fields=["season", "date_utc"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.season} {self.team_id} vs {self.opponent_id}: {self.points_for}-{self.points_against}"
+
+
+class PlayerSeasonLine(models.Model):
+    """
+    A player's season for one team, rolled up from PlayerStat by mystics_sync
+    (mystics_site.season_lines) so leaderboards read a few rows per player
+    instead of every box score. Team leaderboards rank these rows directly;
+    league ones sum a traded player's lines first (season_leaders).
+    Averages are per game played; per-36 and shooting splits are None
+    when the denominator is zero.
+    """
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="season_lines")
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="player_season_lines")
+    season = models.IntegerField()
+
+    games = models.IntegerField(default=0)
+    minutes = models.FloatField(default=0)
+
+    pts = models.IntegerField(default=0)
+    reb = models.IntegerField(default=0)
+    ast = models.IntegerField(default=0)
+    stl = models.IntegerField(default=0)
+    blk = models.IntegerField(default=0)
+    turnover = models.IntegerField(default=0)
+    fgm = models.IntegerField(default=0)
+    fga = models.IntegerField(default=0)
+    fg3m = models.IntegerField(default=0)
+    fg3a = models.IntegerField(default=0)
+    ftm = models.IntegerField(default=0)
+    fta = models.IntegerField(default=0)
+
+    mpg = models.FloatField(default=0)
+    ppg = models.FloatField(default=0)
+    rpg = models.FloatField(default=0)
+    apg = models.FloatField(default=0)
+    spg = models.FloatField(default=0)
+    bpg = models.FloatField(default=0)
+
+    pts_per36 = models.FloatField(null=True, blank=True)
+    reb_per36 = models.FloatField(null=True, blank=True)
+    ast_per36 = models.FloatField(null=True, blank=True)
+
+    fg_pct = models.FloatField(null=True, blank=True)
+    fg3_pct = models.FloatField(null=True, blank=True)
+    ft_pct = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        unique_together = [("player", "team", "season")]
+        ordering = ["-ppg"]
+        indexes = [
+            # season scans (league leaderboard, refresh) and per-line top-N reads
+            models.Index(fields=["season", "-ppg", "games"]),
+            models.Index(fields=["team", "season", "-ppg"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.season} {self.player_id}@{self.team_id}: {self.ppg:.1f} ppg"
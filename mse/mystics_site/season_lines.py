@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import FloatField, Sum
+from django.db.models.functions import Cast, NullIf
+
+from mystics_site.models import PlayerSeasonLine, PlayerStat
+
+TOTALS = ["pts", "reb", "ast", "stl", "blk", "turnover", "fgm", "fga", "fg3m", "fg3a", "ftm", "fta"]
+LINE_FIELDS = TOTALS + [
+    "games", "minutes", "mpg", "ppg", "rpg", "apg", "spg", "bpg",
+    "pts_per36", "reb_per36", "ast_per36", "fg_pct", "fg3_pct", "ft_pct",
+]
+PLAYER_CHUNK = 500
+
+
+def parse_minutes(raw: Optional[str]) -> float:
+    """'31', '31:24' or '31.4' -> minutes as a float; blanks and junk are 0."""
+    raw = (raw or "").strip()
+    try:
+        if ":" in raw:
+            mins, secs = raw.split(":", 1)
+            return int(mins) + int(secs) / 60
+        return float(raw) if raw else 0.0
+    except ValueError:
+        return 0.0
+
+
+def _ratio(num: float, den: float, scale: float = 1.0, digits: int = 1) -> Optional[float]:
+    return round(num * scale / den, digits) if den else None
+
+
+def rollup(stats: Iterable[dict]) -> Dict[str, float]:
+    """
+    Season values for one player/team from their PlayerStat rows (dicts with
+    "min" plus TOTALS). A game counts as played with minutes on the clock, or
+    with points recorded when the feed has no minutes.
+    """
+    out: Dict[str, float] = {f: 0 for f in TOTALS}
+    games, minutes = 0, 0.0
+    for s in stats:
+        played = parse_minutes(s["min"])
+        if played > 0 or (not (s["min"] or "").strip() and s["pts"] is not None):
+            games += 1
+        minutes += played
+        for f in TOTALS:
+            out[f] += s[f] or 0
+
+    out.update(
+        games=games,
+        minutes=round(minutes, 1),
+        mpg=_ratio(minutes, games) or 0,
+        ppg=_ratio(out["pts"], games) or 0,
+        rpg=_ratio(out["reb"], games) or 0,
+        apg=_ratio(out["ast"], games) or 0,
+        spg=_ratio(out["stl"], games) or 0,
+        bpg=_ratio(out["blk"], games) or 0,
+        pts_per36=_ratio(out["pts"], minutes, 36),
+        reb_per36=_ratio(out["reb"], minutes, 36),
+        ast_per36=_ratio(out["ast"], minutes, 36),
+        fg_pct=_ratio(out["fgm"], out["fga"], digits=3),
+        fg3_pct=_ratio(out["fg3m"], out["fg3a"], digits=3),
+        ft_pct=_ratio(out["ftm"], out["fta"], digits=3),
+    )
+    return out
+
+
+def refresh_season_lines(season: int, player_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute PlayerSeasonLine for `season`: every player, or only `player_ids`
+    (Player pks touched by a sync). One read of their box-score lines, one
+    bulk upsert, then lines without stats left are dropped. Returns lines written.
+    """
+    scopes: List[Optional[List[int]]] = [None]
+    if player_ids is not None:
+        ids = sorted(set(player_ids))
+        scopes = [ids[i:i + PLAYER_CHUNK] for i in range(0, len(ids), PLAYER_CHUNK)]
+
+    grouped: Dict[Tuple[int, int], List[dict]] = {}
+    for chunk in scopes:
+        qs = PlayerStat.objects.filter(game__season=season)
+        if chunk is not None:
+            qs = qs.filter(player_id__in=chunk)
+        for s in qs.values("player_id", "team_id", "min", *TOTALS):
+            grouped.setdefault((s["player_id"], s["team_id"]), []).append(s)
+
+    lines = [
+        PlayerSeasonLine(player_id=player, team_id=team, season=season, **rollup(stats))
+        for (player, team), stats in grouped.items()
+    ]
+
+    with transaction.atomic():
+        PlayerSeasonLine.objects.bulk_create(
+            lines,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["player", "team", "season"],
+            update_fields=LINE_FIELDS,
+        )
+        for chunk in scopes:
+            stale = PlayerSeasonLine.objects.filter(season=season)
+            if chunk is not None:
+                stale = stale.filter(player_id__in=chunk)
+            gone = [
+                pk for pk, player, team in stale.values_list("id", "player_id", "team_id")
+                if (player, team) not in grouped
+            ]
+            PlayerSeasonLine.objects.filter(id__in=gone).delete()
+    return len(lines)
+
+
+def season_leaders(season: int, min_games: int, limit: int) -> List[dict]:
+    """
+    League scoring leaders for `season`, one row per player: the lines of a
+    player traded mid-season are summed, so ppg stays per game played over
+    the whole season. Team views read PlayerSeasonLine per team instead.
+    """
+    return list(
+        PlayerSeasonLine.objects
+        .filter(season=season)
+        .values("player_id", "player__api_id", "player__first_name", "player__last_name",
+                "player__team__abbreviation")
+        .annotate(g=Sum("games"), ppg=Cast(Sum("pts"), FloatField()) / NullIf(Sum("games"), 0))
+        .filter(g__gte=min_games)
+        .order_by("-ppg", "player_id")[:limit]
+    )
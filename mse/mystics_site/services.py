@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 import os
+import threading
 import time
-from typing import Any, Dict, Optional, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import requests
+from django.conf import settings
+
+from analytics.services.rate_limit import AdaptiveLimiter, pooled_session, retry_after
 
 BASE = "https://api.balldontlie.io/wnba/v1"
+PER_PAGE = 100  # API maximum
+ID_CHUNK = 25  # ids per filtered request (keeps query strings short)
+MAX_WORKERS = int(getattr(settings, "BALLDONTLIE_MAX_WORKERS", 4))
 
 
 class APIError(RuntimeError):
@@ -30,6 +38,21 @@ def _headers() -> Dict[str, str]:
     }
 
 
+limiter = AdaptiveLimiter(getattr(settings, "BALLDONTLIE_RATE_PER_MINUTE", 60))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def session() -> requests.Session:
+    """One pooled keep-alive session per process, shared by the chunk workers."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = pooled_session(MAX_WORKERS)
+        return _session
+
+
 def get_json(
     path: str,
     params: Optional[dict] = None,
@@ -40,29 +63,29 @@ def get_json(
     params = params or {}
 
     for attempt in range(1, max_retries + 1):
+        limiter.acquire()
         try:
-            r = requests.get(url, headers=_headers(), params=params, timeout=timeout)
-
-            # Rate-limit handling
-            if r.status_code == 429:
-                retry_after = r.headers.get("Retry-After")
-                sleep_for = int(retry_after) if retry_after else min(2**attempt, 30)
-                time.sleep(sleep_for)
-                continue
+            r = session().get(url, headers=_headers(), params=params, timeout=timeout)
+        except requests.RequestException:
+            time.sleep(min(2**attempt, 30))
+            continue
 
-            if r.status_code >= 400:
-                raise APIError(f"API {r.status_code}: {r.text[:300]}")
+        # Rate-limit handling
+        if r.status_code == 429:
+            limiter.on_throttle(retry_after(r, attempt))
+            continue
 
-            return r.json()
+        if r.status_code >= 400:
+            raise APIError(f"API {r.status_code}: {r.text[:300]}")
 
-        except requests.RequestException:
-            sleep_for = min(2**attempt, 30)
-            time.sleep(sleep_for)
+        limiter.on_success()
+        return r.json()
 
     raise APIError(f"API request failed after {max_retries} retries: {url}")
 
 
-def paged(path: str, params: Optional[dict] = None, per_page: int = 25) -> Iterator[dict]:
+def pages(path: str, params: Optional[dict] = None, per_page: int = PER_PAGE) -> Iterator[List[dict]]:
+    """Cursor pagination, one list of rows per page; pacing is left to the limiter."""
     cursor = None
 
     while True:
@@ -76,13 +99,42 @@ def paged(path: str, params: Optional[dict] = None, per_page: int = 25) -> Itera
         if not rows:
             break
 
-        for row in rows:
-            yield row
+        yield rows
 
         meta = data.get("meta") or {}
         cursor = meta.get("next_cursor")
         if not cursor:
             break
 
-        # throttle to avoid 429
-        time.sleep(1.25)
+
+def paged(path: str, params: Optional[dict] = None, per_page: int = PER_PAGE) -> Iterator[dict]:
+    for rows in pages(path, params, per_page):
+        yield from rows
+
+
+def chunked_pages(
+    path: str,
+    key: str,
+    ids: Iterable[int],
+    params: Optional[dict] = None,
+    chunk: int = ID_CHUNK,
+    workers: int = 1,
+) -> Iterator[List[dict]]:
+    """
+    Pages of `path` filtered server-side by `key` ("game_ids[]", "team_ids[]")
+    in chunks of `chunk` ids. With workers > 1 the chunks are paged
+    concurrently (the shared limiter still paces them) and each chunk's pages
+    are yielded as it completes; otherwise they stream in order.
+    """
+    ids = sorted(set(ids))
+    calls = [{**(params or {}), key: ids[i:i + chunk]} for i in range(0, len(ids), chunk)]
+
+    if workers <= 1 or len(calls) <= 1:
+        for p in calls:
+            yield from pages(path, p)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(calls)), thread_name_prefix="bdl-stats") as pool:
+        futures = [pool.submit(lambda p: list(pages(path, p)), p) for p in calls]
+        for future in as_completed(futures):
+            yield from future.result()
@@ -1,3 +1,276 @@
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+
+from mystics_site.game_lines import rebuild_game_lines, team_series
+from mystics_site.models import Game, Player, PlayerSeasonLine, PlayerStat, Team, TeamGameLine, TeamStat
+from mystics_site.season_lines import parse_minutes, refresh_season_lines
+from mystics_site.services import chunked_pages
+
+
+def _dt(month, day):
+    return datetime(2025, month, day, 23, 0, tzinfo=dt_timezone.utc)
+
+
+class CacheIsolatedTestCase(TestCase):
+    """Starts every test with empty response and version caches (in memory under the test runner)."""
+
+    def setUp(self):
+        for alias in settings.CACHES:
+            caches[alias].clear()
+
+
+class TeamGameLineTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.was = Team.objects.create(api_id=1, full_name="Washington Mystics", name="Mystics", abbreviation="WAS")
+        self.ny = Team.objects.create(api_id=2, full_name="New York Liberty", name="Liberty", abbreviation="NY")
+        Game.objects.create(api_id=10, season=2025, date_utc=_dt(5, 20), home_team=self.was, visitor_team=self.ny,
+                            home_score=84, away_score=79, status="Final")
+        Game.objects.create(api_id=11, season=2025, date_utc=_dt(5, 24), home_team=self.ny, visitor_team=self.was,
+                            home_score=90, away_score=70, status="Final")
+        Game.objects.create(api_id=12, season=2025, date_utc=_dt(6, 1), home_team=self.was, visitor_team=self.ny,
+                            status="scheduled")
+
+    def test_rebuild_is_idempotent_and_feeds_series(self):
+        self.assertEqual(rebuild_game_lines(2025), 6)
+        self.assertEqual(rebuild_game_lines(2025), 6)
+        self.assertEqual(TeamGameLine.objects.count(), 6)
+
+        with self.assertNumQueries(1):
+            series = team_series(2025)
+        self.assertEqual([pf for _, pf, _ in series[self.was.id]], [84, 70, None])
+        self.assertEqual([pa for _, _, pa in series[self.ny.id]], [84, 70, None])
+
+        Game.objects.filter(api_id=12).update(visitor_team=self.was, home_team=self.ny)
+        rebuild_game_lines(2025)
+        self.assertTrue(TeamGameLine.objects.get(team=self.ny, game__api_id=12).is_home)
+
+    def test_chart_apis_read_lines(self):
+        rebuild_game_lines(2025)
+        trend = self.client.get(reverse("mystics_site:api_mystics_trend")).json()
+        self.assertEqual(trend["labels"], ["05/20", "05/24", "06/01"])
+        self.assertEqual(trend["pts"], [84, 70, 0])
+
+        quarters = self.client.get(reverse("mystics_site:api_team_quarter_averages", args=[1])).json()
+        self.assertEqual((quarters["games"], quarters["ppg"]), (3, round(154 / 3, 2)))
+
+        compare = self.client.get(reverse("mystics_site:api_compare_teams"), {"team_a": 1, "team_b": 2}).json()
+        self.assertEqual((compare["a_pts"], compare["b_pts"]), ([84, 70, 0], [79, 90, 0]))
+
+    def test_sync_bump_invalidates_season_cache(self):
+        from mystics_site.cache import bump
+
+        rebuild_game_lines(2025)
+        url = reverse("mystics_site:api_mystics_trend")
+        self.assertEqual(self.client.get(url).json()["pts"], [84, 70, 0])
+
+        Game.objects.filter(api_id=12).update(home_score=88, away_score=80)
+        rebuild_game_lines(2025)
+        self.assertEqual(self.client.get(url).json()["pts"], [84, 70, 0])  # cached
+
+        bump([2024])
+        self.assertEqual(self.client.get(url).json()["pts"], [84, 70, 0])  # other season untouched
+        bump([2025])
+        self.assertEqual(self.client.get(url).json()["pts"], [84, 70, 88])
+
+    def test_versions_survive_response_culling_and_never_restart_low(self):
+        from mystics_site.cache import VERSION_KEY, bump, version
+
+        first = version(2025)
+        cache.clear()  # response cache culled / flushed
+        self.assertEqual(version(2025), first)
+
+        bump([2025])
+        caches["versions"].delete(VERSION_KEY.format(2025))  # lost anyway
+        self.assertGreater(version(2025), first + 1)
+
+    def test_file_backed_versions_never_expire_after_bumps(self):
+        import tempfile
+        import time
+
+        from mystics_site.cache import VERSION_KEY, bump
+
+        with tempfile.TemporaryDirectory() as tmp:
+            files = {
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "versions": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                             "LOCATION": tmp, "TIMEOUT": None},
+            }
+            with self.settings(CACHES=files):
+                store, key = caches["versions"], VERSION_KEY.format(2025)
+                bump([2025])
+                first = store.get(key)
+                bump([2025])
+                second = store.get(key)
+                self.assertGreater(second, first)
+
+                with mock.patch("time.time", return_value=time.time() + 301):  # past the default timeout
+                    self.assertEqual(store.get(key), second)
+
+
+class MysticsSyncTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.calls = []
+
+    def fake_pages(self, path, params=None, per_page=100):
+        self.calls.append((path, per_page, params))
+        if path == "/players":
+            yield [{"id": 500 + i, "first_name": "P", "last_name": str(i), "team": {"id": 1}} for i in range(100)]
+            yield [{"id": 600, "first_name": "Solo", "last_name": "Guard", "team": {"id": 2}}]
+        elif path == "/games":
+            yield [
+                {"id": 10, "date": "2025-05-20T23:00:00Z", "season": 2025, "status": "Final",
+                 "home_team": {"id": 1}, "visitor_team": {"id": 2}, "home_score": 84, "visitor_score": 79},
+                {"id": 11, "date": "2025-05-24T23:00:00Z", "season": 2025, "status": "Final",
+                 "home_team": {"id": 2}, "visitor_team": {"id": 99}},
+            ]
+        elif path == "/player_stats":
+            row = {"game": {"id": 10}, "team": {"id": 1}, "player": {"id": 500}, "pts": 21, "min": "31",
+                   "fgm": 8, "fga": 15, "fg3m": 2, "fg3a": 5, "ftm": 3, "fta": 4, "pf": 2, "plus_minus": 6}
+            yield [row, dict(row, pts=22), {**row, "game": {"id": 77}},
+                   {**row, "player": {"id": 600}, "team": {"id": 2}, "fgm": 2, "fga": 5, "pf": 1}]
+
+    def run_sync(self, *args):
+        teams = {"data": [
+            {"id": 1, "full_name": "Washington Mystics", "name": "Mystics", "abbreviation": "WAS"},
+            {"id": 2, "full_name": "New York Liberty", "name": "Liberty", "abbreviation": "NY"},
+        ]}
+        out = StringIO()
+        target = "mystics_site.management.commands.mystics_sync"
+        with mock.patch(f"{target}.pages", side_effect=self.fake_pages), \
+                mock.patch("mystics_site.services.pages", side_effect=self.fake_pages), \
+                mock.patch(f"{target}.get_json", return_value=teams), \
+                mock.patch("time.sleep", side_effect=AssertionError("fixed sleep")):
+            call_command("mystics_sync", *args, stdout=out)
+        return out.getvalue()
+
+    def test_pages_are_upserted_in_batches(self):
+        output = self.run_sync()
+        self.assertEqual({per_page for _, per_page, _ in self.calls}, {100})
+        self.assertEqual(Player.objects.count(), 101)
+        self.assertEqual(Player.objects.get(api_id=600).team.abbreviation, "NY")
+        self.assertEqual(Game.objects.count(), 1)  # unknown visitor skipped
+        stat = PlayerStat.objects.get(player__api_id=500)
+        self.assertEqual((stat.pts, stat.fga, stat.fg3m, stat.pf, stat.plus_minus), (22, 15, 2, 2, 6))
+        box = TeamStat.objects.get(team__api_id=1)
+        self.assertEqual((box.fgm, box.fga, box.fg_pct, box.fouls), (8, 15, 0.533, 2))
+        self.assertEqual(TeamStat.objects.get(team__api_id=2).fgm, 2)
+        self.assertEqual(PlayerSeasonLine.objects.get(player__api_id=500).ppg, 22.0)
+        self.assertEqual(TeamGameLine.objects.count(), 2)
+        self.assertIn("Summary:", output)
+        self.assertIn("rows/s", output)
+
+        output = self.run_sync()
+        self.assertIn("101 (0 new, 0 updated, 101 unchanged)", output)
+        self.assertEqual(PlayerStat.objects.count(), 2)
+        self.assertEqual(TeamStat.objects.count(), 2)
+
+    def test_stats_are_filtered_server_side(self):
+        self.run_sync()
+        stats = [params for path, _, params in self.calls if path == "/player_stats"]
+        self.assertEqual(stats, [{"game_ids[]": [10]}])  # played Mystics games only
+
+        self.calls.clear()
+        self.run_sync("--no-players", "--no-games", "--stats-scope", "team")
+        stats = [params for path, _, params in self.calls if path == "/player_stats"]
+        self.assertEqual(stats, [{"seasons[]": 2025, "team_ids[]": [1]}])
+
+        self.calls.clear()
+        output = self.run_sync("--no-players", "--no-games", "--incremental")
+        self.assertFalse([path for path, _, _ in self.calls if path == "/player_stats"])
+        self.assertIn("0 lines", output)
+
+    def test_league_scope_pages_chunks_in_parallel(self):
+        def fake(path, params=None, per_page=100):
+            yield [{"ids": params["game_ids[]"]}]
+
+        with mock.patch("mystics_site.services.pages", side_effect=fake):
+            got = list(chunked_pages("/player_stats", "game_ids[]", range(60), chunk=25, workers=3))
+        chunks = sorted(page[0]["ids"] for page in got)
+        self.assertEqual([len(c) for c in chunks], [25, 25, 10])
+        self.assertEqual(sum(chunks, []), list(range(60)))
+
+    def test_throttle_halves_rate_and_recovers(self):
+        from analytics.services.rate_limit import AdaptiveLimiter
+
+        limiter = AdaptiveLimiter(per_minute=600)
+        limiter.on_throttle(0)
+        limiter.on_throttle(0)
+        self.assertAlmostEqual(limiter.rate, 2.5)
+        self.assertEqual(limiter.throttled, 2)
+        for _ in range(100):
+            limiter.on_success()
+        self.assertEqual(limiter.rate, 10.0)
+
+
+class PlayerSeasonLineTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.was = Team.objects.create(api_id=1, full_name="Washington Mystics", name="Mystics", abbreviation="WAS")
+        self.ny = Team.objects.create(api_id=2, full_name="New York Liberty", name="Liberty", abbreviation="NY")
+        self.star = Player.objects.create(api_id=100, first_name="Star", last_name="Guard", team=self.was)
+        self.bench = Player.objects.create(api_id=101, first_name="Bench", last_name="Forward", team=self.ny)
+        for day in range(1, 7):
+            game = Game.objects.create(api_id=day, season=2025, date_utc=_dt(6, day), home_team=self.was,
+                                       visitor_team=self.ny, home_score=80, away_score=75, status="Final")
+            PlayerStat.objects.create(game=game, player=self.star, team=self.was, min="30:00", pts=18 + day,
+                                      reb=5, ast=4, fgm=7, fga=14, fg3m=2, fg3a=6, ftm=3, fta=4)
+            PlayerStat.objects.create(game=game, player=self.bench, team=self.ny, min="0" if day == 6 else "12",
+                                      pts=0 if day == 6 else 6, fgm=2, fga=5)
+
+    def test_rollup_averages_and_splits(self):
+        self.assertEqual(refresh_season_lines(2025), 2)
+        star = PlayerSeasonLine.objects.get(player=self.star)
+        self.assertEqual((star.games, star.minutes, star.pts, star.ppg, star.mpg), (6, 180.0, 129, 21.5, 30.0))
+        self.assertEqual((star.pts_per36, star.fg_pct, star.fg3_pct, star.ft_pct), (25.8, 0.5, 0.333, 0.75))
+
+        bench = PlayerSeasonLine.objects.get(player=self.bench)
+        self.assertEqual((bench.games, bench.ppg), (5, 6.0))  # DNP line not a game
+        self.assertEqual(parse_minutes("31:30"), 31.5)
+        self.assertEqual(parse_minutes("DNP"), 0.0)
+
+    def test_incremental_refresh_only_touches_given_players(self):
+        refresh_season_lines(2025)
+        PlayerStat.objects.filter(player=self.star).update(pts=0)
+        PlayerStat.objects.filter(player=self.bench).update(pts=30)
+
+        self.assertEqual(refresh_season_lines(2025, [self.star.id]), 1)
+        self.assertEqual(PlayerSeasonLine.objects.get(player=self.star).ppg, 0)
+        self.assertEqual(PlayerSeasonLine.objects.get(player=self.bench).ppg, 6.0)
+
+        PlayerStat.objects.filter(player=self.star).delete()
+        refresh_season_lines(2025, [self.star.id])
+        self.assertFalse(PlayerSeasonLine.objects.filter(player=self.star).exists())
+
+    def test_home_and_dashboard_read_leaderboard(self):
+        refresh_season_lines(2025)
+        with self.assertNumQueries(4):  # three counts + one top-N read
+            response = self.client.get(reverse("mystics_site:home"))
+        self.assertEqual([r["player_id"] for r in response.context["top_scorers"]], [self.star.id, self.bench.id])
+        self.assertContains(response, "Star Guard")
+
+        response = self.client.get(reverse("mystics_site:dashboard"))
+        self.assertEqual([r.player for r in response.context["top_players"]], [self.star])
+
+    def test_traded_player_leads_as_one_season_line(self):
+        # bench plays three games for NY, then three for WAS: 3 + 3 games, below the
+        # five-game minimum with either team, one 6-game line on the league board
+        PlayerStat.objects.filter(player=self.bench).update(min="20", pts=10)
+        PlayerStat.objects.filter(player=self.bench, game__api_id__gt=3).update(team=self.was, pts=40)
+        refresh_season_lines(2025)
+        self.assertEqual(PlayerSeasonLine.objects.filter(player=self.bench).count(), 2)
+
+        leaders = self.client.get(reverse("mystics_site:home")).context["top_scorers"]
+        self.assertEqual([(r["player_id"], r["g"], r["ppg"]) for r in leaders],
+                         [(self.bench.id, 6, 25.0), (self.star.id, 6, 21.5)])
 
-# Create your tests here.
+        team = self.client.get(reverse("mystics_site:dashboard")).context["top_players"]
+        self.assertEqual([r.player for r in team], [self.star])  # 3 games with WAS: below the minimum
@@ -4,15 +4,18 @@ from dataclasses import dataclass
 from typing import Dict, List, Tuple
 
 from django.db.models import Avg, Count, Q
-from django.db.models.functions import TruncMonth
+from django.db.models.functions import Coalesce, TruncMonth
 from django.http import JsonResponse, HttpRequest
 from django.shortcuts import get_object_or_404, render
-from django.views.decorators.cache import cache_page
 
-from mystics_site.models import Team, Player, Game, PlayerStat
+from mystics_site.cache import season_cached
+from mystics_site.game_lines import team_series
+from mystics_site.season_lines import season_leaders
+from mystics_site.models import Team, Player, Game, PlayerSeasonLine, PlayerStat, TeamGameLine
 from mystics_site.utils import get_mystics
 
 SEASON_DEFAULT = 2025
+LEADER_MIN_GAMES = 5
 
 
 # -------------------------
@@ -23,20 +26,6 @@ def _season(request: HttpRequest) -> int:
     return int(s) if s and s.isdigit() else SEASON_DEFAULT
 
 
-def _team_points_from_game(game: Game, team: Team) -> int:
-    """Return points scored by `team` in this game using Game scores."""
-    if game.home_team_id == team.id:
-        return int(game.home_score or 0)
-    return int(game.away_score or 0)
-
-
-def _team_points_allowed_from_game(game: Game, team: Team) -> int:
-    """Return points allowed by `team` in this game using Game scores."""
-    if game.home_team_id == team.id:
-        return int(game.away_score or 0)
-    return int(game.home_score or 0)
-
-
 def _games_for_team(season: int, team: Team):
     return (
         Game.objects.filter(season=season)
@@ -46,9 +35,24 @@ def _games_for_team(season: int, team: Team):
     )
 
 
-def _safe_avg(nums: List[float]) -> float:
-    nums2 = [float(x) for x in nums if isinstance(x, (int, float))]
-    return (sum(nums2) / len(nums2)) if nums2 else 0.0
+def _points_series(season: int, team: Team) -> Tuple[List[str], List[int]]:
+    """(labels, points) for a team's dated games, from TeamGameLine."""
+    labels, pts = [], []
+    for date_utc, pf, _ in team_series(season, [team.id]).get(team.id, []):
+        labels.append(date_utc.strftime("%m/%d"))
+        pts.append(int(pf or 0))
+    return labels, pts
+
+
+def _season_ppg(team: Team, seasons: List[int]) -> Dict[int, Tuple[float, int]]:
+    """{season: (ppg, games)}; unscored games count as 0 like the charts show them."""
+    rows = (
+        TeamGameLine.objects
+        .filter(team=team, season__in=seasons, date_utc__isnull=False)
+        .values("season")
+        .annotate(ppg=Avg(Coalesce("points_for", 0)), g=Count("id"))
+    )
+    return {r["season"]: (float(r["ppg"] or 0.0), r["g"]) for r in rows}
 
 
 # -------------------------
@@ -57,28 +61,8 @@ def _safe_avg(nums: List[float]) -> float:
 def home(request: HttpRequest):
     season = _season(request)
 
-    top_scorers = (
-        PlayerStat.objects
-        .filter(game__season=season)
-        .values(
-            "player__api_id",
-            "player__first_name",
-            "player__last_name",
-            "player__team__abbreviation",
-        )
-        .annotate(ppg=Avg("pts"), g=Count("game_id"))
-        .filter(g__gte=5)
-        .order_by("-ppg")[:10]
-    )
-
-    top_players = (
-        PlayerStat.objects
-        .filter(game__season=season)
-        .values("player__first_name", "player__last_name")
-        .annotate(ppg=Avg("pts"), g=Count("game_id"))
-        .filter(g__gte=5)
-        .order_by("-ppg")[:5]
-    )
+    top_scorers = season_leaders(season, LEADER_MIN_GAMES, 10)
+    top_players = top_scorers[:5]
 
     context = {
         "season": season,
@@ -104,11 +88,9 @@ def dashboard(request: HttpRequest):
     games_played = _games_for_team(season, mystics)
 
     top_players = (
-        PlayerStat.objects
-        .filter(team=mystics, game__season=season)
-        .values("player__first_name", "player__last_name")
-        .annotate(ppg=Avg("pts"), g=Count("game_id"))
-        .filter(g__gte=5)
+        PlayerSeasonLine.objects
+        .filter(team=mystics, season=season, games__gte=LEADER_MIN_GAMES)
+        .select_related("player")
         .order_by("-ppg")[:5]
     )
 
@@ -223,7 +205,7 @@ def player_detail(request: HttpRequest, player_id: int):
 # -------------------------
 # APIs
 # -------------------------
-@cache_page(60 * 10)
+@season_cached(60 * 10)
 def players_api(request: HttpRequest):
     q = (request.GET.get("q") or "").strip()
     limit_raw = request.GET.get("limit", "250")
@@ -257,7 +239,7 @@ def players_api(request: HttpRequest):
     return JsonResponse({"count": len(data), "results": data})
 
 
-@cache_page(60 * 10)
+@season_cached(60 * 10, season_of=_season)
 def api_player_splits(request: HttpRequest, player_id: int):
     season = _season(request)
     player = get_object_or_404(Player, api_id=player_id)
@@ -285,22 +267,16 @@ def api_player_splits(request: HttpRequest, player_id: int):
     })
 
 
-@cache_page(60 * 10)
+@season_cached(60 * 10, season_of=_season)
 def api_team_trend(request: HttpRequest, team_id: int):
     season = _season(request)
     team = get_object_or_404(Team, api_id=team_id)
 
-    games = _games_for_team(season, team)
-
-    labels, pts = [], []
-    for g in games:
-        labels.append(g.date_utc.strftime("%m/%d"))
-        pts.append(_team_points_from_game(g, team))
-
+    labels, pts = _points_series(season, team)
     return JsonResponse({"team": team.full_name, "season": season, "labels": labels, "pts": pts})
 
 
-@cache_page(60 * 10)
+@season_cached(60 * 10, season_of=_season)
 def api_mystics_trend(request: HttpRequest):
     season = _season(request)
     mystics = get_mystics()
@@ -308,12 +284,7 @@ def api_mystics_trend(request: HttpRequest):
     if not mystics:
         return JsonResponse({"team": "Washington Mystics", "season": season, "labels": [], "pts": []})
 
-    games = _games_for_team(season, mystics)
-
-    labels, pts = [], []
-    for g in games:
-        labels.append(g.date_utc.strftime("%m/%d"))
-        pts.append(_team_points_from_game(g, mystics))
+    labels, pts = _points_series(season, mystics)
 
     return JsonResponse({
         "team": mystics.full_name,
@@ -323,13 +294,13 @@ def api_mystics_trend(request: HttpRequest):
     })
 
 
-@cache_page(60 * 10)
+@season_cached(60 * 10)
 def api_teams_list(request: HttpRequest):
     teams = Team.objects.order_by("full_name").values("api_id", "full_name", "abbreviation")
     return JsonResponse({"results": list(teams)})
 
 
-@cache_page(60 * 10)
+@season_cached(60 * 10, season_of=_season)
 def api_mystics_ppg(request: HttpRequest):
     """
     Filled line chart data:
@@ -341,17 +312,12 @@ def api_mystics_ppg(request: HttpRequest):
     if not mystics:
         return JsonResponse({"team": "Washington Mystics", "season": season, "labels": [], "pts": []})
 
-    games = _games_for_team(season, mystics)
-    labels, pts = [], []
-    for g in games:
-        labels.append(g.date_utc.strftime("%m/%d"))
-        pts.append(_team_points_from_game(g, mystics))
-
+    labels, pts = _points_series(season, mystics)
     return JsonResponse({"team": mystics.full_name, "season": season, "labels": labels, "pts": pts})
 
 
 # ✅ NEW: Quarter averages endpoint (used ONLY by bar charts)
-@cache_page(60 * 10)
+@season_cached(60 * 10, season_of=_season)
 def api_team_quarter_averages(request: HttpRequest, team_id: int):
     """
     Average points per quarter for a team in a given season.
@@ -366,9 +332,7 @@ def api_team_quarter_averages(request: HttpRequest, team_id: int):
     season = _season(request)
     team = get_object_or_404(Team, api_id=team_id)
 
-    games = _games_for_team(season, team)
-    pts = [_team_points_from_game(g, team) for g in games]
-    ppg = _safe_avg([float(x) for x in pts]) if pts else 0.0
+    ppg, games = _season_ppg(team, [season]).get(season, (0.0, 0))
 
     q = round(ppg / 4.0, 2) if ppg else 0.0
     return JsonResponse({
@@ -381,12 +345,12 @@ def api_team_quarter_averages(request: HttpRequest, team_id: int):
         "quarters": ["Q1", "Q2", "Q3", "Q4"],
         "values": [q, q, q, q],
         "note": "Estimated from final score (PPG/4).",
-        "games": len(pts),
+        "games": games,
         "ppg": round(ppg, 2),
     })
 
 
-@cache_page(60 * 10)
+@season_cached(60 * 10)
 def api_mystics_season_compare(request: HttpRequest):
     """
     (Kept for backward compatibility. Your executive dashboard bar chart now uses
@@ -404,13 +368,9 @@ def api_mystics_season_compare(request: HttpRequest):
     except Exception:
         season1, season2 = 2024, 2025
 
-    def season_ppg(season: int) -> float:
-        games = _games_for_team(season, mystics)
-        pts = [_team_points_from_game(g, mystics) for g in games]
-        return round(sum(pts) / len(pts), 2) if pts else 0.0
-
-    p1 = season_ppg(season1)
-    p2 = season_ppg(season2)
+    by_season = _season_ppg(mystics, [season1, season2])
+    p1 = round(by_season.get(season1, (0.0, 0))[0], 2)
+    p2 = round(by_season.get(season2, (0.0, 0))[0], 2)
 
     return JsonResponse({
         "team": mystics.full_name,
@@ -419,7 +379,7 @@ def api_mystics_season_compare(request: HttpRequest):
     })
 
 
-@cache_page(60 * 10)
+@season_cached(60 * 10, season_of=_season)
 def api_compare_teams(request: HttpRequest):
     """
     Team-vs-team comparison endpoint.
@@ -439,11 +399,9 @@ def api_compare_teams(request: HttpRequest):
     team_a = get_object_or_404(Team, api_id=int(a_raw))
     team_b = get_object_or_404(Team, api_id=int(b_raw))
 
-    games_a = list(_games_for_team(season, team_a))
-    games_b = list(_games_for_team(season, team_b))
-
-    map_a = {g.date_utc.date().isoformat(): _team_points_from_game(g, team_a) for g in games_a if g.date_utc}
-    map_b = {g.date_utc.date().isoformat(): _team_points_from_game(g, team_b) for g in games_b if g.date_utc}
+    series = team_series(season, [team_a.id, team_b.id])
+    map_a = {d.date().isoformat(): int(pf or 0) for d, pf, _ in series.get(team_a.id, [])}
+    map_b = {d.date().isoformat(): int(pf or 0) for d, pf, _ in series.get(team_b.id, [])}
 
     all_dates = sorted(set(map_a.keys()) | set(map_b.keys()))
     labels = []